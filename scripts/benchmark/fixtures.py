@@ -0,0 +1,201 @@
+"""
+Synthetic fixtures for the screenshot / metadata benchmark
+
+Builds a throwaway workspace that mirrors scripts/ (the pipeline code is
+copied, fonts are linked) and fills it with generated apps: device
+background and screenshot images of configurable sizes, and long captions
+and metadata in Latin, CJK, Hangul and Arabic script.
+"""
+
+from PIL import Image, ImageDraw
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+import json
+import random
+import shutil
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+# Language -> (caption script, font_mapping borrowed from the real configs)
+LANGUAGES: List[Tuple[str, str, Dict[str, str]]] = [
+    ("ko", "hangul", {"regular": "Pretendard-Regular.otf", "bold": "Pretendard-Bold.otf", "font_path": ""}),
+    ("en-US", "latin", {"regular": "NotoSans-Regular.ttf", "bold": "NotoSans-Bold.ttf", "font_path": "NotoSans"}),
+    ("ja", "cjk", {"regular": "NotoSerifCJKjp-Regular.otf", "bold": "NotoSerifCJKjp-Bold.otf",
+                   "font_path": "05_NotoSerifCJKOTF/OTF/Japanese"}),
+    ("ar-SA", "arabic", {"regular": "NotoSansArabic-Regular.ttf", "bold": "NotoSansArabic-Bold.ttf",
+                         "font_path": "NotoSansArabic"}),
+    ("zh-Hans", "cjk", {"regular": "NotoSerifCJKsc-Regular.otf", "bold": "NotoSerifCJKsc-Bold.otf",
+                        "font_path": "05_NotoSerifCJKOTF/OTF/SimplifiedChinese"}),
+    ("de-DE", "latin", {"regular": "NotoSans-Regular.ttf", "bold": "NotoSans-Bold.ttf", "font_path": "NotoSans"}),
+    ("fr-FR", "latin", {"regular": "NotoSans-Regular.ttf", "bold": "NotoSans-Bold.ttf", "font_path": "NotoSans"}),
+    ("es-ES", "latin", {"regular": "NotoSans-Regular.ttf", "bold": "NotoSans-Bold.ttf", "font_path": "NotoSans"}),
+]
+
+CAPTIONS = {
+    "latin": [
+        "Organize every book, movie and series you have ever finished into folders that stay in sync",
+        "Rate with five stars, add categories and long notes, and find anything again in seconds",
+        "Sticky headers keep your place while you scroll through long reviews and reading journals",
+    ],
+    "hangul": [
+        "읽은 책과 본 영화, 드라마를 폴더별로 정리하고 모든 기기에서 동기화하세요",
+        "별점과 카테고리, 긴 메모를 남기고 원하는 기록을 몇 초 만에 다시 찾아보세요",
+        "긴 감상문을 스크롤해도 스티키 헤더가 지금 읽고 있는 위치를 계속 보여줍니다",
+    ],
+    "cjk": [
+        "読んだ本や観た映画、ドラマをフォルダで整理して、すべてのデバイスで同期しましょう",
+        "五つ星で評価し、カテゴリや長いメモを追加して、あとから数秒で見つけ出せます",
+        "長いレビューや読書日記をスクロールしても、スティッキーヘッダーが現在地を示します",
+    ],
+    "arabic": [
+        "نظّم كل كتاب وفيلم ومسلسل أنهيته في مجلدات تبقى متزامنة على جميع أجهزتك",
+        "قيّم بخمس نجوم وأضف فئات وملاحظات طويلة وابحث عن أي شيء في ثوانٍ",
+        "تحافظ العناوين الثابتة على موضعك أثناء التمرير عبر المراجعات الطويلة ومذكرات القراءة",
+    ],
+}
+
+
+@dataclass(frozen=True)
+class FixtureSpec:
+    """Shape of the synthetic workload"""
+    apps: int = 2
+    languages: int = 4
+    screenshots: int = 3
+    iphone_size: Tuple[int, int] = (1290, 2796)
+    iphone_phone_size: Tuple[int, int] = (1706, 3054)
+    ipad_size: Tuple[int, int] = (2048, 2732)
+    ipad_phone_size: Tuple[int, int] = (998, 1273)
+    seed: int = 7
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @property
+    def app_names(self) -> List[str]:
+        return [f"bench{index + 1}" for index in range(self.apps)]
+
+    @property
+    def language_entries(self) -> List[Tuple[str, str, Dict[str, str]]]:
+        # The first four already mix Hangul, Latin, CJK and Arabic; past the table, codes get a suffix
+        entries = []
+        for index in range(self.languages):
+            language, script, font_mapping = LANGUAGES[index % len(LANGUAGES)]
+            if index >= len(LANGUAGES):
+                language = f"{language}-x{index}"
+            entries.append((language, script, font_mapping))
+        return entries
+
+
+def _background(size: Tuple[int, int], rng: random.Random) -> Image.Image:
+    top = tuple(rng.randrange(40, 200) for _ in range(3))
+    bottom = tuple(rng.randrange(40, 200) for _ in range(3))
+    gradient = Image.linear_gradient("L").resize(size)
+    return Image.composite(Image.new("RGB", size, bottom), Image.new("RGB", size, top), gradient)
+
+
+def _screenshot(size: Tuple[int, int], rng: random.Random) -> Image.Image:
+    """A phone-frame-like RGBA image: transparent corners, UI-ish blocks and some noise"""
+    width, height = size
+    image = Image.new("RGBA", size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    radius = width // 10
+    draw.rounded_rectangle((0, 0, width - 1, height - 1), radius=radius, fill=(20, 20, 22, 255))
+    inset = width // 30
+    draw.rounded_rectangle((inset, inset, width - inset, height - inset), radius=radius - inset,
+                           fill=(248, 248, 250, 255))
+    row_height = max(40, height // 24)
+    for top in range(inset * 4, height - inset * 2, row_height):
+        color = tuple(rng.randrange(120, 240) for _ in range(3)) + (255,)
+        draw.rounded_rectangle((inset * 2, top, width - inset * 2, top + row_height * 2 // 3),
+                               radius=row_height // 6, fill=color)
+    noise = Image.effect_noise((width // 2, height // 6), 48).convert("RGBA")
+    image.paste(noise, (width // 4, height // 2))
+    return image
+
+
+def _metadata_text(script: str, repeat: int) -> str:
+    return " ".join(CAPTIONS[script][i % len(CAPTIONS[script])] for i in range(repeat))
+
+
+def _copy_code(workspace: Path):
+    for package in ("screenshots", "metadata"):
+        source = SCRIPTS_DIR / package
+        target = workspace / package
+        target.mkdir(parents=True, exist_ok=True)
+        for path in source.glob("*.py"):
+            shutil.copy2(path, target / path.name)
+        (target / "resources" / "config").mkdir(parents=True, exist_ok=True)
+
+    fonts = SCRIPTS_DIR / "screenshots" / "resources" / "fonts"
+    if fonts.exists():
+        (workspace / "screenshots" / "resources" / "fonts").symlink_to(fonts, target_is_directory=True)
+
+
+def build_workspace(workspace: Path, spec: FixtureSpec) -> Dict[str, int]:
+    """Create the pipeline code and synthetic apps under workspace. Returns fixture counts."""
+    rng = random.Random(spec.seed)
+    _copy_code(workspace)
+    screenshots_dir = workspace / "screenshots"
+    metadata_dir = workspace / "metadata"
+    devices = {
+        "iphone": (spec.iphone_size, spec.iphone_phone_size, "iphone69", 0.8, 180, -120, 100),
+        "ipad": (spec.ipad_size, spec.ipad_phone_size, "APP_IPAD_PRO_3GEN_129", 1.8, -20, -200, 110),
+    }
+
+    images = 0
+    for app_name in spec.app_names:
+        resources = screenshots_dir / "resources" / app_name
+        resources.mkdir(parents=True, exist_ok=True)
+        device_config = {}
+        for device_type, (size, phone_size, identifier, scale, phone_y, text_y, title) in devices.items():
+            background_name = f"{device_type}_background.jpg"
+            _background(size, rng).save(resources / background_name, quality=90)
+            names = []
+            for index in range(1, spec.screenshots + 1):
+                name = f"{device_type}_{index:02d}.png"
+                _screenshot(phone_size, rng).save(resources / name)
+                names.append({"filename": name})
+            images += spec.screenshots + 1
+            device_config[device_type] = {
+                "background_image": background_name,
+                "phone_y_offset": phone_y,
+                "text_y_offset": text_y,
+                "fastlane_device_identifier": identifier,
+                "scale_factor": scale,
+                "font_size_title": title,
+                "font_size_body": 32,
+                "screenshots": names,
+            }
+
+        screenshot_localization = {}
+        metadata_localization = {}
+        for language, script, font_mapping in spec.language_entries:
+            captions = CAPTIONS[script]
+            screenshot_localization[language] = {
+                "screenshot_texts": [captions[i % len(captions)] for i in range(spec.screenshots)],
+                "font_mapping": dict(font_mapping, font_color="#FFFFFF"),
+            }
+            metadata_localization[language] = {
+                "name": f"{app_name.title()}: {captions[0][:18]}",
+                "subtitle": captions[1][:30],
+                "description": _metadata_text(script, 24),
+                "keywords": ",".join(captions[2].split()[:10]),
+                "release_notes": _metadata_text(script, 4),
+            }
+
+        with open(screenshots_dir / "resources" / "config" / f"{app_name}_config.json", 'w', encoding='utf-8') as f:
+            json.dump({"app_name": app_name, "output_base_dir": "output", "devices": device_config,
+                       "localization": screenshot_localization}, f, ensure_ascii=False, indent=2)
+        with open(metadata_dir / "resources" / "config" / f"{app_name}_config.json", 'w', encoding='utf-8') as f:
+            json.dump({"app_name": app_name, "base_language": spec.language_entries[0][0],
+                       "marketing_url": "https://example.com", "support_url": "https://example.com/support",
+                       "privacy_url": "https://example.com/privacy", "localization": metadata_localization},
+                      f, ensure_ascii=False, indent=2)
+
+    return {
+        "apps": spec.apps,
+        "languages": spec.languages,
+        "source_images": images,
+        "outputs": spec.apps * len(devices) * spec.languages * spec.screenshots,
+    }
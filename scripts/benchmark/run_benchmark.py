@@ -0,0 +1,244 @@
+"""
+Benchmark the screenshot and metadata pipelines on synthetic fixtures
+
+    python3 run_benchmark.py --apps 2 --languages 4            # run and compare with baseline.json
+    python3 run_benchmark.py --save-baseline                   # store this run as the new baseline
+    python3 run_benchmark.py --ipad-phone-size 2000x2600 --jobs 4
+
+Each pipeline runs in a fresh subprocess inside a throwaway workspace, so
+wall time includes interpreter start-up and peak RSS is that of the largest
+process (worker processes included once they are reaped). The fixtures are
+built in a subprocess too: on Linux a child starts from its parent's peak-RSS
+mark, so the harness itself must never hold the decoded images.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from fixtures import FixtureSpec
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+# Only slowdowns larger than both the relative threshold and these floors are flagged
+NOISE_FLOOR = {"seconds": 0.05, "rss_mb": 5.0}
+
+METADATA_DRIVER = "import sys, run_metadata\nfor app in sys.argv[1:]:\n    run_metadata.main([app])\n"
+FIXTURE_DRIVER = (
+    "import json, sys\n"
+    "from pathlib import Path\n"
+    "from fixtures import FixtureSpec, build_workspace\n"
+    "spec = {key: tuple(value) if isinstance(value, list) else value\n"
+    "        for key, value in json.loads(sys.argv[2]).items()}\n"
+    "counts = build_workspace(Path(sys.argv[1]), FixtureSpec(**spec))\n"
+    "Path(sys.argv[3]).write_text(json.dumps(counts))\n"
+)
+
+
+def _size(value: str) -> Tuple[int, int]:
+    try:
+        width, height = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got '{value}'")
+    return width, height
+
+
+def _rss_mb(max_rss: int) -> float:
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def _run(command: List[str], cwd: Path, log_path: Path) -> Dict[str, float]:
+    """Run command to completion and return its wall time and peak RSS"""
+    with open(log_path, 'a', encoding='utf-8') as log:
+        log.write(f"\n$ {' '.join(command)}\n")
+        log.flush()
+        started = time.perf_counter()
+        process = subprocess.Popen(command, cwd=str(cwd), stdout=log, stderr=subprocess.STDOUT)
+        _, status, usage = os.wait4(process.pid, 0)
+        wall_seconds = time.perf_counter() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(f"{' '.join(command)} exited with {process.returncode}, see {log_path}")
+    return {"wall_seconds": wall_seconds, "peak_rss_mb": _rss_mb(usage.ru_maxrss)}
+
+
+def _summarize(runs: List[Dict[str, float]]) -> Dict[str, float]:
+    return {
+        "wall_seconds": statistics.median(run["wall_seconds"] for run in runs),
+        "peak_rss_mb": max(run["peak_rss_mb"] for run in runs),
+        "runs": len(runs),
+    }
+
+
+def run_benchmark(spec: FixtureSpec, jobs: int, repeat: int, workspace: Path) -> Dict:
+    """Build the fixtures in workspace and time every pipeline. Returns the result document."""
+    print(f"Building fixtures in {workspace}")
+    log_path = workspace / "benchmark.log"
+    python = sys.executable
+    counts_path = workspace / "fixture_counts.json"
+    _run([python, "-c", FIXTURE_DRIVER, str(workspace), json.dumps(spec.to_dict()), str(counts_path)],
+         Path(__file__).parent, log_path)
+    fixture_counts = json.loads(counts_path.read_text())
+    screenshots_dir = workspace / "screenshots"
+    metadata_dir = workspace / "metadata"
+
+    screenshot_command = [python, "run_screenshots.py", "--all", "--jobs", str(jobs),
+                          "--profile-json", str(workspace / "stages.json")]
+    cold_runs, warm_runs, metadata_runs = [], [], []
+    for attempt in range(1, repeat + 1):
+        print(f"Run {attempt}/{repeat}: screenshots (full matrix)")
+        shutil.rmtree(screenshots_dir / "output", ignore_errors=True)
+        cold_runs.append(_run(screenshot_command, screenshots_dir, log_path))
+
+        print(f"Run {attempt}/{repeat}: screenshots (incremental, nothing changed)")
+        warm_runs.append(_run([python, "run_screenshots.py", "--all", "--jobs", str(jobs)],
+                              screenshots_dir, log_path))
+
+        print(f"Run {attempt}/{repeat}: metadata")
+        shutil.rmtree(metadata_dir / "output", ignore_errors=True)
+        metadata_runs.append(_run([python, "-c", METADATA_DRIVER] + spec.app_names, metadata_dir, log_path))
+
+    with open(workspace / "stages.json", 'r', encoding='utf-8') as f:
+        stages = json.load(f)["total"]
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "jobs": jobs,
+        },
+        "fixture": dict(spec.to_dict(), **fixture_counts),
+        "screenshots": dict(_summarize(cold_runs), stages=stages),
+        "screenshots_incremental": _summarize(warm_runs),
+        "metadata": _summarize(metadata_runs),
+    }
+
+
+def _metrics(result: Dict) -> Dict[str, float]:
+    """Flatten the comparable numbers of a result document"""
+    metrics = {}
+    for section in ("screenshots", "screenshots_incremental", "metadata"):
+        data = result.get(section, {})
+        for key in ("wall_seconds", "peak_rss_mb"):
+            if key in data:
+                metrics[f"{section}.{key}"] = data[key]
+    for stage, entry in result.get("screenshots", {}).get("stages", {}).items():
+        metrics[f"stage.{stage}.seconds"] = entry["seconds"]
+    return metrics
+
+
+def compare(result: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Print current vs baseline for every metric and return the regressed metric names"""
+    # Round-trip through JSON so tuples in a fresh result compare equal to the stored lists
+    result = json.loads(json.dumps(result))
+    if baseline.get("fixture") != result.get("fixture"):
+        print("Warning: baseline was recorded with a different fixture; comparison is indicative only")
+    if baseline.get("environment") != result.get("environment"):
+        print("Warning: baseline was recorded on a different environment")
+
+    current, previous = _metrics(result), _metrics(baseline)
+    regressions = []
+    print(f"\n{'metric':<40} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, value in current.items():
+        if name not in previous:
+            print(f"{name:<40} {'-':>10} {value:>10.2f}")
+            continue
+        base = previous[name]
+        change = (value - base) / base * 100 if base else 0.0
+        floor = NOISE_FLOOR["rss_mb"] if name.endswith("rss_mb") else NOISE_FLOOR["seconds"]
+        regressed = value > base * (1 + threshold) and value - base > floor
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<40} {base:>10.2f} {value:>10.2f} {change:>+7.1f}%{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def print_result(result: Dict):
+    fixture = result["fixture"]
+    print(f"\nFixture: {fixture['apps']} apps x {fixture['languages']} languages, "
+          f"{fixture['outputs']} output screenshots, {fixture['source_images']} source images")
+    for section in ("screenshots", "screenshots_incremental", "metadata"):
+        data = result[section]
+        print(f"  {section:<24} {data['wall_seconds']:>8.2f}s  peak RSS {data['peak_rss_mb']:>7.1f} MB")
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    defaults = FixtureSpec()
+    parser = argparse.ArgumentParser(description="Benchmark the screenshot and metadata pipelines")
+    parser.add_argument("--apps", type=int, default=defaults.apps, help="Number of synthetic apps")
+    parser.add_argument("--languages", type=int, default=defaults.languages, help="Languages per app")
+    parser.add_argument("--screenshots", type=int, default=defaults.screenshots, help="Screenshots per device")
+    parser.add_argument("--iphone-size", type=_size, default=defaults.iphone_size, metavar="WxH",
+                        help="iPhone background size")
+    parser.add_argument("--iphone-phone-size", type=_size, default=defaults.iphone_phone_size, metavar="WxH",
+                        help="iPhone source screenshot size")
+    parser.add_argument("--ipad-size", type=_size, default=defaults.ipad_size, metavar="WxH",
+                        help="iPad background size")
+    parser.add_argument("--ipad-phone-size", type=_size, default=defaults.ipad_phone_size, metavar="WxH",
+                        help="iPad source screenshot size")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Worker processes for the screenshot pipeline")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per pipeline (median wall time is reported)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative slowdown flagged as a regression (default: 0.10 = 10%%)")
+    parser.add_argument("--output", type=Path, help="Also write the result JSON here")
+    parser.add_argument("--keep", action="store_true", help="Keep the workspace (logs, outputs) for inspection")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    spec = FixtureSpec(apps=args.apps, languages=args.languages, screenshots=args.screenshots,
+                       iphone_size=args.iphone_size, iphone_phone_size=args.iphone_phone_size,
+                       ipad_size=args.ipad_size, ipad_phone_size=args.ipad_phone_size)
+
+    workspace = Path(tempfile.mkdtemp(prefix="fews-benchmark-"))
+    try:
+        result = run_benchmark(spec, jobs=args.jobs, repeat=args.repeat, workspace=workspace)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        return 2
+    finally:
+        if args.keep:
+            print(f"Workspace kept: {workspace}")
+        else:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    print_result(result)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"Result written: {args.output}")
+
+    regressions = []
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"Baseline saved: {args.baseline}")
+    elif args.baseline.exists():
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(result, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        else:
+            print("\nNo regressions against the baseline")
+    else:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -41,6 +41,18 @@ def setup_venv():
         print(f"❌ 예상치 못한 오류: {e}")
         return False
 
+def venv_python_path(venv_dir: Path) -> Optional[Path]:
+    """가상환경의 Python 경로를 반환합니다. 없으면 None을 반환합니다."""
+    if os.name == 'nt':  # Windows
+        python_path = venv_dir / "Scripts" / "python"
+    else:  # Unix/Linux/macOS
+        python_path = venv_dir / "bin" / "python"
+    return python_path if python_path.exists() else None
+
+def running_in_venv(venv_dir: Path) -> bool:
+    """현재 Python이 venv_dir 가상환경의 Python인지 확인합니다."""
+    return Path(sys.prefix).resolve() == venv_dir.resolve()
+
 def run_screenshots():
     """스크린샷 이미지를 생성합니다."""
     screenshots_dir = Path(__file__).parent / "screenshots"
@@ -52,19 +64,22 @@ def run_screenshots():
     
     # 가상환경 Python 경로 확인
     venv_dir = Path(__file__).parent / "venv"
-    if venv_dir.exists():
-        if os.name == 'nt':  # Windows
-            python_path = venv_dir / "Scripts" / "python"
-        else:  # Unix/Linux/macOS
-            python_path = venv_dir / "bin" / "python"
-        
-        if python_path.exists():
-            print(f"🐍 가상환경 Python 사용: {python_path}")
-        else:
-            print("⚠️  가상환경 Python을 찾을 수 없습니다. 시스템 Python을 사용합니다.")
-            python_path = sys.executable
+    python_path = venv_python_path(venv_dir)
+    
+    # 가상환경 Python으로 실행 중이거나 가상환경이 없을 때만 프로세스 안에서 바로 실행합니다.
+    # (다른 Python에서는 Fastfile과 다른 Pillow로 생성될 수 있으므로 가상환경 Python을 따로 실행)
+    if python_path is None or running_in_venv(venv_dir):
+        in_process = run_screenshots_in_process(screenshots_dir)
+        if in_process is not None:
+            return in_process
+    
+    if python_path is not None:
+        print(f"🐍 가상환경 Python 사용: {python_path}")
     else:
-        print("⚠️  가상환경이 없습니다. 시스템 Python을 사용합니다.")
+        if venv_dir.exists():
+            print("⚠️  가상환경 Python을 찾을 수 없습니다. 시스템 Python을 사용합니다.")
+        else:
+            print("⚠️  가상환경이 없습니다. 시스템 Python을 사용합니다.")
         python_path = sys.executable
     
     try:
@@ -88,6 +103,29 @@ def run_screenshots():
         print(f"❌ 예상치 못한 오류: {e}")
         return False
 
+def run_screenshots_in_process(screenshots_dir: Path) -> Optional[bool]:
+    """render_matrix API로 스크린샷을 생성합니다. Pillow를 import할 수 없으면 None을 반환합니다."""
+    if str(screenshots_dir) not in sys.path:
+        sys.path.insert(0, str(screenshots_dir))
+    try:
+        import run_screenshots as screenshots_cli
+    except ImportError:
+        return None
+    
+    try:
+        print("🎨 스크린샷 이미지 생성을 시작합니다...")
+        result = screenshots_cli.main([])
+        if result is None or not result.ok:
+            print("❌ 스크린샷 생성 실패")
+            return False
+        
+        print("✅ 스크린샷 이미지 생성이 완료되었습니다!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 예상치 못한 오류: {e}")
+        return False
+
 def show_menu():
     """메뉴를 표시합니다."""
     print("\n" + "=" * 50)
@@ -0,0 +1,97 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_WRITE_WORKERS = 8
+
+
+@dataclass
+class WriteStats:
+    """BatchWriter.flush 결과"""
+    written: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    failed: List[Tuple[str, str]] = field(default_factory=list)  # (경로, 오류 메시지)
+
+    def merge(self, other: "WriteStats"):
+        self.written.extend(other.written)
+        self.unchanged.extend(other.unchanged)
+        self.failed.extend(other.failed)
+
+    def summary(self) -> str:
+        return f"{len(self.written)} written, {len(self.unchanged)} unchanged, {len(self.failed)} failed"
+
+
+def _encode(content: str) -> bytes:
+    """텍스트 모드 쓰기(open(..., 'w'))와 같은 바이트로 변환합니다."""
+    return content.replace('\n', os.linesep).encode('utf-8')
+
+
+def _write_if_changed(path: Path, data: bytes) -> bool:
+    """내용이 다를 때만 파일을 씁니다. 파일을 썼으면 True를 반환합니다."""
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+class BatchWriter:
+    """metadata 파일 쓰기를 모아 두었다가 한 번에 처리합니다.
+
+    디렉토리는 flush할 때 한 번씩만 만들고, 파일은 스레드 풀에서 씁니다.
+    내용이 같은 파일은 다시 쓰지 않으므로 mtime이 그대로 유지됩니다.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_WRITE_WORKERS, verbose: bool = False):
+        self.max_workers = max_workers
+        self.verbose = verbose
+        self._pending: Dict[Path, bytes] = {}
+
+    def add(self, path: Path, content: str):
+        self._pending[Path(path)] = _encode(content)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def flush(self) -> WriteStats:
+        """쌓인 파일을 모두 씁니다."""
+        pending, self._pending = self._pending, {}
+        stats = WriteStats()
+        if not pending:
+            return stats
+
+        failed_dirs: Dict[Path, str] = {}
+        for directory in sorted({path.parent for path in pending}):
+            try:
+                directory.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                failed_dirs[directory] = str(e)
+
+        def write(item: Tuple[Path, bytes]) -> Tuple[Path, Optional[bool], Optional[str]]:
+            path, data = item
+            if path.parent in failed_dirs:
+                return path, None, failed_dirs[path.parent]
+            try:
+                return path, _write_if_changed(path, data), None
+            except OSError as e:
+                return path, None, str(e)
+
+        workers = max(1, min(self.max_workers, len(pending)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(write, pending.items()))
+
+        for path, written, error in results:
+            if error is not None:
+                print(f"Error writing file {path}: {error}")
+                stats.failed.append((str(path), error))
+            elif written:
+                stats.written.append(str(path))
+                if self.verbose:
+                    print(f"Created: {path}")
+            else:
+                stats.unchanged.append(str(path))
+        return stats
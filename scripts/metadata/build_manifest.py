@@ -0,0 +1,80 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+MANIFEST_FILENAME = ".build_manifest.json"
+MANIFEST_VERSION = 1
+
+# 이 파일들이 바뀌면 모든 출력물을 다시 생성합니다.
+CODE_FILES = ("make_metadata.py", "build_manifest.py", "batch_writer.py")
+
+_code_version: Optional[str] = None
+
+
+def code_version() -> str:
+    """metadata 생성 코드의 해시를 반환합니다."""
+    global _code_version
+    if _code_version is None:
+        hasher = hashlib.sha256()
+        for name in CODE_FILES:
+            hasher.update(name.encode('utf-8'))
+            hasher.update((Path(__file__).parent / name).read_bytes())
+        _code_version = hasher.hexdigest()
+    return _code_version
+
+
+def fingerprint(inputs: Dict[str, Any]) -> str:
+    """입력값(및 코드 버전)의 해시를 반환합니다."""
+    payload = json.dumps({"code": code_version(), "inputs": inputs}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class BuildManifest:
+    """언어별 출력 디렉토리(<App>/<lang>)마다 입력 해시와 생성된 파일 목록을 기록합니다."""
+
+    def __init__(self, output_root: Path, entries: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.output_root = Path(output_root)
+        self.path = self.output_root / MANIFEST_FILENAME
+        self.entries: Dict[str, Dict[str, Any]] = entries or {}
+
+    @classmethod
+    def load(cls, output_root: Path) -> "BuildManifest":
+        """manifest 파일을 로드합니다. 없거나 읽을 수 없으면 빈 manifest를 반환합니다."""
+        manifest_path = Path(output_root) / MANIFEST_FILENAME
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != MANIFEST_VERSION:
+                return cls(output_root)
+            return cls(output_root, data.get("entries", {}))
+        except FileNotFoundError:
+            return cls(output_root)
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable build manifest {manifest_path}: {e}")
+            return cls(output_root)
+
+    def is_fresh(self, key: str, output_fingerprint: str) -> bool:
+        """입력이 바뀌지 않았고 기록된 파일이 모두 존재하는지 확인합니다."""
+        entry = self.entries.get(key)
+        if not entry or entry.get("fingerprint") != output_fingerprint:
+            return False
+        return all((self.output_root / key / name).exists() for name in entry.get("files", []))
+
+    def files(self, key: str) -> List[str]:
+        return list(self.entries.get(key, {}).get("files", []))
+
+    def record(self, key: str, output_fingerprint: str, files: List[str]):
+        self.entries[key] = {"fingerprint": output_fingerprint, "files": sorted(files)}
+
+    def forget(self, key: str):
+        self.entries.pop(key, None)
+
+    def keys_under(self, prefix: str) -> List[str]:
+        return [key for key in self.entries if key.startswith(prefix.rstrip('/') + '/')]
+
+    def save(self):
+        self.output_root.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({"version": MANIFEST_VERSION, "entries": self.entries}, f, indent=1, sort_keys=True,
+                      ensure_ascii=False)
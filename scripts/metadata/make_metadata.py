@@ -1,13 +1,23 @@
 import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from build_manifest import BuildManifest, fingerprint
+from batch_writer import BatchWriter, WriteStats
+
+CONFIG_DIR = Path(__file__).parent / "resources" / "config"
 
 class MetadataGenerator:
-    def __init__(self, app_name: str = "plots"):
+    def __init__(self, app_name: str = "plots", config_data: Optional[Dict] = None):
         self.app_name = app_name.lower()
-        self.config_path = Path(__file__).parent / "resources" / "config" / f"{self.app_name}_config.json"
-        self.config_data = self._load_config()
+        self.config_path = CONFIG_DIR / f"{self.app_name}_config.json"
+        # 미리 읽어 둔 config가 있으면 파일을 다시 읽지 않습니다.
+        self.config_data = config_data if config_data is not None else self._load_config()
+        # 여러 스레드에서 실행할 때는 언어별 로그를 끄고 결과 요약만 출력합니다.
+        self.verbose = True
         
     def _load_config(self) -> Dict:
         """config 파일을 로드합니다."""
@@ -38,22 +48,44 @@ class MetadataGenerator:
         """앱의 표시 이름을 가져옵니다."""
         return self.config_data.get("app_name", self.app_name).title()
     
-    def _ensure_directory_exists(self, directory_path: Path):
-        """디렉토리가 존재하지 않으면 생성합니다."""
-        directory_path.mkdir(parents=True, exist_ok=True)
+    def _forget_failed_writes(self, stats: WriteStats, manifest: Optional[BuildManifest]):
+        """쓰기에 실패한 언어는 manifest에서 지워 다음 실행 때 다시 생성되게 합니다."""
+        if manifest is None:
+            return
+        output_base_dir = self._get_output_base_dir()
+        for path, _ in stats.failed:
+            manifest.forget(Path(path).parent.relative_to(output_base_dir).as_posix())
     
-    def _write_metadata_file(self, file_path: Path, content: str):
-        """metadata 파일을 작성합니다."""
-        try:
-            self._ensure_directory_exists(file_path.parent)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            print(f"Created: {file_path}")
-        except Exception as e:
-            print(f"Error writing file {file_path}: {e}")
+    def _remove_stale_files(self, lang_dir: Path, generated_files: List[str], previous_files: Iterable[str]) -> bool:
+        """이전에 생성했거나 디렉토리에 남아 있지만 이번에 생성하지 않는 파일을 삭제합니다.
+        
+        필드가 비거나 URL이 빠지면 이전 파일이 남아 그대로 업로드되지 않도록 합니다.
+        하나라도 삭제하지 못하면 False를 반환합니다.
+        """
+        current = {Path(path).name for path in generated_files}
+        candidates = set(previous_files)
+        if lang_dir.is_dir():
+            candidates.update(path.name for path in lang_dir.iterdir() if path.is_file())
+        removed_all = True
+        for name in sorted(candidates - current):
+            stale_path = lang_dir / name
+            try:
+                if stale_path.exists():
+                    stale_path.unlink()
+                    if self.verbose:
+                        print(f"  Removed stale output: {stale_path}")
+            except OSError as e:
+                print(f"Error: Could not remove stale output {stale_path}: {e}")
+                removed_all = False
+        return removed_all
     
-    def generate_language_metadata(self, language: str):
-        """특정 언어의 metadata 파일들을 생성합니다."""
+    def generate_language_metadata(self, language: str, manifest: Optional[BuildManifest] = None,
+                                   writer: Optional[BatchWriter] = None):
+        """특정 언어의 metadata 파일들을 생성합니다.
+        
+        manifest가 주어지면 입력이 바뀌지 않은 언어는 다시 쓰지 않고 기존 파일 목록을 반환합니다.
+        writer가 주어지면 파일을 바로 쓰지 않고 writer에 쌓아 두며, 호출한 쪽에서 flush해야 합니다.
+        """
         if not self.config_data:
             print("Error: No config data available")
             return []
@@ -97,16 +129,41 @@ class MetadataGenerator:
             if url_value:
                 metadata_files[f"{url_field}.txt"] = url_value
         
+        manifest_key = f"{app_display_name}/{language}"
+        language_fingerprint = None
+        if manifest is not None:
+            language_fingerprint = fingerprint(metadata_files)
+            if manifest.is_fresh(manifest_key, language_fingerprint):
+                if self.verbose:
+                    print(f"  {language}: up to date")
+                return [str(lang_dir / filename) for filename in manifest.files(manifest_key)]
+        
+        own_writer = writer is None
+        if own_writer:
+            writer = BatchWriter()
+        
         generated_files = []
         for filename, content in metadata_files.items():
             if content:  # 내용이 있는 경우에만 파일 생성
                 file_path = lang_dir / filename
-                self._write_metadata_file(file_path, content)
+                writer.add(file_path, content)
                 generated_files.append(str(file_path))
         
+        removed_all = self._remove_stale_files(lang_dir, generated_files,
+                                               manifest.files(manifest_key) if manifest is not None else [])
+        if manifest is not None:
+            if removed_all:
+                manifest.record(manifest_key, language_fingerprint, [Path(path).name for path in generated_files])
+            else:
+                manifest.forget(manifest_key)
+        
+        if own_writer:
+            stats = writer.flush()
+            self._forget_failed_writes(stats, manifest)
+        
         return generated_files
     
-    def generate_all_metadata(self):
+    def generate_all_metadata(self, manifest: Optional[BuildManifest] = None):
         """모든 언어의 metadata를 생성합니다."""
         print(f"Starting metadata generation for {self.app_name}")
         
@@ -122,32 +179,176 @@ class MetadataGenerator:
         
         all_generated_files = {}
         total_files = 0
+        writer = BatchWriter()
         
         for language in supported_languages:
-            print(f"Generating metadata for language: {language}")
-            generated_files = self.generate_language_metadata(language)
+            generated_files = self.generate_language_metadata(language, manifest=manifest, writer=writer)
             
             if generated_files:
                 all_generated_files[language] = generated_files
                 total_files += len(generated_files)
-                print(f"  {language}: {len(generated_files)} files generated")
             else:
                 print(f"  {language}: No files generated")
         
-        print(f"Total metadata generation complete: {total_files} files")
+        # 모든 언어의 파일을 한 번에 기록 (디렉토리 생성 1회, 스레드 풀 쓰기, 내용이 같으면 건너뜀)
+        write_stats = writer.flush()
+        self._forget_failed_writes(write_stats, manifest)
+        
+        print(f"Total metadata generation complete: {total_files} files across {len(all_generated_files)} languages "
+              f"({write_stats.summary()})")
         
         return {
             "generated_files": all_generated_files,
             "total_files": total_files,
             "supported_languages": supported_languages,
             "app_name": self.app_name,
-            "output_directory": str(self._get_output_base_dir())
+            "app_display_name": self._get_app_display_name(),
+            "output_directory": str(self._get_output_base_dir()),
+            "write_stats": write_stats
         }
 
-def generate_metadata(app_name: str):
+def generate_metadata(app_name: str, manifest: Optional[BuildManifest] = None):
     """지정된 앱의 metadata를 생성합니다."""
     generator = MetadataGenerator(app_name=app_name)
-    return generator.generate_all_metadata()
+    return generator.generate_all_metadata(manifest=manifest)
+
+@dataclass
+class MetadataUnitResult:
+    """(앱, 언어) 작업 하나의 결과. 앱 config를 읽지 못하면 language는 None입니다."""
+    app_name: str
+    language: Optional[str]
+    files: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    up_to_date: bool = False
+    write_stats: WriteStats = field(default_factory=WriteStats)
+
+@dataclass
+class MetadataRunResult:
+    """generate_metadata_matrix의 통합 결과"""
+    units: List[MetadataUnitResult] = field(default_factory=list)
+    app_display_names: Dict[str, str] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+    
+    @property
+    def failures(self) -> List[MetadataUnitResult]:
+        return [unit for unit in self.units if unit.error is not None]
+    
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+    
+    @property
+    def total_files(self) -> int:
+        return sum(len(unit.files) for unit in self.units)
+    
+    @property
+    def write_stats(self) -> WriteStats:
+        stats = WriteStats()
+        for unit in self.units:
+            stats.merge(unit.write_stats)
+        return stats
+    
+    def failed_apps(self) -> List[str]:
+        return sorted({unit.app_name for unit in self.failures})
+    
+    def app_result(self, app_name: str) -> Dict[str, Any]:
+        """generate_metadata와 같은 형식의 앱별 결과"""
+        units = [unit for unit in self.units if unit.app_name == app_name and unit.language is not None]
+        generated_files = {unit.language: unit.files for unit in units if unit.files}
+        return {
+            "generated_files": generated_files,
+            "total_files": sum(len(files) for files in generated_files.values()),
+            "supported_languages": [unit.language for unit in units],
+            "app_name": app_name,
+            "app_display_name": self.app_display_names.get(app_name),
+        }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        stats = self.write_stats
+        return {
+            "elapsed_seconds": self.elapsed_seconds,
+            "total_files": self.total_files,
+            "written": len(stats.written),
+            "unchanged": len(stats.unchanged),
+            "apps": {app_name: self.app_result(app_name)["generated_files"] for app_name in self.app_display_names},
+            "failures": [{"app": unit.app_name, "language": unit.language, "error": unit.error}
+                         for unit in self.failures],
+        }
+
+def load_configs(app_names: Iterable[str]) -> Tuple[Dict[str, Dict], Dict[str, str]]:
+    """모든 앱의 config를 한 번에 읽습니다. (앱별 config, 읽지 못한 앱별 오류)를 반환합니다."""
+    configs, errors = {}, {}
+    for app_name in app_names:
+        config_path = CONFIG_DIR / f"{app_name.lower()}_config.json"
+        try:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config_data = json.load(f)
+        except FileNotFoundError:
+            errors[app_name] = f"Config file not found: {config_path}"
+            continue
+        except Exception as e:
+            errors[app_name] = f"Could not load config file {config_path}: {e}"
+            continue
+        if not config_data.get("localization"):
+            errors[app_name] = f"No localization data found in {config_path}"
+            continue
+        configs[app_name] = config_data
+    return configs, errors
+
+def _generate_unit(generator: MetadataGenerator, language: str,
+                   manifest: Optional[BuildManifest]) -> MetadataUnitResult:
+    """(앱, 언어) 하나를 생성하고 바로 기록합니다. 워커 스레드에서 실행됩니다."""
+    unit = MetadataUnitResult(generator.app_name, language)
+    try:
+        writer = BatchWriter(max_workers=1)
+        unit.files = generator.generate_language_metadata(language, manifest=manifest, writer=writer)
+        unit.up_to_date = bool(unit.files) and len(writer) == 0
+        unit.write_stats = writer.flush()
+        generator._forget_failed_writes(unit.write_stats, manifest)
+        if unit.write_stats.failed:
+            unit.error = "; ".join(f"{path}: {error}" for path, error in unit.write_stats.failed)
+    except Exception as e:
+        unit.error = str(e)
+    return unit
+
+def generate_metadata_matrix(app_names: Iterable[str], jobs: Optional[int] = None,
+                             manifest: Optional[BuildManifest] = None) -> MetadataRunResult:
+    """여러 앱의 metadata를 한 번에 생성합니다.
+    
+    config를 모두 먼저 읽은 뒤 (앱, 언어) 단위 작업을 하나의 스레드 풀에 나눠 실행합니다.
+    실패는 삼키지 않고 MetadataRunResult.failures에 모두 담깁니다.
+    manifest는 여러 스레드가 함께 갱신합니다 (키 단위 dict 갱신만 하므로 GIL로 충분합니다).
+    """
+    started = time.perf_counter()
+    app_names = list(app_names)
+    configs, errors = load_configs(app_names)
+    result = MetadataRunResult()
+    
+    generators = {}
+    units: List[Tuple[MetadataGenerator, str]] = []
+    for app_name in app_names:
+        if app_name in errors:
+            print(f"Error: {errors[app_name]}")
+            result.units.append(MetadataUnitResult(app_name.lower(), None, error=errors[app_name]))
+            continue
+        generator = MetadataGenerator(app_name=app_name, config_data=configs[app_name])
+        generator.verbose = False
+        generators[generator.app_name] = generator
+        result.app_display_names[generator.app_name] = generator._get_app_display_name()
+        units.extend((generator, language) for language in generator._get_supported_languages())
+    
+    max_workers = max(1, jobs if jobs is not None else min(32, (os.cpu_count() or 1) * 4))
+    print(f"Generating metadata: {len(units)} (app, language) units from {len(generators)} apps "
+          f"on {max_workers} workers")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # 작업 순서대로 결과를 모읍니다 (실행 순서와 무관하게 출력이 같도록)
+        result.units.extend(executor.map(lambda item: _generate_unit(item[0], item[1], manifest), units))
+    
+    up_to_date = sum(1 for unit in result.units if unit.up_to_date)
+    if up_to_date:
+        print(f"{up_to_date} of {len(units)} units up to date")
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
 
 if __name__ == "__main__":
     # 테스트용 - 실제 사용시에는 run_metadata.py를 사용해야 합니다.
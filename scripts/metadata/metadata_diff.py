@@ -0,0 +1,155 @@
+"""
+생성된 metadata(output/<App>/<lang>)와 fastlane/metadata/<App>/<lang>를 내용 해시로 비교합니다.
+
+    python3 metadata_diff.py Plots            # 변경 사항 출력
+    python3 metadata_diff.py --all --json changes.json
+    python3 metadata_diff.py Plots --apply    # 바뀐 파일만 fastlane/metadata에 반영
+"""
+
+import argparse
+import hashlib
+import json
+import shutil
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+OUTPUT_DIR = Path(__file__).parent / "output"
+FASTLANE_METADATA_DIR = Path(__file__).resolve().parents[2] / "fastlane" / "metadata"
+
+
+def hash_tree(root: Path, pattern: str = "**/*") -> Dict[str, str]:
+    """root 아래 파일들의 {상대 경로: sha256}을 반환합니다."""
+    if not root.is_dir():
+        return {}
+    digests = {}
+    for path in root.glob(pattern):
+        if path.is_file():
+            digests[path.relative_to(root).as_posix()] = hashlib.sha256(path.read_bytes()).hexdigest()
+    return digests
+
+
+@dataclass
+class Changeset:
+    """한 앱의 변경 사항. 경로는 앱 디렉토리 기준 상대 경로(<lang>/<file>)입니다."""
+    app: str
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.modified or self.removed)
+
+    @property
+    def changed_languages(self) -> List[str]:
+        """변경된 파일이 있는 언어 목록"""
+        return sorted({path.split('/', 1)[0] for path in self.added + self.modified + self.removed if '/' in path})
+
+    def summary(self) -> str:
+        return (f"{len(self.added)} added, {len(self.modified)} modified, {len(self.removed)} removed, "
+                f"{self.unchanged} unchanged")
+
+    def to_dict(self) -> Dict:
+        return {
+            "added": self.added,
+            "modified": self.modified,
+            "removed": self.removed,
+            "unchanged": self.unchanged,
+            "changed_languages": self.changed_languages,
+        }
+
+
+def diff_app(app: str, output_dir: Path = OUTPUT_DIR,
+             target_dir: Path = FASTLANE_METADATA_DIR) -> Changeset:
+    """output/<app>와 fastlane/metadata/<app>의 차이를 계산합니다.
+
+    Fastfile은 <lang>/*.txt만 복사하고 대상 앱 폴더를 통째로 교체하므로,
+    생성된 쪽은 <lang>/*.txt만, 대상 쪽은 모든 파일을 비교합니다.
+    """
+    source = hash_tree(output_dir / app, "*/*.txt")
+    target = hash_tree(target_dir / app)
+    changeset = Changeset(app)
+    for path, digest in sorted(source.items()):
+        if path not in target:
+            changeset.added.append(path)
+        elif target[path] != digest:
+            changeset.modified.append(path)
+        else:
+            changeset.unchanged += 1
+    changeset.removed = sorted(path for path in target if path not in source)
+    return changeset
+
+
+def apply_changeset(changeset: Changeset, output_dir: Path = OUTPUT_DIR,
+                    target_dir: Path = FASTLANE_METADATA_DIR):
+    """변경된 파일만 복사/삭제합니다. 바뀌지 않은 파일은 건드리지 않습니다."""
+    source_root = output_dir / changeset.app
+    target_root = target_dir / changeset.app
+    for path in changeset.added + changeset.modified:
+        destination = target_root / path
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(source_root / path, destination)
+    for path in changeset.removed:
+        (target_root / path).unlink()
+    # 비어 버린 언어 폴더 정리
+    for directory in sorted({(target_root / path).parent for path in changeset.removed}, reverse=True):
+        if directory != target_root and directory.is_dir() and not any(directory.iterdir()):
+            directory.rmdir()
+
+
+def generated_apps(output_dir: Path = OUTPUT_DIR) -> List[str]:
+    return sorted(path.name for path in output_dir.iterdir() if path.is_dir()) if output_dir.is_dir() else []
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="생성된 metadata와 fastlane/metadata 비교")
+    parser.add_argument("apps", nargs="*", help="앱 폴더 이름 (예: Plots)")
+    parser.add_argument("--all", action="store_true", help="output에 있는 모든 앱 비교")
+    parser.add_argument("--apply", action="store_true", help="변경된 파일만 fastlane/metadata에 반영")
+    parser.add_argument("--json", type=Path, help="변경 사항을 JSON으로 저장")
+    parser.add_argument("--target", type=Path, default=FASTLANE_METADATA_DIR,
+                        help=f"비교 대상 폴더 (기본: {FASTLANE_METADATA_DIR})")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    available = generated_apps()
+    if args.all:
+        apps = available
+    else:
+        # 대소문자 구분 없이 output 폴더 이름과 맞춥니다.
+        by_lower = {name.lower(): name for name in available}
+        apps = []
+        for app in args.apps:
+            if app.lower() not in by_lower:
+                print(f"Error: No generated metadata for '{app}' in {OUTPUT_DIR}")
+                return 1
+            apps.append(by_lower[app.lower()])
+    if not apps:
+        print("Error: No apps selected (use app names or --all)")
+        return 1
+
+    changesets = [diff_app(app, target_dir=args.target) for app in apps]
+    for changeset in changesets:
+        print(f"{changeset.app}: {changeset.summary()}")
+        for label, paths in (("+", changeset.added), ("~", changeset.modified), ("-", changeset.removed)):
+            for path in paths:
+                print(f"  {label} {path}")
+        if args.apply and not changeset.is_empty:
+            apply_changeset(changeset, target_dir=args.target)
+            print(f"  → {len(changeset.changed_languages)} languages updated in {args.target / changeset.app}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({changeset.app: changeset.to_dict() for changeset in changesets}, f, indent=2,
+                      ensure_ascii=False)
+        print(f"Changeset written: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
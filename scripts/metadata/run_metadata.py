@@ -1,15 +1,44 @@
-from make_metadata import generate_metadata
+from make_metadata import generate_metadata_matrix
+from build_manifest import BuildManifest
 from pathlib import Path
-import json
+from typing import Dict, List, Optional
+import argparse
 import shutil
 import sys
 
-def main():
+def _remove_stale_outputs(manifest: BuildManifest, result: Dict):
+    """config에서 사라진 언어의 이전 출력물을 삭제합니다."""
+    app_display_name = result.get("app_display_name")
+    if not app_display_name:
+        return
+    current_keys = {f"{app_display_name}/{language}" for language in result.get("generated_files", {})}
+    for key in manifest.keys_under(app_display_name):
+        if key in current_keys:
+            continue
+        for name in manifest.files(key):
+            stale_path = manifest.output_root / key / name
+            if stale_path.exists():
+                stale_path.unlink()
+                print(f"Removed stale output: {stale_path}")
+        manifest.forget(key)
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="App Store metadata 생성")
+    parser.add_argument("app", nargs="?", help="앱 이름 (생략하면 대화형으로 선택)")
+    parser.add_argument("--all", action="store_true", help="모든 앱의 metadata를 생성 (대화형 선택 없음)")
+    parser.add_argument("-j", "--jobs", type=int,
+                        help="(앱, 언어) 작업을 나눠 처리할 워커 수 (기본: CPU 코어 수 x 4, 최대 32)")
+    parser.add_argument("--force", action="store_true",
+                        help="output 디렉토리를 삭제하고 모두 다시 생성 (기본: 변경된 언어만 생성)")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
     """metadata 생성 메인 함수"""
+    args = _parse_args(argv)
     
-    # 기존 output 디렉토리 정리
+    # --force: 기존 output 디렉토리 정리
     base_output_dir = Path(__file__).parent / "output"
-    if base_output_dir.exists() and base_output_dir.is_dir():
+    if args.force and base_output_dir.exists() and base_output_dir.is_dir():
         print(f"Removing existing output directory: {base_output_dir}")
         shutil.rmtree(base_output_dir)
         print("Output directory removed.")
@@ -24,8 +53,11 @@ def main():
     available_apps = [f.stem.replace("_config", "") for f in config_files]
 
     # 명령행 인수로 앱 이름이 제공된 경우
-    if len(sys.argv) > 1:
-        provided_app_name = sys.argv[1].lower()
+    if args.all:
+        selected_apps = available_apps
+        print("Generating metadata for all apps")
+    elif args.app:
+        provided_app_name = args.app.lower()
         chosen_app_name = None
         
         # 대소문자 구분 없이 앱 이름 찾기
@@ -35,7 +67,7 @@ def main():
                 break
         
         if chosen_app_name is None:
-            print(f"Error: App '{sys.argv[1]}' not found in available apps.")
+            print(f"Error: App '{args.app}' not found in available apps.")
             print("Available apps:")
             for i, app_name in enumerate(available_apps):
                 print(f"{i + 1}: {app_name}")
@@ -74,36 +106,37 @@ def main():
                 print("\nOperation cancelled by user.")
                 return
 
-    # 선택된 앱들의 metadata 생성
-    total_files_generated = 0
-    total_languages_processed = 0
+    # 선택된 앱들의 metadata 생성 (config는 한 번에 읽고, (앱, 언어) 단위로 병렬 처리)
+    manifest = BuildManifest.load(base_output_dir)
+    run_result = generate_metadata_matrix(selected_apps, jobs=args.jobs, manifest=manifest)
+    failed_apps = set(run_result.failed_apps())
     
-    for app_name in selected_apps:
-        try:
-            print(f"\n--- Generating metadata for {app_name} ---")
-            result = generate_metadata(app_name=app_name)
+    total_files_generated = 0
+    for app_name in run_result.app_display_names:
+        result = run_result.app_result(app_name)
+        if app_name not in failed_apps:
+            _remove_stale_outputs(manifest, result)
+        
+        if result.get("generated_files"):
+            app_total = result.get("total_files", 0)
+            languages_count = len(result.get("supported_languages", []))
+            total_files_generated += app_total
             
-            if result and result.get("generated_files"):
-                app_total = result.get("total_files", 0)
-                languages_count = len(result.get("supported_languages", []))
-                total_files_generated += app_total
-                total_languages_processed += languages_count
-                
-                print(f"✅ {app_name}: {app_total} files generated across {languages_count} languages")
-                
-                # 언어별 파일 수 요약 출력
-                generated_files = result.get("generated_files", {})
-                for language, files in generated_files.items():
-                    print(f"  - {language}: {len(files)} files")
-                    
-            else:
-                print(f"❌ {app_name}: Failed to generate metadata")
-                
-        except Exception as e:
-            print(f"❌ {app_name}: Error generating metadata - {e}")
+            print(f"✅ {app_name}: {app_total} files generated across {languages_count} languages")
+            
+            # 언어별 파일 수 요약 출력
+            generated_files = result.get("generated_files", {})
+            for language, files in generated_files.items():
+                print(f"  - {language}: {len(files)} files")
     
-    print(f"\n🎉 Metadata generation complete!")
-    print(f"Total files generated: {total_files_generated}")
+    for unit in run_result.failures:
+        print(f"❌ {unit.app_name}{' ' + unit.language if unit.language else ''}: Failed to generate metadata - {unit.error}")
+    
+    manifest.save()
+    
+    print(f"\n🎉 Metadata generation complete!" if run_result.ok else f"\n⚠️  Metadata generation finished with errors")
+    print(f"Total files generated: {total_files_generated} ({run_result.write_stats.summary()}) "
+          f"in {run_result.elapsed_seconds:.2f}s")
     print(f"Apps processed: {len(selected_apps)}")
     
     if total_files_generated > 0:
@@ -111,6 +144,10 @@ def main():
         print("Note: Files now contain actual localized content from the config files.")
         print("Each language has its own translated metadata content.")
         print("\n💡 Use Fastfile to copy these metadata files to the appropriate fastlane directory.")
+    
+    return run_result
 
 if __name__ == "__main__":
-    main()
+    run_result = main()
+    # 실패가 있으면 0이 아닌 종료 코드로 알립니다 (Fastfile의 sh가 실패로 처리)
+    sys.exit(1 if run_result is not None and not run_result.ok else 0)
@@ -0,0 +1,117 @@
+"""
+App configuration loading for App Store preview generation
+"""
+
+from pathlib import Path
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+CONFIG_DIR = Path(__file__).parent / "resources" / "config"
+FALLBACK_LANGUAGE = "ko"
+
+
+@dataclass(frozen=True)
+class DeviceSettings:
+    """Per-device settings from the "devices" block of <app>_config.json"""
+    phone_y_offset: int = 180
+    text_y_offset: int = -120
+    background_image: str = "iphone_background.jpg"
+    fastlane_device_identifier: str = ""
+    scale_factor: float = 0.8
+    font_size_title: int = 100
+    font_size_body: int = 32
+    fallback_font_path: Optional[str] = None
+    screenshots: Tuple[str, ...] = ()
+    resize_strategy: str = "lanczos"  # see resampling.RESIZE_STRATEGIES
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DeviceSettings":
+        defaults = cls()
+        return cls(
+            phone_y_offset=data.get("phone_y_offset", defaults.phone_y_offset),
+            text_y_offset=data.get("text_y_offset", defaults.text_y_offset),
+            background_image=data.get("background_image", defaults.background_image),
+            fastlane_device_identifier=data.get("fastlane_device_identifier", defaults.fastlane_device_identifier),
+            scale_factor=data.get("scale_factor", defaults.scale_factor),
+            font_size_title=data.get("font_size_title", defaults.font_size_title),
+            font_size_body=data.get("font_size_body", defaults.font_size_body),
+            fallback_font_path=data.get("fallback_font_path", defaults.fallback_font_path),
+            screenshots=tuple(item["filename"] for item in data.get("screenshots", [])),
+            resize_strategy=data.get("resize_strategy", defaults.resize_strategy),
+        )
+
+
+@dataclass(frozen=True)
+class AppConfig:
+    """Parsed <app>_config.json, shared by every generator of the same app"""
+    app_name: str
+    path: Optional[Path] = None
+    output_base_dir: str = "output"
+    png_profile: str = "default"
+    devices: Dict[str, DeviceSettings] = field(default_factory=dict)
+    localization: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    raw: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, app_name: str, data: Dict[str, Any], path: Optional[Path] = None) -> "AppConfig":
+        return cls(
+            app_name=data.get("app_name", app_name),
+            path=path,
+            output_base_dir=data.get("output_base_dir", "output"),
+            png_profile=data.get("png_profile", "default"),
+            devices={name: DeviceSettings.from_dict(settings) for name, settings in data.get("devices", {}).items()},
+            localization=data.get("localization", {}),
+            raw=data,
+        )
+
+    @property
+    def languages(self) -> List[str]:
+        return list(self.localization.keys())
+
+    @property
+    def device_types(self) -> List[str]:
+        return list(self.devices.keys())
+
+    def device(self, device_type: str) -> DeviceSettings:
+        """Settings for device_type, or the defaults if the device is not configured"""
+        return self.devices.get(device_type, DeviceSettings())
+
+    def screenshot_texts(self, language: str) -> List[str]:
+        return self.localization.get(language, {}).get("screenshot_texts", [])
+
+    def font_mapping(self, language: str) -> Dict[str, Any]:
+        return self.localization.get(language, {}).get("font_mapping", {})
+
+
+# resolved path -> (mtime_ns, AppConfig)
+_config_cache: Dict[str, Tuple[int, AppConfig]] = {}
+parse_count = 0
+
+
+def config_path_for(app_name: str, config_dir: Optional[Path] = None) -> Path:
+    return (config_dir or CONFIG_DIR) / f"{app_name.lower()}_config.json"
+
+
+def load_app_config(app_name: str, config_dir: Optional[Path] = None) -> AppConfig:
+    """Load <app>_config.json, parsing it only when the file changed since the last call.
+
+    Raises FileNotFoundError / json.JSONDecodeError like a plain json.load would,
+    so callers keep their existing error handling.
+    """
+    global parse_count
+    config_path = config_path_for(app_name, config_dir)
+    cache_key = str(config_path.resolve())
+    mtime_ns = config_path.stat().st_mtime_ns
+
+    cached = _config_cache.get(cache_key)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config_data = json.load(f)
+    parse_count += 1
+
+    app_config = AppConfig.from_dict(app_name.lower(), config_data, path=config_path)
+    _config_cache[cache_key] = (mtime_ns, app_config)
+    return app_config
@@ -0,0 +1,234 @@
+"""
+Decoded image cache for App Store preview generation
+"""
+
+from PIL import Image
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from profiling import NULL_TIMER, StageTimer
+
+# (phone_x, phone_y, phone_width, phone_height) within the base plate
+PhoneBox = Tuple[int, int, int, int]
+
+
+@dataclass(frozen=True)
+class BasePlate:
+    """Background with the phone composited, shared by every language of a (device, screenshot)"""
+    image: Optional[Image.Image]  # flattened RGB, ready to be copied and captioned (None in low-memory mode)
+    composite: Image.Image        # unflattened RGBA, used to flatten the caption region exactly
+    phone_box: PhoneBox
+
+    def flattened_copy(self) -> Image.Image:
+        """A private RGB copy of the plate to draw the caption on"""
+        if self.image is not None:
+            return self.image.copy()
+        plate = Image.new("RGB", self.composite.size, (255, 255, 255))
+        plate.paste(self.composite, mask=self.composite.getchannel("A"))
+        return plate
+
+
+def estimate_bytes(value: Any) -> int:
+    """Approximate memory held by a cached image or base plate"""
+    if isinstance(value, BasePlate):
+        return estimate_bytes(value.image) + estimate_bytes(value.composite)
+    if isinstance(value, Image.Image):
+        return value.width * value.height * len(value.getbands())
+    return 0
+
+
+class AssetCache:
+    """Keeps decoded source images and composited base plates in memory, keyed by (path, mtime, scale).
+
+    The phone screenshot, its scale factor and the background only depend on
+    (app, device), so every language of the same device can reuse one decode,
+    one resize pass and one composite. Entries are invalidated automatically
+    when a source file's mtime changes.
+
+    With max_bytes set, least recently used entries are also evicted to keep
+    the decoded pixels under that many bytes (the newest entry always stays).
+    """
+
+    def __init__(self, max_entries: int = 16, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes_used = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+
+    @staticmethod
+    def _file_key(path: Path) -> Optional[Tuple[str, int]]:
+        try:
+            return str(path), path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        image = self._entries.get(key)
+        if image is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return image
+
+        self.misses += 1
+        image = factory()
+        self._entries[key] = image
+        self._sizes[key] = estimate_bytes(image)
+        self.bytes_used += self._sizes[key]
+        self._evict()
+        return image
+
+    def _evict(self):
+        while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self.bytes_used > self.max_bytes)):
+            key, _ = self._entries.popitem(last=False)
+            self.bytes_used -= self._sizes.pop(key)
+
+    def set_budget(self, max_bytes: Optional[int]):
+        """Limit the cache to max_bytes of decoded pixels (None = entry count only)"""
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def get_background(self, path: Path, fallback_size: Tuple[int, int] = (1200, 800),
+                       timer: StageTimer = NULL_TIMER) -> Image.Image:
+        """Get the background as an RGBA composite base. Callers must copy before drawing on it."""
+        file_key = self._file_key(path)
+
+        def load() -> Image.Image:
+            if file_key is None:
+                return Image.new("RGB", fallback_size, (255, 255, 255)).convert("RGBA")
+            with timer.stage("decode"), Image.open(path) as image:
+                return image.convert("RGB").convert("RGBA")
+
+        return self._get_or_create(("background", file_key or fallback_size), load)
+
+    def get_base_plate(self, background_path: Path, phone_path: Path, scale_factor: float, phone_y_offset: int,
+                       resize: Callable[[Image.Image, Tuple[int, int]], Image.Image],
+                       timer: StageTimer = NULL_TIMER, low_memory: bool = False,
+                       resize_strategy: str = "lanczos") -> Optional[BasePlate]:
+        """Get the background with the phone already composited, or None if the phone is missing.
+
+        resize_strategy names what `resize` does, so plates resized differently
+        are cached apart.
+
+        The alpha composite and RGBA->RGB flatten run once per (device, screenshot);
+        each language only copies the plate and draws its caption. Callers must
+        copy the plate (BasePlate.flattened_copy) before drawing on it.
+
+        In low-memory mode the background is not cached on its own, the phone is
+        decoded at reduced size where possible, and only the RGBA composite is
+        kept (each language flattens its own copy).
+        """
+        phone_key = self._file_key(phone_path)
+        if phone_key is None:
+            return None
+        background_key = self._file_key(background_path)
+
+        def build() -> BasePlate:
+            if low_memory:
+                work_image = self._decode_background(background_path, timer)
+            else:
+                work_image = self.get_background(background_path, timer=timer).copy()
+            phone_image = self._decode_phone_layer(phone_path, scale_factor, resize, timer, low_memory)
+
+            with timer.stage("composite"):
+                bg_width, bg_height = work_image.size
+                new_width, new_height = phone_image.size
+                phone_x = (bg_width - new_width) // 2
+                phone_y = bg_height - new_height + phone_y_offset
+                work_image.paste(phone_image, (phone_x, phone_y), phone_image)
+                phone_image.close()
+
+                plate = None
+                if not low_memory:
+                    plate = Image.new("RGB", work_image.size, (255, 255, 255))
+                    plate.paste(work_image, mask=work_image.split()[3])
+            return BasePlate(plate, work_image, (phone_x, phone_y, new_width, new_height))
+
+        return self._get_or_create(("plate", background_key, phone_key, scale_factor, phone_y_offset,
+                                    resize_strategy), build)
+
+    def get_draft_plate(self, background_path: Path, phone_path: Path, canvas_size: Tuple[int, int],
+                        phone_box: PhoneBox, scale: float, timer: StageTimer = NULL_TIMER) -> Optional[Image.Image]:
+        """Background with the phone composited at a reduced scale, for draft renders (RGB, copy before drawing).
+
+        canvas_size and phone_box are the full-resolution geometry; everything is
+        scaled by `scale` with a bilinear filter, and JPEG backgrounds are
+        decoded at reduced size directly.
+        """
+        phone_key = self._file_key(phone_path)
+        if phone_key is None:
+            return None
+        background_key = self._file_key(background_path)
+
+        def scaled(value: float) -> int:
+            return max(1, round(value * scale))
+
+        def build() -> Image.Image:
+            size = (scaled(canvas_size[0]), scaled(canvas_size[1]))
+            with timer.stage("decode"):
+                if background_key is None:
+                    plate = Image.new("RGB", size, (255, 255, 255))
+                else:
+                    with Image.open(background_path) as background:
+                        background.draft("RGB", size)
+                        plate = background.convert("RGB")
+                with Image.open(phone_path) as phone:
+                    phone_image = phone.convert("RGBA")
+            with timer.stage("resize"):
+                if plate.size != size:
+                    plate = plate.resize(size, Image.Resampling.BILINEAR)
+                phone_x, phone_y, phone_width, phone_height = phone_box
+                phone_image = phone_image.resize((scaled(phone_width), scaled(phone_height)),
+                                                 Image.Resampling.BILINEAR, reducing_gap=2.0)
+            with timer.stage("composite"):
+                # Same RGBA paste + flatten onto white as get_base_plate, so soft phone edges match
+                composite = plate.convert("RGBA")
+                composite.paste(phone_image, (round(phone_x * scale), round(phone_y * scale)), phone_image)
+                plate = Image.new("RGB", size, (255, 255, 255))
+                plate.paste(composite, mask=composite.getchannel("A"))
+            return plate
+
+        return self._get_or_create(("draft", background_key, phone_key, canvas_size, phone_box, scale), build)
+
+    @staticmethod
+    def _decode_background(path: Path, timer: StageTimer = NULL_TIMER,
+                           fallback_size: Tuple[int, int] = (1200, 800)) -> Image.Image:
+        """Uncached background decode, for low-memory mode"""
+        if not path.exists():
+            return Image.new("RGBA", fallback_size, (255, 255, 255, 255))
+        with timer.stage("decode"), Image.open(path) as image:
+            if image.mode == "RGB":
+                return image.convert("RGBA")
+            return image.convert("RGB").convert("RGBA")
+
+    @staticmethod
+    def _decode_phone_layer(path: Path, scale_factor: float,
+                            resize: Callable[[Image.Image, Tuple[int, int]], Image.Image],
+                            timer: StageTimer = NULL_TIMER, low_memory: bool = False) -> Image.Image:
+        with timer.stage("decode"), Image.open(path) as image:
+            original_width, original_height = image.size
+            new_size = (int(original_width * scale_factor), int(original_height * scale_factor))
+            if low_memory and scale_factor < 1:
+                # JPEG only: let the decoder downscale by 1/2, 1/4 or 1/8 while staying >= new_size
+                image.draft("RGB", new_size)
+            phone_image = image.convert("RGBA")
+        with timer.stage("resize"):
+            resized = resize(phone_image, new_size)
+        if low_memory:
+            phone_image.close()
+        return resized
+
+    def clear(self):
+        """Drop every cached image"""
+        self._entries.clear()
+        self._sizes.clear()
+        self.bytes_used = 0
+
+
+# Process-wide cache shared by every ScreenshotGenerator (one per worker process)
+shared_asset_cache = AssetCache()
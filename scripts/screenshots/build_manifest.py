@@ -0,0 +1,130 @@
+"""
+Build manifest for incremental screenshot generation
+"""
+
+from pathlib import Path
+import hashlib
+import json
+from typing import Any, Dict, Optional, Tuple
+
+MANIFEST_FILENAME = ".build_manifest.json"
+MANIFEST_VERSION = 1
+
+# Source files whose changes invalidate every output
+CODE_FILES = ("make_screenshots.py", "fonts.py", "asset_cache.py", "app_config.py", "build_manifest.py",
+              "text_layout.py", "font_coverage.py", "resampling.py")
+
+# (path, mtime_ns, size) -> sha256
+_digest_cache: Dict[Tuple[str, int, int], str] = {}
+_code_version: Optional[str] = None
+
+
+def file_digest(path: Optional[Path]) -> Optional[str]:
+    """sha256 of a file's content, memoized by (path, mtime, size). None if missing."""
+    if path is None:
+        return None
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    digest = _digest_cache.get(key)
+    if digest is None:
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+        _digest_cache[key] = digest
+    return digest
+
+
+def code_version() -> str:
+    """Combined digest of the generator sources"""
+    global _code_version
+    if _code_version is None:
+        base_dir = Path(__file__).parent
+        hasher = hashlib.sha256()
+        for name in CODE_FILES:
+            hasher.update(name.encode('utf-8'))
+            hasher.update((file_digest(base_dir / name) or "").encode('utf-8'))
+        _code_version = hasher.hexdigest()
+    return _code_version
+
+
+def fingerprint(inputs: Dict[str, Any]) -> str:
+    """Stable digest of an output's inputs (plus the code version)"""
+    payload = json.dumps({"code": code_version(), "inputs": inputs}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class BuildManifest:
+    """Maps each output file to the fingerprint of the inputs it was rendered from.
+
+    Workers load the manifest read-only and collect their changes in `updates`;
+    the parent process merges them with `apply` and saves once.
+    """
+
+    def __init__(self, output_root: Path, outputs: Optional[Dict[str, str]] = None):
+        self.output_root = Path(output_root)
+        self.path = self.output_root / MANIFEST_FILENAME
+        self.outputs: Dict[str, str] = outputs or {}
+        self.updates: Dict[str, Optional[str]] = {}
+
+    @classmethod
+    def load(cls, output_root: Path) -> "BuildManifest":
+        manifest_path = Path(output_root) / MANIFEST_FILENAME
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != MANIFEST_VERSION:
+                return cls(output_root)
+            return cls(output_root, data.get("outputs", {}))
+        except FileNotFoundError:
+            return cls(output_root)
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable build manifest {manifest_path}: {e}")
+            return cls(output_root)
+
+    def key_for(self, output_path: Path) -> str:
+        output_path = Path(output_path)
+        try:
+            return output_path.resolve().relative_to(self.output_root.resolve()).as_posix()
+        except ValueError:
+            return output_path.resolve().as_posix()
+
+    def is_fresh(self, output_path: Path, output_fingerprint: str) -> bool:
+        """True if output_path exists and was rendered from identical inputs"""
+        return self.outputs.get(self.key_for(output_path)) == output_fingerprint and Path(output_path).exists()
+
+    def record(self, output_path: Path, output_fingerprint: str):
+        key = self.key_for(output_path)
+        self.outputs[key] = output_fingerprint
+        self.updates[key] = output_fingerprint
+
+    def forget(self, output_path: Path):
+        key = self.key_for(output_path)
+        self.outputs.pop(key, None)
+        self.updates[key] = None
+
+    def apply(self, updates: Dict[str, Optional[str]]):
+        """Merge updates collected by another (worker) manifest"""
+        for key, value in updates.items():
+            self.updates[key] = value
+            if value is None:
+                self.outputs.pop(key, None)
+            else:
+                self.outputs[key] = value
+
+    def rendered_count(self) -> int:
+        """Number of outputs (re)rendered since this manifest was loaded"""
+        return sum(1 for value in self.updates.values() if value is not None)
+
+    def keys_under(self, prefix: str):
+        return [key for key in self.outputs if key.startswith(prefix.rstrip('/') + '/')]
+
+    def save(self):
+        self.output_root.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({"version": MANIFEST_VERSION, "outputs": self.outputs}, f, indent=1, sort_keys=True)
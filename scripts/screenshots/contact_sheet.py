@@ -0,0 +1,118 @@
+"""
+Contact sheets for reviewing App Store previews
+
+One image per (app, device, screenshot index) with a labelled thumbnail of
+every language, so a whole app can be reviewed in a handful of files.
+Thumbnails are made by the generator from the in-memory image right after
+it is encoded; only outputs skipped as up to date are decoded again.
+
+    output/contact_sheets/<app>/<device>/01_iphone69_1.png
+"""
+
+from PIL import Image, ImageDraw, ImageFont
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import io
+import math
+
+THUMBNAIL_WIDTH = 240
+SHEET_COLUMNS = 5
+SHEET_DIR_NAME = "contact_sheets"
+
+_PADDING = 16
+_LABEL_HEIGHT = 28
+_BACKGROUND = (40, 40, 40)
+_LABEL_COLOR = (255, 255, 255)
+
+
+def make_thumbnail(image: Image.Image, width: int = THUMBNAIL_WIDTH) -> bytes:
+    """Downscale an image to `width` and return it as a quickly encoded PNG (small enough to send between processes)"""
+    height = max(1, round(image.height * width / image.width))
+    thumbnail = image.convert("RGB").resize((width, height), Image.Resampling.BILINEAR, reducing_gap=2.0)
+    buffer = io.BytesIO()
+    thumbnail.save(buffer, format="PNG", compress_level=1)
+    return buffer.getvalue()
+
+
+def thumbnail_from_file(path: str, width: int = THUMBNAIL_WIDTH) -> Optional[bytes]:
+    """Fallback for outputs that were not rendered in this run"""
+    try:
+        with Image.open(path) as image:
+            return make_thumbnail(image, width)
+    except OSError:
+        return None
+
+
+def build_contact_sheet(thumbnails: List[Tuple[str, bytes]], columns: int = SHEET_COLUMNS) -> Image.Image:
+    """Tile (label, thumbnail PNG) pairs into a grid with the label under each tile"""
+    tiles = []
+    for label, data in thumbnails:
+        with Image.open(io.BytesIO(data)) as tile:
+            tiles.append((label, tile.convert("RGB")))
+    tile_width = max(tile.width for _, tile in tiles)
+    tile_height = max(tile.height for _, tile in tiles)
+    columns = max(1, min(columns, len(tiles)))
+    rows = math.ceil(len(tiles) / columns)
+    cell_width = tile_width + _PADDING
+    cell_height = tile_height + _LABEL_HEIGHT + _PADDING
+
+    sheet = Image.new("RGB", (columns * cell_width + _PADDING, rows * cell_height + _PADDING), _BACKGROUND)
+    draw = ImageDraw.Draw(sheet)
+    font = ImageFont.load_default(size=_LABEL_HEIGHT * 2 // 3)
+    for position, (label, tile) in enumerate(tiles):
+        x = _PADDING + (position % columns) * cell_width
+        y = _PADDING + (position // columns) * cell_height
+        sheet.paste(tile, (x + (tile_width - tile.width) // 2, y))
+        draw.text((x + tile_width // 2, y + tile_height + _LABEL_HEIGHT // 2), label,
+                  font=font, fill=_LABEL_COLOR, anchor="mm")
+    return sheet
+
+
+def sheet_path(output_path: str, app: str, device: str) -> Path:
+    """output[/draft]/<app>/<device>/<language>/<file> -> output[/draft]/contact_sheets/<app>/<device>/<file>"""
+    path = Path(output_path)
+    return path.parents[3] / SHEET_DIR_NAME / app / device / path.name
+
+
+def write_contact_sheets(records, columns: int = SHEET_COLUMNS,
+                         languages: Optional[Dict[str, List[str]]] = None) -> List[str]:
+    """Build one sheet per (app, device, screenshot index) from RenderRecords, in record order.
+
+    Records carry the thumbnail made while rendering; up-to-date records
+    without one are thumbnailed from the file on disk. With `languages`
+    (app -> languages in config order), every sheet tiles all of the app's
+    languages, reading the existing outputs of languages without a record,
+    so a partial re-render does not shrink the sheet to the re-rendered tiles.
+    """
+    groups: "OrderedDict[Tuple[str, str, int], List]" = OrderedDict()
+    for record in records:
+        groups.setdefault((record.app, record.device, record.index), []).append(record)
+
+    written = []
+    for (app, device, _), group in groups.items():
+        # (language, thumbnail or None, output path)
+        entries = [(record.language, record.thumbnail, record.path) for record in group]
+        if languages and app in languages:
+            by_language = {record.language: record for record in group}
+            template = Path(group[0].path)
+            entries = []
+            for language in languages[app] + [l for l in by_language if l not in languages[app]]:
+                record = by_language.get(language)
+                if record is not None:
+                    entries.append((language, record.thumbnail, record.path))
+                elif (template.parents[1] / language / template.name).exists():
+                    entries.append((language, None, str(template.parents[1] / language / template.name)))
+
+        thumbnails = []
+        for language, data, path in entries:
+            data = data or thumbnail_from_file(path)
+            if data is not None:
+                thumbnails.append((language, data))
+        if not thumbnails:
+            continue
+        path = sheet_path(group[0].path, app, device)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        build_contact_sheet(thumbnails, columns).save(path, format="PNG", compress_level=1)
+        written.append(str(path))
+    return written
@@ -0,0 +1,290 @@
+"""
+Glyph coverage index for App Store preview fonts
+
+Reads the cmap of every font under resources/fonts and the known system
+font paths once, and keeps the covered codepoints as ranges in a JSON file
+next to the fonts. Entries are re-read only when a file's mtime or size
+changes, so choosing a font for a caption is a lookup instead of a load:
+
+    from font_coverage import shared_coverage_index
+    shared_coverage_index.missing("resources/fonts/NotoSans-Bold.ttf", "नमस्ते")
+
+    python3 font_coverage.py            # (re)build the index and print coverage per font
+"""
+
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import json
+import os
+import struct
+import sys
+
+FONTS_DIR = Path(__file__).parent / "resources" / "fonts"
+INDEX_PATH = FONTS_DIR / ".coverage_index.json"
+INDEX_VERSION = 1
+FONT_SUFFIXES = {".ttf", ".otf", ".ttc", ".otc"}
+
+# System fonts tried by FontManager, in fallback order
+CJK_SYSTEM_FONT_PATHS = [
+    # Korean fonts
+    '/System/Library/Fonts/AppleSDGothicNeo.ttc',
+    '/System/Library/Fonts/Supplemental/AppleSDGothicNeo.ttc',
+    '/Library/Fonts/AppleSDGothicNeo.ttc',
+    # Chinese fonts
+    '/System/Library/Fonts/PingFang.ttc',
+    '/System/Library/Fonts/Supplemental/PingFang.ttc',
+    '/System/Library/Fonts/PingFangSC-Regular.otf',
+    '/System/Library/Fonts/PingFangTC-Regular.otf',
+    # Japanese fonts
+    '/System/Library/Fonts/Hiragino Sans GB.ttc',
+    '/System/Library/Fonts/HiraginoSans-W3.otf',
+    '/System/Library/Fonts/HiraginoSans-W6.otf',
+    # Fallback
+    '/System/Library/Fonts/STHeiti Light.ttc',
+    '/System/Library/Fonts/STHeiti Medium.ttc',
+]
+GENERAL_SYSTEM_FONT_PATHS = [
+    '/System/Library/Fonts/AppleSDGothicNeo.ttc',
+    '/System/Library/Fonts/Supplemental/AppleSDGothicNeo.ttc',
+    '/Library/Fonts/AppleSDGothicNeo.ttc',
+    '/System/Library/Fonts/Helvetica.ttc',
+    '/System/Library/Fonts/Arial.ttf'
+]
+# Bare names, resolved through the platform font directories like ImageFont.truetype does
+COMMON_FONT_NAMES = [
+    'NotoSansCJK-Regular.ttf',
+    'NotoSansCJK-Bold.ttf',
+    'DejaVuSans.ttf',
+    'Arial.ttf'
+]
+
+# Inclusive (first, last) codepoint ranges
+Ranges = List[Tuple[int, int]]
+
+
+def _system_font_dirs() -> List[str]:
+    """The directories ImageFont.truetype searches for a bare font name"""
+    if sys.platform == "win32":
+        windir = os.environ.get("WINDIR")
+        return [os.path.join(windir, "fonts")] if windir else []
+    if sys.platform.startswith("linux"):
+        data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+        data_dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+        return [os.path.join(directory, "fonts") for directory in [data_home] + data_dirs.split(":")]
+    if sys.platform == "darwin":
+        return ["/Library/Fonts", "/System/Library/Fonts", os.path.expanduser("~/Library/Fonts")]
+    return []
+
+
+_resolved_names: Dict[str, Optional[Path]] = {}
+
+
+def resolve_font_name(name: str) -> Optional[Path]:
+    """Path FreeType would load for a bare font file name, or None if it is not installed"""
+    if name not in _resolved_names:
+        resolved = Path(name) if Path(name).is_file() else None
+        for directory in _system_font_dirs() if resolved is None else []:
+            for root, _, filenames in os.walk(directory):
+                if name in filenames:
+                    resolved = Path(root) / name
+                    break
+            if resolved is not None:
+                break
+        _resolved_names[name] = resolved
+    return _resolved_names[name]
+
+
+def known_font_files(fonts_dir: Path = FONTS_DIR) -> List[Path]:
+    """Every font FontManager can pick: bundled fonts, known system paths and common names"""
+    files = sorted(path for path in fonts_dir.rglob("*") if path.suffix.lower() in FONT_SUFFIXES) \
+        if fonts_dir.is_dir() else []
+    files += [Path(path) for path in CJK_SYSTEM_FONT_PATHS + GENERAL_SYSTEM_FONT_PATHS if Path(path).exists()]
+    files += [path for path in map(resolve_font_name, COMMON_FONT_NAMES) if path is not None]
+    return list(dict.fromkeys(files))
+
+
+def _to_ranges(codepoints: Iterable[int]) -> Ranges:
+    return _merge_ranges((code, code) for code in codepoints)
+
+
+def _merge_ranges(ranges: Iterable[Tuple[int, int]]) -> Ranges:
+    merged: Ranges = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def _cmap_format4(data: bytes, offset: int) -> Ranges:
+    seg_count = struct.unpack_from(">H", data, offset + 6)[0] // 2
+    ends_at = offset + 14
+    starts_at = ends_at + seg_count * 2 + 2
+    deltas_at = starts_at + seg_count * 2
+    range_offsets_at = deltas_at + seg_count * 2
+    ends = struct.unpack_from(f">{seg_count}H", data, ends_at)
+    starts = struct.unpack_from(f">{seg_count}H", data, starts_at)
+    deltas = struct.unpack_from(f">{seg_count}H", data, deltas_at)
+    range_offsets = struct.unpack_from(f">{seg_count}H", data, range_offsets_at)
+    codepoints = []
+    for segment, (start, end, delta, range_offset) in enumerate(zip(starts, ends, deltas, range_offsets)):
+        if start == 0xFFFF:
+            continue
+        for code in range(start, end + 1):
+            if range_offset == 0:
+                glyph = (code + delta) & 0xFFFF
+            else:
+                glyph_at = range_offsets_at + segment * 2 + range_offset + (code - start) * 2
+                glyph = struct.unpack_from(">H", data, glyph_at)[0]
+                glyph = (glyph + delta) & 0xFFFF if glyph else 0
+            if glyph:
+                codepoints.append(code)
+    return _to_ranges(codepoints)
+
+
+def _cmap_format12(data: bytes, offset: int) -> Ranges:
+    group_count = struct.unpack_from(">I", data, offset + 12)[0]
+    return _merge_ranges(struct.unpack_from(">2I", data, offset + 16 + group * 12) for group in range(group_count))
+
+
+# (platform, encoding) of the cmap subtables to read, best first
+_CMAP_PREFERENCE = [(3, 10), (0, 6), (0, 4), (3, 1), (0, 3), (0, 2), (0, 1), (0, 0), (3, 0)]
+
+
+def read_cmap(path: Path) -> Optional[Ranges]:
+    """Codepoints mapped by the first face of a TrueType/OpenType font or collection.
+
+    None if the font has no Unicode cmap in a format we read (4 or 12).
+    """
+    data = Path(path).read_bytes()
+    face_at = 0
+    if data[:4] == b"ttcf":
+        face_at = struct.unpack_from(">I", data, 12)[0]
+    table_count = struct.unpack_from(">H", data, face_at + 4)[0]
+    for table in range(table_count):
+        tag, _, table_at, _ = struct.unpack_from(">4sIII", data, face_at + 12 + table * 16)
+        if tag == b"cmap":
+            break
+    else:
+        return None
+
+    subtables = {}
+    for record in range(struct.unpack_from(">H", data, table_at + 2)[0]):
+        platform, encoding, subtable_at = struct.unpack_from(">HHI", data, table_at + 4 + record * 8)
+        subtables.setdefault((platform, encoding), table_at + subtable_at)
+    for key in _CMAP_PREFERENCE:
+        if key not in subtables:
+            continue
+        subtable_at = subtables[key]
+        subtable_format = struct.unpack_from(">H", data, subtable_at)[0]
+        if subtable_format == 12:
+            return _cmap_format12(data, subtable_at)
+        if subtable_format == 4:
+            return _cmap_format4(data, subtable_at)
+    return None
+
+
+def _significant_codepoints(text: str) -> List[int]:
+    """Codepoints a caption needs glyphs for (whitespace and control characters are never drawn)"""
+    return sorted({ord(char) for char in text if not char.isspace() and ord(char) >= 0x20})
+
+
+class FontCoverageIndex:
+    """Persisted map of font file -> covered codepoint ranges, invalidated by mtime and size"""
+
+    def __init__(self, path: Path = INDEX_PATH):
+        self.path = path
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._starts: Dict[str, List[int]] = {}
+        self.dirty = False
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self._entries = data.get("fonts", {}) if data.get("version") == INDEX_VERSION else {}
+            except (OSError, ValueError):
+                self._entries = {}
+            if not self._entries:
+                self.build()
+        return self._entries
+
+    def build(self, files: Optional[Iterable[Path]] = None):
+        """Index every known font (or the given files) and save; unchanged entries are kept"""
+        if self._entries is None:
+            self._entries = {}
+        for path in (files if files is not None else known_font_files()):
+            self.coverage(path)
+        self.save()
+
+    def coverage(self, font_path: Path) -> Optional[Ranges]:
+        """Covered ranges of a font, re-reading its cmap only if the file changed.
+
+        None if the file does not exist or its cmap could not be read.
+        """
+        entries = self._entries if self._entries is not None else self._load()
+        key = str(Path(font_path).resolve())
+        try:
+            stat = os.stat(key)
+        except OSError:
+            if entries.pop(key, None) is not None:
+                self.dirty = True
+            return None
+        entry = entries.get(key)
+        if entry is None or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            try:
+                ranges = read_cmap(Path(key))
+            except (OSError, struct.error, IndexError):
+                ranges = None
+            entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+                     "ranges": [list(r) for r in ranges] if ranges is not None else None}
+            entries[key] = entry
+            self._starts.pop(key, None)
+            self.dirty = True
+        return [tuple(r) for r in entry["ranges"]] if entry["ranges"] is not None else None
+
+    def missing(self, font_path: Path, text: str) -> str:
+        """Characters of text the font has no glyph for ("" when the coverage is unknown)"""
+        ranges = self.coverage(font_path)
+        if ranges is None or not text:
+            return ""
+        key = str(Path(font_path).resolve())
+        starts = self._starts.get(key)
+        if starts is None:
+            starts = self._starts[key] = [first for first, _ in ranges]
+        missing = []
+        for code in _significant_codepoints(text):
+            position = bisect_right(starts, code) - 1
+            if position < 0 or code > ranges[position][1]:
+                missing.append(chr(code))
+        return "".join(missing)
+
+    def save(self):
+        """Write the index if anything changed (atomically, several workers may share it)"""
+        if not self.dirty or self._entries is None:
+            return
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": INDEX_VERSION, "fonts": self._entries}, f)
+            os.replace(temp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"Warning: Could not save font coverage index {self.path}: {e}")
+
+
+# Shared by every FontManager in the process
+shared_coverage_index = FontCoverageIndex()
+
+
+if __name__ == "__main__":
+    index = FontCoverageIndex()
+    index.build()
+    for font_file in known_font_files():
+        ranges = index.coverage(font_file) or []
+        print(f"{sum(last - first + 1 for first, last in ranges):>7} codepoints  {font_file}")
+    print(f"Index written: {index.path}")
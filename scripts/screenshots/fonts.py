@@ -3,21 +3,94 @@ Font management module for App Store preview generation
 """
 
 from PIL import ImageFont
+from collections import OrderedDict
 from pathlib import Path
 import platform
-import json
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Callable, List, Tuple, Union
+from app_config import AppConfig, FALLBACK_LANGUAGE, config_path_for, load_app_config
+from font_coverage import (CJK_SYSTEM_FONT_PATHS, COMMON_FONT_NAMES, GENERAL_SYSTEM_FONT_PATHS,
+                           FontCoverageIndex, resolve_font_name, shared_coverage_index)
+
+
+class FontCache:
+    """Process-wide LRU of loaded FreeType faces keyed by (resolved path, size, variation axes)"""
+    
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple, Union[ImageFont.FreeTypeFont, OSError]]" = OrderedDict()
+    
+    @staticmethod
+    def _make_key(font: Union[str, Path], size: int, font_variant: Optional[Dict[str, Any]]) -> Tuple:
+        font_path = Path(font)
+        # Bare names (e.g. "DejaVuSans.ttf") are resolved by FreeType itself, so key them by name
+        resolved = str(font_path.resolve()) if font_path.exists() else str(font)
+        variation = tuple(sorted(font_variant.items())) if font_variant else ()
+        return resolved, size, variation
+    
+    def truetype(self, font: Union[str, Path], size: int,
+                 font_variant: Optional[Dict[str, Any]] = None) -> ImageFont.FreeTypeFont:
+        """Drop-in replacement for ImageFont.truetype that reuses already loaded faces.
+        
+        Failed lookups (OSError) are cached as well, so a missing font is only
+        searched for once per process.
+        """
+        key = self._make_key(font, size, font_variant)
+        cached = self._entries.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            if isinstance(cached, OSError):
+                raise OSError(*cached.args)
+            return cached
+        
+        self.misses += 1
+        try:
+            if font_variant:
+                loaded = ImageFont.truetype(str(font), size, font_variant=font_variant)
+            else:
+                loaded = ImageFont.truetype(str(font), size)
+        except OSError as e:
+            self._store(key, e)
+            raise
+        self._store(key, loaded)
+        return loaded
+    
+    def _store(self, key: Tuple, value: Union[ImageFont.FreeTypeFont, OSError]):
+        self._entries[key] = value
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for reporting"""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+    
+    def clear(self):
+        self._entries.clear()
+
+
+# Shared by every FontManager in the process
+shared_font_cache = FontCache()
 
 
 class FontManager:
     """Manages font loading and configuration for different languages"""
     
-    def __init__(self, fonts_path: Path, language: str = "ko", font_size_title: int = 100, font_size_body: int = 32):
+    def __init__(self, fonts_path: Path, language: str = "ko", font_size_title: int = 100, font_size_body: int = 32,
+                 app_config: Optional[AppConfig] = None, font_cache: Optional[FontCache] = None,
+                 coverage_text: str = "", coverage_index: Optional[FontCoverageIndex] = None):
         self.fonts_path = fonts_path
         self.language = language
         self.font_size_title = font_size_title
         self.font_size_body = font_size_body
         self.default_font = ImageFont.load_default()
+        self.app_config = app_config
+        self.font_cache = font_cache if font_cache is not None else shared_font_cache
+        # Text the title font must cover (all captions of the language); "" accepts any font
+        self.coverage_text = coverage_text
+        self.coverage_index = coverage_index if coverage_index is not None else shared_coverage_index
+        self.missing_glyphs = ""  # caption characters the loaded title font has no glyph for
         
         # Load language-specific font configuration
         self.font_mapping = self._load_language_font_config()
@@ -27,38 +100,33 @@ class FontManager:
         self.body_font = None
         
     def _load_language_font_config(self) -> Dict[str, Any]:
-        """Load language-specific font configuration from config file"""
-        config_path = self.fonts_path.parent / "config" / "plots_config.json"
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
-            
-            localized_data = config_data.get('localization', {})
-            language_config = localized_data.get(self.language, {})
-            
-            if not language_config:
-                print(f"Warning: No font configuration found for language '{self.language}'. Using 'ko' as fallback.")
-                language_config = localized_data.get("ko", {})
-            
-            font_mapping = language_config.get('font_mapping', {})
-            
-            # Set default font mapping if not found
-            if not font_mapping:
-                font_mapping = {
-                    "regular": "NotoSans-Regular.ttf",
-                    "bold": "NotoSans-Bold.ttf",
-                    "font_path": "NotoSans"
-                }
-            
-            print(f"Font mapping loaded for language '{self.language}': {font_mapping}")
-            return font_mapping
-            
-        except FileNotFoundError:
-            print(f"Error: Config file not found: {config_path}")
-            return self._get_default_font_mapping()
-        except Exception as e:
-            print(f"Error loading font configuration: {e}")
-            return self._get_default_font_mapping()
+        """Load language-specific font configuration from the app config"""
+        app_config = self.app_config
+        if app_config is None:
+            # Legacy callers without an app config get the plots font mapping
+            try:
+                app_config = load_app_config("plots", config_dir=self.fonts_path.parent / "config")
+            except FileNotFoundError:
+                print(f"Error: Config file not found: {config_path_for('plots', self.fonts_path.parent / 'config')}")
+                return self._get_default_font_mapping()
+            except Exception as e:
+                print(f"Error loading font configuration: {e}")
+                return self._get_default_font_mapping()
+        
+        language_config = app_config.localization.get(self.language, {})
+        
+        if not language_config:
+            print(f"Warning: No font configuration found for language '{self.language}'. Using '{FALLBACK_LANGUAGE}' as fallback.")
+            language_config = app_config.localization.get(FALLBACK_LANGUAGE, {})
+        
+        font_mapping = language_config.get('font_mapping', {})
+        
+        # Set default font mapping if not found
+        if not font_mapping:
+            font_mapping = self._get_default_font_mapping()
+        
+        print(f"Font mapping loaded for language '{self.language}': {font_mapping}")
+        return font_mapping
     
     def _get_default_font_mapping(self) -> Dict[str, Any]:
         """Get default font mapping"""
@@ -69,30 +137,88 @@ class FontManager:
         }
     
     def load_fonts(self) -> bool:
-        """Load fonts based on configuration with fallback chain"""
+        """Load the first font of the fallback chain that has a glyph for every caption character.
+        
+        Candidates are looked up in the font coverage index, so missing fonts and
+        fonts that cannot draw the captions are never loaded. If no candidate covers
+        the text, the one missing the fewest characters is loaded with a warning.
+        """
         try:
-            # Try custom fonts first
-            if self._load_custom_fonts():
-                return True
-            
-            # Try fallback font if specified
-            elif self._load_fallback_font():
-                return True
+            partial = []
+            for font_file, loader in self._font_candidates():
+                missing = self.coverage_index.missing(font_file, self.coverage_text)
+                if missing:
+                    partial.append((len(missing), len(partial), font_file, loader, missing))
+                elif loader():
+                    return True
             
-            # Try system fonts
-            elif self._load_system_fonts():
-                return True
+            for _, _, font_file, loader, missing in sorted(partial, key=lambda item: item[:2]):
+                if loader():
+                    self.missing_glyphs = missing
+                    print(f"Warning: No font covers every caption character for language '{self.language}'. "
+                          f"{font_file.name} has no glyphs for: {missing}")
+                    return True
             
             # Final fallback to default fonts
-            else:
-                print("Loading default fonts")
-                self._load_default_fonts()
-                return True
+            print("Loading default fonts")
+            self._load_default_fonts()
+            return True
                 
         except Exception as e:
             print(f"Font loading failed: {e}")
             self._load_default_fonts()
             return False
+        finally:
+            self.coverage_index.save()
+    
+    def _font_candidates(self) -> List[Tuple[Path, Callable[[], bool]]]:
+        """(title font file, loader) for every existing font of the fallback chain, in order:
+        custom, fallback, then system fonts."""
+        candidates = []
+        if not self.font_mapping.get("use_system_font", False):
+            custom_font_file = self._custom_title_font_file()
+            if custom_font_file is not None:
+                candidates.append((custom_font_file, self._load_custom_fonts))
+        
+        fallback_font_path_name = self.font_mapping.get("fallback_font_path")
+        if fallback_font_path_name and (self.fonts_path / fallback_font_path_name).exists():
+            candidates.append((self.fonts_path / fallback_font_path_name, self._load_fallback_font))
+        
+        for font_file in self._system_font_files():
+            candidates.append((font_file, lambda font_file=font_file: self._load_system_font_file(font_file)))
+        return candidates
+    
+    def _custom_title_font_file(self) -> Optional[Path]:
+        """The file the custom fonts would use for titles, or None if it is missing"""
+        variable_font_name = self.font_mapping.get("variable_font")
+        if variable_font_name:
+            variable_font_path = self.fonts_path / self.font_mapping.get("font_path", "") / variable_font_name
+            return variable_font_path if variable_font_path.exists() else None
+        
+        regular_font_path, bold_font_path = self._find_font_files(
+            self.font_mapping.get("font_path", "NotoSans"), self.font_mapping.get("regular", "NotoSans-Regular.ttf"),
+            self.font_mapping.get("bold", "NotoSans-Bold.ttf"))
+        if regular_font_path and regular_font_path.exists() and bold_font_path and bold_font_path.exists():
+            return bold_font_path
+        return None
+    
+    def _system_font_files(self) -> List[Path]:
+        """Installed system fonts in the order _load_system_fonts would try them"""
+        if platform.system() == 'Darwin':
+            paths = list(CJK_SYSTEM_FONT_PATHS) if self.language in ['ko', 'ja', 'zh-Hans', 'zh-Hant'] else []
+            paths += GENERAL_SYSTEM_FONT_PATHS
+            return list(dict.fromkeys(Path(path) for path in paths if Path(path).exists()))
+        return [path for path in map(resolve_font_name, COMMON_FONT_NAMES) if path is not None]
+    
+    def _load_system_font_file(self, font_file: Path) -> bool:
+        try:
+            self.title_font = self.font_cache.truetype(str(font_file), self.font_size_title)
+            self.body_font = self.font_cache.truetype(str(font_file), self.font_size_body)
+        except OSError as e:
+            print(f"Error loading system font {font_file}: {e}")
+            return False
+        print(f"Loading system font: {font_file}")
+        return True
     
     def _load_custom_fonts(self) -> bool:
         """Load custom fonts based on language configuration"""
@@ -136,12 +262,12 @@ class FontManager:
             for weight in weight_values:
                 try:
                     print(f"Trying weight {weight} for title font...")
-                    title_font = ImageFont.truetype(
+                    title_font = self.font_cache.truetype(
                         str(variable_font_path), 
                         self.font_size_title,
                         font_variant={'wght': weight}
                     )
-                    body_font = ImageFont.truetype(
+                    body_font = self.font_cache.truetype(
                         str(variable_font_path), 
                         self.font_size_body,
                         font_variant={'wght': 500}  # Medium weight for body
@@ -166,8 +292,8 @@ class FontManager:
             # Fallback: Try loading without font_variant
             try:
                 print("Trying to load variable font without font_variant...")
-                self.title_font = ImageFont.truetype(str(variable_font_path), self.font_size_title)
-                self.body_font = ImageFont.truetype(str(variable_font_path), self.font_size_body)
+                self.title_font = self.font_cache.truetype(str(variable_font_path), self.font_size_title)
+                self.body_font = self.font_cache.truetype(str(variable_font_path), self.font_size_body)
                 print(f"Successfully loaded variable font without variant: {variable_font_path}")
                 return True
             except Exception as e2:
@@ -200,8 +326,8 @@ class FontManager:
             return False
         
         # Load the fonts
-        self.title_font = ImageFont.truetype(str(bold_font_path), self.font_size_title)
-        self.body_font = ImageFont.truetype(str(regular_font_path), self.font_size_body)
+        self.title_font = self.font_cache.truetype(str(bold_font_path), self.font_size_title)
+        self.body_font = self.font_cache.truetype(str(regular_font_path), self.font_size_body)
         
         print(f"Successfully loaded fonts for language '{self.language}':")
         print(f"  Regular font: {regular_font_path}")
@@ -267,66 +393,32 @@ class FontManager:
     
     def _load_cjk_system_fonts(self) -> bool:
         """Load CJK-specific system fonts on macOS"""
-        cjk_font_paths = [
-            # Korean fonts
-            '/System/Library/Fonts/AppleSDGothicNeo.ttc',
-            '/System/Library/Fonts/Supplemental/AppleSDGothicNeo.ttc',
-            '/Library/Fonts/AppleSDGothicNeo.ttc',
-            # Chinese fonts
-            '/System/Library/Fonts/PingFang.ttc',
-            '/System/Library/Fonts/Supplemental/PingFang.ttc',
-            '/System/Library/Fonts/PingFangSC-Regular.otf',
-            '/System/Library/Fonts/PingFangTC-Regular.otf',
-            # Japanese fonts
-            '/System/Library/Fonts/Hiragino Sans GB.ttc',
-            '/System/Library/Fonts/HiraginoSans-W3.otf',
-            '/System/Library/Fonts/HiraginoSans-W6.otf',
-            # Fallback
-            '/System/Library/Fonts/STHeiti Light.ttc',
-            '/System/Library/Fonts/STHeiti Medium.ttc',
-        ]
-        
-        for font_path in cjk_font_paths:
+        for font_path in CJK_SYSTEM_FONT_PATHS:
             if Path(font_path).exists():
                 print(f"Loading CJK system font: {font_path}")
-                self.title_font = ImageFont.truetype(font_path, self.font_size_title)
-                self.body_font = ImageFont.truetype(font_path, self.font_size_body)
+                self.title_font = self.font_cache.truetype(font_path, self.font_size_title)
+                self.body_font = self.font_cache.truetype(font_path, self.font_size_body)
                 return True
         
         return False
     
     def _load_general_system_fonts(self) -> bool:
         """Load general system fonts on macOS"""
-        base_paths = [
-            '/System/Library/Fonts/AppleSDGothicNeo.ttc',
-            '/System/Library/Fonts/Supplemental/AppleSDGothicNeo.ttc',
-            '/Library/Fonts/AppleSDGothicNeo.ttc',
-            '/System/Library/Fonts/Helvetica.ttc',
-            '/System/Library/Fonts/Arial.ttf'
-        ]
-        
-        for path in base_paths:
+        for path in GENERAL_SYSTEM_FONT_PATHS:
             if Path(path).exists():
                 print(f"Loading system font: {path}")
-                self.title_font = ImageFont.truetype(path, self.font_size_title)
-                self.body_font = ImageFont.truetype(path, self.font_size_body)
+                self.title_font = self.font_cache.truetype(path, self.font_size_title)
+                self.body_font = self.font_cache.truetype(path, self.font_size_body)
                 return True
         
         return False
     
     def _load_common_fonts(self) -> bool:
         """Load common fonts on non-macOS systems"""
-        common_fonts = [
-            'NotoSansCJK-Regular.ttf',
-            'NotoSansCJK-Bold.ttf',
-            'DejaVuSans.ttf',
-            'Arial.ttf'
-        ]
-        
-        for font_name in common_fonts:
+        for font_name in COMMON_FONT_NAMES:
             try:
-                self.title_font = ImageFont.truetype(font_name, self.font_size_title)
-                self.body_font = ImageFont.truetype(font_name, self.font_size_body)
+                self.title_font = self.font_cache.truetype(font_name, self.font_size_title)
+                self.body_font = self.font_cache.truetype(font_name, self.font_size_body)
                 print(f"Loading system font: {font_name}")
                 return True
             except:
@@ -347,8 +439,8 @@ class FontManager:
         try:
             fallback_font_path = self.fonts_path / fallback_font_path_name
             if fallback_font_path.exists():
-                self.title_font = ImageFont.truetype(str(fallback_font_path), self.font_size_title)
-                self.body_font = ImageFont.truetype(str(fallback_font_path), self.font_size_body)
+                self.title_font = self.font_cache.truetype(str(fallback_font_path), self.font_size_title)
+                self.body_font = self.font_cache.truetype(str(fallback_font_path), self.font_size_body)
                 print(f"Fallback font loaded successfully: {fallback_font_path_name}")
                 return True
             else:
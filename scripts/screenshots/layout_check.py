@@ -0,0 +1,193 @@
+"""
+Layout-only dry run for App Store preview generation
+
+Lays out every caption of the matrix with the real fonts and wrapper, but
+reads only image headers and never composites or encodes a pixel (phone
+images are decoded only to find the visible frame of captions that reach it):
+
+    from layout_check import check_matrix
+    report = check_matrix(["plots", "toffs"])
+    for issue in report.issues:
+        print(issue.describe())
+"""
+
+from PIL import Image
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import contextlib
+import io
+import time
+
+from app_config import load_app_config
+from make_screenshots import CaptionLayout, ScreenshotGenerator
+from render import ScreenshotJob, job_label, plan_jobs
+
+# More lines than this crowd the phone on every device
+MAX_CAPTION_LINES = 3
+
+
+@dataclass
+class LayoutIssue:
+    """One problem found in a caption layout"""
+    app: str
+    device: str
+    language: str
+    index: int
+    kind: str      # "overflow", "glyphs", "split_word", "collision" or "lines"
+    severity: str  # "error" or "warning"
+    message: str
+
+    def describe(self) -> str:
+        return f"{self.app}/{self.device}/{self.language} #{self.index} [{self.kind}] {self.message}"
+
+
+@dataclass
+class LayoutReport:
+    """Result of a check_matrix call"""
+    layouts: List[CaptionLayout] = field(default_factory=list)
+    issues: List[LayoutIssue] = field(default_factory=list)
+    failures: Dict[str, str] = field(default_factory=dict)  # job label -> error
+    job_count: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def errors(self) -> List[LayoutIssue]:
+        return [issue for issue in self.issues if issue.severity == "error"]
+
+    @property
+    def warnings(self) -> List[LayoutIssue]:
+        return [issue for issue in self.issues if issue.severity == "warning"]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors and not self.failures
+
+    def to_dict(self) -> Dict:
+        return {
+            "jobs": self.job_count,
+            "captions": len(self.layouts),
+            "elapsed_seconds": self.elapsed_seconds,
+            "errors": len(self.errors),
+            "warnings": len(self.warnings),
+            "issues": [asdict(issue) for issue in self.issues],
+            "failures": self.failures,
+            "layouts": [dict(asdict(layout), bbox=layout.bbox, line_count=len(layout.lines))
+                        for layout in self.layouts],
+        }
+
+
+# (path, mtime) -> (image size, bounding box of the opaque pixels)
+_opaque_boxes: Dict[Tuple[str, int], Tuple[Tuple[int, int], Tuple[int, int, int, int]]] = {}
+
+
+def visible_phone_box(layout: CaptionLayout) -> Tuple[int, int, int, int]:
+    """The phone's opaque pixels on the canvas, excluding the image's transparent margin.
+
+    This is the only check that decodes pixels, so it is done lazily (only for
+    captions that reach the phone image) and memoized per file.
+    """
+    path = Path(layout.phone_image)
+    key = (str(path), path.stat().st_mtime_ns)
+    if key not in _opaque_boxes:
+        with Image.open(path) as image:
+            alpha = image.getchannel("A") if "A" in image.getbands() else None
+            _opaque_boxes[key] = (image.size, (alpha.getbbox() if alpha else None) or (0, 0) + image.size)
+    (width, height), (left, top, right, bottom) = _opaque_boxes[key]
+    phone_x, phone_y, phone_width, phone_height = layout.phone_box
+    return (phone_x + left * phone_width // width, phone_y + top * phone_height // height,
+            phone_x + right * phone_width // width, phone_y + bottom * phone_height // height)
+
+
+def check_layout(layout: CaptionLayout, max_lines: int = MAX_CAPTION_LINES) -> List[LayoutIssue]:
+    """Overflow, missing glyphs, mid-word breaks, collisions with the phone and line count of one caption"""
+    bbox = layout.bbox
+    if bbox is None:
+        return []
+
+    def issue(kind: str, severity: str, message: str) -> LayoutIssue:
+        return LayoutIssue(layout.app, layout.device, layout.language, layout.index, kind, severity, message)
+
+    issues = []
+    left, top, right, bottom = bbox
+    canvas_width, canvas_height = layout.canvas_size
+    outside = {"left": -left, "top": -top, "right": right - canvas_width, "bottom": bottom - canvas_height}
+    clipped = {side: pixels for side, pixels in outside.items() if pixels > 0}
+    if clipped:
+        sides = ", ".join(f"{side} by {pixels}px" for side, pixels in clipped.items())
+        issues.append(issue("overflow", "error", f"caption leaves the {canvas_width}x{canvas_height} canvas ({sides})"))
+
+    if layout.missing_glyphs:
+        issues.append(issue("glyphs", "error", f"no glyphs in the title font for: {layout.missing_glyphs}"))
+
+    if layout.split_words:
+        issues.append(issue("split_word", "error", f"broken mid-word: {', '.join(layout.split_words)}"))
+
+    phone_x, phone_y, phone_width, phone_height = layout.phone_box
+    if (min(bottom, phone_y + phone_height) > max(top, phone_y)
+            and right > phone_x and left < phone_x + phone_width):
+        # The caption reaches the phone image; check it against the visible frame
+        frame_left, frame_top, frame_right, frame_bottom = visible_phone_box(layout)
+        overlap = min(bottom, frame_bottom) - max(top, frame_top)
+        if overlap > 0 and right > frame_left and left < frame_right:
+            issues.append(issue("collision", "error", f"caption overlaps the phone by {overlap}px "
+                                                      f"(caption bottom {bottom}, phone top {frame_top})"))
+
+    if len(layout.lines) > max_lines:
+        issues.append(issue("lines", "warning", f"{len(layout.lines)} lines (more than {max_lines})"))
+    return issues
+
+
+def layout_job(job: ScreenshotJob) -> List[CaptionLayout]:
+    """Lay out every caption of one (app, language, device) job"""
+    app_name, language, device_type = job
+    generator = ScreenshotGenerator(language=language, device_type=device_type, app_name=app_name,
+                                    app_config=load_app_config(app_name))
+    return generator.layout_captions()
+
+
+def check_matrix(apps: Iterable[str], devices: Optional[Iterable[str]] = None,
+                 languages: Optional[Iterable[str]] = None, max_lines: int = MAX_CAPTION_LINES,
+                 verbose: bool = False) -> LayoutReport:
+    """Lay out and check every caption of apps x devices x languages in-process.
+
+    Font faces are shared through FontCache and images are only opened for
+    their headers, so the whole matrix takes seconds. Generator and font
+    loading logs are hidden unless verbose is set.
+    """
+    started = time.perf_counter()
+    job_list = plan_jobs([app.lower() for app in apps],
+                         list(devices) if devices is not None else None,
+                         list(languages) if languages is not None else None)
+    report = LayoutReport(job_count=len(job_list))
+    for job in job_list:
+        try:
+            if verbose:
+                layouts = layout_job(job)
+            else:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    layouts = layout_job(job)
+        except Exception as e:
+            report.failures[job_label(job)] = str(e)
+            continue
+        report.layouts.extend(layouts)
+        for layout in layouts:
+            report.issues.extend(check_layout(layout, max_lines))
+    report.elapsed_seconds = time.perf_counter() - started
+    return report
+
+
+def print_layout_report(report: LayoutReport):
+    for issue in report.errors + report.warnings:
+        print(f"  {issue.severity.upper():<7} {issue.describe()}")
+    for label, error in report.failures.items():
+        print(f"  Failed: {label} - {error}")
+
+    line_counts: Dict[int, int] = {}
+    for layout in report.layouts:
+        line_counts[len(layout.lines)] = line_counts.get(len(layout.lines), 0) + 1
+    histogram = ", ".join(f"{lines} lines: {count}" for lines, count in sorted(line_counts.items()))
+    print(f"\nLayout check: {len(report.layouts)} captions from {report.job_count} jobs "
+          f"in {report.elapsed_seconds:.2f}s - {len(report.errors)} errors, {len(report.warnings)} warnings")
+    if histogram:
+        print(f"Line counts: {histogram}")
@@ -1,12 +1,97 @@
 from PIL import Image, ImageDraw, ImageFont
 from pathlib import Path
+import gc
 import os
 import platform
-import textwrap
-import json
+import time
 from typing import List, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
 from fonts import FontManager
+from asset_cache import AssetCache, PhoneBox, shared_asset_cache
+from app_config import AppConfig, FALLBACK_LANGUAGE, config_path_for, load_app_config
+from build_manifest import BuildManifest, file_digest, fingerprint
+from text_layout import break_lines, line_width, overflowing_words
+from profiling import NULL_TIMER, StageTimer
+from memory import current_rss_mb
+from contact_sheet import THUMBNAIL_WIDTH, make_thumbnail
+from resampling import DEFAULT_RESIZE_STRATEGY, RESIZE_STRATEGIES, resize
+
+# PNG encoder settings, selected with "png_profile" in <app>_config.json or --png-profile
+PNG_PROFILES = {
+    "default": {},                      # Pillow defaults (zlib level 6)
+    "fast": {"compress_level": 1},      # local previews: ~2.5x faster encode, ~20% larger files
+    "release": {"optimize": True},      # App Store upload: max compression, ~6x slower encode
+}
+DEFAULT_PNG_PROFILE = "default"
+
+# Drafts favour encode speed over file size and go to output/draft/<app>/<device>/<language>
+DRAFT_PNG_PROFILE = "fast"
+DRAFT_DIR_NAME = "draft"
+
+# Horizontal room left around a caption (max caption width = canvas width - margin)
+CAPTION_SIDE_MARGIN = 40
+
+# Decoded-image cache size per worker in low-memory mode without an explicit budget
+LOW_MEMORY_CACHE_MB = 192
+
+@dataclass
+class SavedImage:
+    path: str
+    bytes_written: int
+    encode_seconds: float
+
+@dataclass(frozen=True)
+class RenderOptions:
+    """Rendering options shared by every job of a run (must stay picklable for worker processes)"""
+    png_profile: Optional[str] = None
+    profile: bool = False                # collect per-stage timings for every job
+    cprofile_job: Optional[str] = None   # "app/device/language" to run under cProfile
+    cprofile_path: str = "render_job.prof"
+    low_memory: bool = False             # free intermediates eagerly, keep fewer decoded images
+    memory_budget_mb: Optional[int] = None  # per worker process; half of it goes to the image cache
+    draft_scale: Optional[float] = None  # render reduced-size previews into output/draft (no manifest)
+    contact_sheets: bool = False         # keep a thumbnail of every rendered image for contact sheets
+
+@dataclass
+class RenderRecord:
+    """One output file of a render job"""
+    app: str
+    device: str
+    language: str
+    index: int
+    path: str
+    bytes_written: int
+    cached: bool  # skipped because the manifest says its inputs are unchanged
+    render_seconds: float = 0.0
+    encode_seconds: float = 0.0
+    thumbnail: Optional[bytes] = field(default=None, repr=False)  # small PNG for contact sheets
+
+# (x, y, text) of one caption line on the canvas
+PlacedLine = Tuple[int, int, str]
+
+@dataclass
+class CaptionLayout:
+    """Where one caption lands on the canvas, computed from image headers and font metrics only"""
+    app: str
+    device: str
+    language: str
+    index: int
+    text: str
+    canvas_size: Tuple[int, int]
+    phone_box: PhoneBox
+    phone_image: str
+    lines: List[PlacedLine]
+    line_boxes: List[Tuple[int, int, int, int]]  # ink bounding box of each line
+    split_words: List[str]  # words too wide for the canvas, broken mid-word by the wrapper
+    missing_glyphs: str = ""  # characters the title font cannot draw (rendered as boxes)
+    
+    @property
+    def bbox(self) -> Optional[Tuple[int, int, int, int]]:
+        """Ink bounding box of the whole caption, None for an empty caption"""
+        if not self.line_boxes:
+            return None
+        return (min(box[0] for box in self.line_boxes), min(box[1] for box in self.line_boxes),
+                max(box[2] for box in self.line_boxes), max(box[3] for box in self.line_boxes))
 
 @dataclass
 class DeviceConfig:
@@ -20,17 +105,34 @@ class DeviceConfig:
     font_size_title: int
     font_size_body: int
     fallback_font_path: Optional[str] = None
+    resize_strategy: str = DEFAULT_RESIZE_STRATEGY
 
 class ScreenshotGenerator:
     
     
-    def __init__(self, language: str = "ko", device_type: str = "iphone", app_name: str = "plots"):
+    def __init__(self, language: str = "ko", device_type: str = "iphone", app_name: str = "plots",
+                 asset_cache: Optional[AssetCache] = None, app_config: Optional[AppConfig] = None,
+                 png_profile: Optional[str] = None, timer: Optional[StageTimer] = None,
+                 low_memory: bool = False, draft_scale: Optional[float] = None,
+                 thumbnail_width: Optional[int] = None):
+        self.timer = timer if timer is not None else NULL_TIMER
+        self.low_memory = low_memory
+        self.draft_scale = draft_scale
+        self.thumbnail_width = thumbnail_width  # set to attach a thumbnail to every rendered record
         self.app_name = app_name.lower()
         self.resources_path = Path(__file__).parent / "resources" / self.app_name
         self.fonts_path = Path(__file__).parent / "resources" / "fonts"
         self.default_font = ImageFont.load_default()
         self.language = language
         self.device_type = device_type
+        self.asset_cache = asset_cache if asset_cache is not None else shared_asset_cache
+        self.app_config = app_config if app_config is not None else self._load_app_config()
+        
+        self.png_profile = self._resolve_png_profile(png_profile or self.app_config.png_profile)
+        if draft_scale:
+            self.png_profile = DRAFT_PNG_PROFILE
+        self.save_stats: List[SavedImage] = []
+        self.records: List[RenderRecord] = []
         
         # Load device-specific settings first
         self._load_device_settings_from_config()
@@ -40,82 +142,75 @@ class ScreenshotGenerator:
             fonts_path=self.fonts_path,
             language=self.language,
             font_size_title=self.font_size_title,
-            font_size_body=self.font_size_body
+            font_size_body=self.font_size_body,
+            app_config=self.app_config,
+            coverage_text="".join(self.app_config.screenshot_texts(self.language)
+                                  or self.app_config.screenshot_texts(FALLBACK_LANGUAGE))
         )
         
         # Load fonts
-        self.font_manager.load_fonts()
+        with self.timer.stage("fonts"):
+            self.font_manager.load_fonts()
         
         self.device_configs = self._load_device_configs()
     
 
     
-    def _load_device_settings_from_config(self):
-        config_path = Path(__file__).parent / "resources" / "config" / f"{self.app_name}_config.json"
+    def _resolve_png_profile(self, profile: str) -> str:
+        if profile not in PNG_PROFILES:
+            print(f"Warning: Unknown PNG profile '{profile}'. Using '{DEFAULT_PNG_PROFILE}'.")
+            return DEFAULT_PNG_PROFILE
+        return profile
+    
+    def _resolve_resize_strategy(self, strategy: str) -> str:
+        if strategy not in RESIZE_STRATEGIES:
+            print(f"Warning: Unknown resize strategy '{strategy}'. Using '{DEFAULT_RESIZE_STRATEGY}'.")
+            return DEFAULT_RESIZE_STRATEGY
+        return strategy
+    
+    @property
+    def _effective_resize_strategy(self) -> str:
+        # Low-memory mode: shrink by an integer factor first when downscaling by 4x or more
+        if self.low_memory and self.resize_strategy == DEFAULT_RESIZE_STRATEGY:
+            return "reduce_lanczos"
+        return self.resize_strategy
+    
+    def _load_app_config(self) -> AppConfig:
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
-            
-            device_settings = config_data.get("devices", {}).get(self.device_type, {})
-            self.phone_y_offset = device_settings.get("phone_y_offset", 180)
-            self.text_y_offset = device_settings.get("text_y_offset", -120)
-            self.background_image_name = device_settings.get("background_image", "iphone_background.jpg")
-            self.fastlane_device_identifier = device_settings.get("fastlane_device_identifier", "")
-            self.scale_factor = device_settings.get("scale_factor", 0.8)
-            self.font_size_title = device_settings.get("font_size_title", 100)
-            self.font_size_body = device_settings.get("font_size_body", 32)
-            self.fallback_font_path = device_settings.get("fallback_font_path", None)
-
+            return load_app_config(self.app_name)
         except FileNotFoundError:
-            print(f"Error: Config file not found: {config_path}")
-            # Set default values if config not found
-            self.phone_y_offset = 180
-            self.text_y_offset = -120
-            self.background_image_name = "iphone_background.jpg"
-            self.fastlane_device_identifier = ""
-            self.scale_factor = 0.8
-            self.font_size_title = 100
-            self.font_size_body = 32
+            print(f"Error: Config file not found: {config_path_for(self.app_name)}")
         except Exception as e:
-            print(f"Error loading device settings from config file: {e}")
-            # Set default values on error
-            self.phone_y_offset = 180
-            self.text_y_offset = -120
-            self.background_image_name = "iphone_background.jpg"
-            self.fastlane_device_identifier = ""
-            self.scale_factor = 0.8
-            self.font_size_title = 100
-            self.font_size_body = 32
+            print(f"Error loading config file: {e}")
+        # Empty config: every device setting falls back to its default
+        return AppConfig(app_name=self.app_name)
+    
+    def _load_device_settings_from_config(self):
+        device_settings = self.app_config.device(self.device_type)
+        self.phone_y_offset = device_settings.phone_y_offset
+        self.text_y_offset = device_settings.text_y_offset
+        self.background_image_name = device_settings.background_image
+        self.fastlane_device_identifier = device_settings.fastlane_device_identifier
+        self.scale_factor = device_settings.scale_factor
+        self.font_size_title = device_settings.font_size_title
+        self.font_size_body = device_settings.font_size_body
+        self.fallback_font_path = device_settings.fallback_font_path
+        self.resize_strategy = self._resolve_resize_strategy(device_settings.resize_strategy)
 
     def _load_device_configs(self) -> List[DeviceConfig]:
-        config_path = Path(__file__).parent / "resources" / "config" / f"{self.app_name}_config.json"
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
-            
-            device_settings = config_data.get("devices", {}).get(self.device_type, {})
-            image_filenames = [item['filename'] for item in device_settings.get('screenshots', [])]
-
-            localized_texts_data = config_data.get('localization', {})
-            localized_texts = localized_texts_data.get(self.language, {}).get('screenshot_texts', [])
-            
-            # 폰트 색상 로드
-            font_mapping = localized_texts_data.get(self.language, {}).get('font_mapping', {})
-            self.font_color = font_mapping.get('font_color', '#FFFFFF')  # 기본값: 흰색
-            
-            if not localized_texts:
-                print(f"Warning: No localized texts found for language '{self.language}'. Using 'ko' as fallback.")
-                localized_texts = localized_texts_data.get("ko", {}).get('screenshot_texts', [])
-                # 폰트 색상도 fallback 설정
-                fallback_font_mapping = localized_texts_data.get("ko", {}).get('font_mapping', {})
-                self.font_color = fallback_font_mapping.get('font_color', '#FFFFFF')
-
-        except FileNotFoundError:
-            print(f"Error: Config file not found: {config_path}")
-            return []
-        except Exception as e:
-            print(f"Error loading config file: {e}")
-            return []
+        image_filenames = self.app_config.device(self.device_type).screenshots
+        localized_texts = self.app_config.screenshot_texts(self.language)
+        
+        # 폰트 색상 로드
+        font_mapping = self.app_config.font_mapping(self.language)
+        self.font_color = font_mapping.get('font_color', '#FFFFFF')  # 기본값: 흰색
+        
+        if not localized_texts:
+            print(f"Warning: No localized texts found for language '{self.language}'. Using '{FALLBACK_LANGUAGE}' as fallback.")
+            localized_texts = self.app_config.screenshot_texts(FALLBACK_LANGUAGE)
+            # 폰트 색상도 fallback 설정
+            fallback_font_mapping = self.app_config.font_mapping(FALLBACK_LANGUAGE)
+            self.font_color = fallback_font_mapping.get('font_color', '#FFFFFF')
 
         device_configs = []
         for i, filename in enumerate(image_filenames):
@@ -130,18 +225,17 @@ class ScreenshotGenerator:
                 scale_factor=self.scale_factor,
                 font_size_title=self.font_size_title,
                 font_size_body=self.font_size_body,
-                fallback_font_path=self.fallback_font_path
+                fallback_font_path=self.fallback_font_path,
+                resize_strategy=self.resize_strategy
             ))
         
         print(f"Screenshot config loaded: {len(device_configs)} items (Language: {self.language}, Device: {self.device_type})")
         return device_configs
     
     def _load_background_image(self) -> Image.Image:
+        """Shared RGBA background (cached per file); copy before drawing on it"""
         bg_path = self.resources_path / self.background_image_name
-        if bg_path.exists():
-            return Image.open(bg_path).convert("RGB")
-        else:
-            return Image.new("RGB", (1200, 800), (255, 255, 255))
+        return self.asset_cache.get_background(bg_path)
     
     def _load_phone_image(self, filename: str) -> Optional[Image.Image]:
         phone_path = self.resources_path / filename
@@ -151,28 +245,27 @@ class ScreenshotGenerator:
             print(f"Image file not found: {filename}")
             return None
     
+    def _load_base_plate(self, config: DeviceConfig):
+        """Shared RGB base plate (background + phone) and the phone's box; copy before drawing"""
+        base_plate = self.asset_cache.get_base_plate(
+            self.resources_path / config.background_image,
+            self.resources_path / config.filename,
+            config.scale_factor,
+            config.phone_y_offset,
+            self._resize_image,
+            timer=self.timer,
+            low_memory=self.low_memory,
+            resize_strategy=self._effective_resize_strategy,
+        )
+        if base_plate is None:
+            print(f"Image file not found: {config.filename}")
+        return base_plate
+    
     def _resize_image(self, image: Image.Image, size: Tuple[int, int]) -> Image.Image:
-        try:
-            return image.resize(size, Image.Resampling.LANCZOS)
-        except AttributeError:
-            return image.resize(size, Image.LANCZOS)
+        return resize(image, size, self._effective_resize_strategy)
     
     def wrap_text(self, text: str, max_width: int, font: ImageFont.FreeTypeFont) -> List[str]:
-        if not text:
-            return []
-        
-        try:
-            avg_char_width = font.getbbox("가")[2] if hasattr(font, 'getbbox') else 20
-        except:
-            avg_char_width = 20
-        
-        if avg_char_width <= 0:
-            avg_char_width = 20
-        
-        chars_per_line = max(1, int(max_width / avg_char_width))
-        
-        wrapper = textwrap.TextWrapper(width=chars_per_line, break_long_words=True)
-        return wrapper.fill(text).split('\n')
+        return break_lines(text, max_width, font)
     
     def _hex_to_rgb(self, hex_color: str) -> Tuple[int, int, int]:
         """헥스 색상 코드를 RGB 튜플로 변환"""
@@ -190,67 +283,250 @@ class ScreenshotGenerator:
             # 잘못된 헥스 코드인 경우 기본값 (흰색) 반환
             return (255, 255, 255)
     
-    def generate_individual_previews(self, output_dir: str) -> List[str]:
-        print("Starting individual screenshot generation")
+    def _output_filename(self, idx: int) -> str:
+        # Fastlane 파일명 형식으로 생성: {순번}_{기기식별자}_{순번}.png (0 패딩)
+        return f"{idx:02d}_{self.fastlane_device_identifier}_{idx}.png"
+    
+    def render_inputs(self, config: DeviceConfig) -> dict:
+        """Everything a rendered screenshot depends on, for the incremental build manifest"""
+        title_font = self.font_manager.get_title_font()
+        font_path = getattr(title_font, 'path', None)
+        if not isinstance(font_path, (str, Path)):
+            font_path = None  # Pillow's built-in default font
+        return {
+            "phone_image": file_digest(self.resources_path / config.filename),
+            "background": file_digest(self.resources_path / config.background_image),
+            "title_font": {
+                "path": str(font_path) if font_path else "default",
+                "digest": file_digest(Path(font_path)) if font_path else None,
+                "size": getattr(title_font, 'size', None),
+            },
+            "font_color": self.font_color,
+            "png_profile": self.png_profile,
+            "device_config": asdict(config),
+        }
+    
+    def place_caption(self, config: DeviceConfig, canvas_size: Tuple[int, int],
+                      phone_box: PhoneBox) -> List[PlacedLine]:
+        """Wrap the caption and position each line, centered above the phone"""
+        phone_x, phone_y, phone_width, _ = phone_box
+        title_font = self.font_manager.get_title_font()
+        text_center_x = phone_x + (phone_width // 2)
+        
+        max_text_width = canvas_size[0] - CAPTION_SIDE_MARGIN
+        text_lines = self.wrap_text(config.text, max_text_width, title_font)
         
-        background = self._load_background_image()
+        line_height = self.font_size_title + 20
+        
+        total_text_height = len(text_lines) * line_height - 20
+        
+        text_y = phone_y + config.text_y_offset - (total_text_height // 2)
+        
+        placed_lines = []
+        for line_idx, line in enumerate(text_lines):
+            line_x = text_center_x - (line_width(line, title_font) // 2)
+            line_y = text_y + (line_idx * line_height)
+            placed_lines.append((line_x, line_y, line))
+        return placed_lines
+    
+    def plate_geometry(self, config: DeviceConfig) -> Optional[Tuple[Tuple[int, int], PhoneBox]]:
+        """Canvas size and phone box of a screenshot, read from the image headers only.
+        
+        Matches AssetCache.get_base_plate without decoding or compositing any
+        pixels. None if the phone image is missing.
+        """
+        phone_path = self.resources_path / config.filename
+        if not phone_path.exists():
+            return None
+        background_path = self.resources_path / config.background_image
+        if background_path.exists():
+            with Image.open(background_path) as background:
+                canvas_size = background.size
+        else:
+            canvas_size = (1200, 800)  # AssetCache's blank fallback background
+        with Image.open(phone_path) as phone:
+            phone_width = int(phone.width * config.scale_factor)
+            phone_height = int(phone.height * config.scale_factor)
+        phone_x = (canvas_size[0] - phone_width) // 2
+        phone_y = canvas_size[1] - phone_height + config.phone_y_offset
+        return canvas_size, (phone_x, phone_y, phone_width, phone_height)
+    
+    def layout_captions(self) -> List[CaptionLayout]:
+        """Lay out every caption of this device/language without rendering (for --dry-run)"""
+        title_font = self.font_manager.get_title_font()
+        layouts = []
+        for idx, config in enumerate(self.device_configs, 1):
+            geometry = self.plate_geometry(config)
+            if geometry is None:
+                print(f"Image file not found: {config.filename}")
+                continue
+            canvas_size, phone_box = geometry
+            placed_lines = self.place_caption(config, canvas_size, phone_box)
+            line_boxes = []
+            for x, y, line in placed_lines:
+                left, top, right, bottom = title_font.getbbox(line)
+                line_boxes.append((x + left, y + top, x + right, y + bottom))
+            layouts.append(CaptionLayout(
+                self.app_name, self.device_type, self.language, idx, config.text, canvas_size, phone_box,
+                str(self.resources_path / config.filename), placed_lines, line_boxes,
+                overflowing_words(config.text, canvas_size[0] - CAPTION_SIDE_MARGIN, title_font),
+                "".join(char for char in self.font_manager.missing_glyphs if char in config.text)))
+        return layouts
+    
+    def generate_individual_previews(self, output_dir: str, manifest: Optional[BuildManifest] = None) -> List[str]:
+        """Render every screenshot of this device/language into output_dir.
+        
+        With a manifest, outputs whose inputs are unchanged since the last build
+        are skipped (and still returned as part of the result).
+        """
+        print("Starting individual screenshot generation")
         
         generated_files = []
+        self.skipped_files = []
+        if self.draft_scale:
+            return self._generate_drafts(output_dir)
         
         for idx, config in enumerate(self.device_configs, 1):
-            print(f"Processing: {config.filename} (index: {idx})")
+            output_path = Path(output_dir) / self._output_filename(idx)
+            output_fingerprint = None
+            if manifest is not None:
+                with self.timer.stage("manifest"):
+                    output_fingerprint = fingerprint(self.render_inputs(config))
+                    fresh = manifest.is_fresh(output_path, output_fingerprint)
+                if fresh:
+                    print(f"Up to date: {output_path}")
+                    self.skipped_files.append(str(output_path))
+                    generated_files.append(str(output_path))
+                    self.records.append(RenderRecord(
+                        self.app_name, self.device_type, self.language, idx, str(output_path),
+                        os.path.getsize(output_path), cached=True))
+                    continue
             
-            phone_image = self._load_phone_image(config.filename)
-            if phone_image is None:
+            print(f"Processing: {config.filename} (index: {idx})")
+            started = time.perf_counter()
+            work_image = self.render_image(config)
+            if work_image is None:
                 continue
+            render_seconds = time.perf_counter() - started
             
-            work_image = background.convert("RGBA")
-            
-            bg_width, bg_height = work_image.size
-            
-            original_width, original_height = phone_image.size
-            scale_factor = config.scale_factor
-            new_width = int(original_width * scale_factor)
-            new_height = int(original_height * scale_factor)
-            phone_image = self._resize_image(phone_image, (new_width, new_height))
-            
-            phone_x = (bg_width - new_width) // 2
-            phone_y = bg_height - new_height + config.phone_y_offset
-            
-            work_image.paste(phone_image, (phone_x, phone_y), phone_image)
-            
-            text_center_x = phone_x + (new_width // 2)
-            
-            max_text_width = bg_width - 40
-            text_lines = self.wrap_text(config.text, max_text_width, self.font_manager.get_title_font())
-            
-            line_height = self.font_size_title + 20
-            
-            total_text_height = len(text_lines) * line_height - 20
-            
-            text_y = phone_y + config.text_y_offset - (total_text_height // 2)
-            
-            draw = ImageDraw.Draw(work_image)
+            saved_path = self._save_image(work_image, str(output_path))
+            thumbnail = self._thumbnail(work_image)
+            if self.low_memory:
+                work_image.close()
+                del work_image
+            generated_files.append(saved_path)
+            saved = self.save_stats[-1]
+            self.records.append(RenderRecord(
+                self.app_name, self.device_type, self.language, idx, saved_path,
+                saved.bytes_written, cached=False, render_seconds=render_seconds,
+                encode_seconds=saved.encode_seconds, thumbnail=thumbnail))
+            if manifest is not None:
+                manifest.record(output_path, output_fingerprint)
+        
+        return generated_files
+    
+    def render_image(self, config: DeviceConfig) -> Optional[Image.Image]:
+        """Render one screenshot in memory (RGB). None if its phone image is missing."""
+        # Stage 1: background + phone, composited and flattened once per (device, screenshot)
+        base_plate = self._load_base_plate(config)
+        if base_plate is None:
+            return None
+        
+        # Stage 2: per-language caption on a copy of the plate
+        work_image = base_plate.flattened_copy()
+        
+        with self.timer.stage("layout"):
+            placed_lines = self.place_caption(config, work_image.size, base_plate.phone_box)
+        
+        # 폰트 색상 적용
+        font_color = self._hex_to_rgb(self.font_color)
+        with self.timer.stage("caption"):
+            self._draw_caption(work_image, base_plate.composite, placed_lines, font_color)
+        return work_image
+    
+    def _generate_drafts(self, output_dir: str) -> List[str]:
+        """Render every screenshot at draft_scale.
+        
+        The layout is computed at full resolution (same wrapping and positions
+        as the final render) and then scaled, so drafts differ from the final
+        images only in resolution and filtering.
+        """
+        scale = self.draft_scale
+        title_font = self.font_manager.get_title_font()
+        if isinstance(title_font, ImageFont.FreeTypeFont):
+            draft_font = title_font.font_variant(size=max(1, round(title_font.size * scale)))
+        else:
+            draft_font = title_font  # Pillow's bitmap default font cannot be scaled
+        font_color = self._hex_to_rgb(self.font_color)
+        
+        generated_files = []
+        for idx, config in enumerate(self.device_configs, 1):
+            output_path = Path(output_dir) / self._output_filename(idx)
+            started = time.perf_counter()
+            with self.timer.stage("layout"):
+                geometry = self.plate_geometry(config)
+                if geometry is None:
+                    print(f"Image file not found: {config.filename}")
+                    continue
+                canvas_size, phone_box = geometry
+                placed_lines = self.place_caption(config, canvas_size, phone_box)
             
-            for line_idx, line in enumerate(text_lines):
-                temp_draw = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
-                bbox = temp_draw.textbbox((0, 0), line, font=self.font_manager.get_title_font())
-                line_width = bbox[2] - bbox[0]
-                line_x = text_center_x - (line_width // 2)
-                line_y = text_y + (line_idx * line_height)
-                
-                # 폰트 색상 적용
-                font_color = self._hex_to_rgb(self.font_color)
-                draw.text((line_x, line_y), line, font=self.font_manager.get_title_font(), fill=font_color)
+            plate = self.asset_cache.get_draft_plate(
+                self.resources_path / config.background_image, self.resources_path / config.filename,
+                canvas_size, phone_box, scale, timer=self.timer)
+            work_image = plate.copy()
+            with self.timer.stage("caption"):
+                draw = ImageDraw.Draw(work_image)
+                for x, y, line in placed_lines:
+                    draw.text((round(x * scale), round(y * scale)), line, font=draft_font, fill=font_color)
+            render_seconds = time.perf_counter() - started
             
-            # Fastlane 파일명 형식으로 생성: {순번}_{기기식별자}_{순번}.png (0 패딩)
-            filename = f"{idx:02d}_{self.fastlane_device_identifier}_{idx}.png"
-            output_path = Path(output_dir) / filename
             saved_path = self._save_image(work_image, str(output_path))
             generated_files.append(saved_path)
-        
+            saved = self.save_stats[-1]
+            self.records.append(RenderRecord(
+                self.app_name, self.device_type, self.language, idx, saved_path,
+                saved.bytes_written, cached=False, render_seconds=render_seconds,
+                encode_seconds=saved.encode_seconds, thumbnail=self._thumbnail(work_image)))
         return generated_files
     
+    def _thumbnail(self, image: Image.Image) -> Optional[bytes]:
+        """Contact-sheet thumbnail of the image still in memory, if requested"""
+        if not self.thumbnail_width:
+            return None
+        with self.timer.stage("thumbnail"):
+            return make_thumbnail(image, self.thumbnail_width)
+    
+    def _draw_caption(self, work_image: Image.Image, composite: Image.Image,
+                      placed_lines: List[PlacedLine], font_color: Tuple[int, int, int]):
+        """Draw the caption onto the flattened plate copy.
+        
+        Text is drawn on the RGBA composite and flattened onto white, exactly as
+        a full-frame render would, but only within the caption's bounding box.
+        """
+        if not placed_lines:
+            return
+        
+        font = self.font_manager.get_title_font()
+        margin = max(4, self.font_size_title // 10)
+        measure = ImageDraw.Draw(work_image)
+        boxes = [measure.textbbox((x, y), line, font=font) for x, y, line in placed_lines]
+        left = max(0, min(box[0] for box in boxes) - margin)
+        top = max(0, min(box[1] for box in boxes) - margin)
+        right = min(work_image.width, max(box[2] for box in boxes) + margin)
+        bottom = min(work_image.height, max(box[3] for box in boxes) + margin)
+        if left >= right or top >= bottom:
+            return
+        
+        caption = composite.crop((left, top, right, bottom))
+        draw = ImageDraw.Draw(caption)
+        for x, y, line in placed_lines:
+            draw.text((x - left, y - top), line, font=font, fill=font_color)
+        
+        flattened = Image.new('RGB', caption.size, (255, 255, 255))
+        flattened.paste(caption, mask=caption.split()[3])
+        work_image.paste(flattened, (left, top))
+    
     def _save_image(self, image: Image.Image, output_path: str) -> str:
         try:
             output_dir = Path(output_path).parent
@@ -262,41 +538,100 @@ class ScreenshotGenerator:
                 image = rgb_image
             
             # PNG 형식으로 저장 (FastLane 표준)
+            started = time.perf_counter()
             if output_path.endswith('.png'):
-                image.save(output_path, format='PNG', dpi=(300, 300))
+                image.save(output_path, format='PNG', dpi=(300, 300), **PNG_PROFILES[self.png_profile])
             else:
                 image.save(output_path, format='JPEG', quality=95, dpi=(300, 300))
-            print(f"Image saved: {output_path}")
+            encode_seconds = time.perf_counter() - started
+            self.timer.add("encode", encode_seconds)
+            bytes_written = os.path.getsize(output_path)
+            self.save_stats.append(SavedImage(output_path, bytes_written, encode_seconds))
+            print(f"Image saved: {output_path} ({bytes_written / 1024:.0f} KB, {encode_seconds * 1000:.0f} ms)")
             return output_path
         except Exception as e:
             print(f"Error saving image: {str(e)}")
             raise
 
-def generate_screenshots(app_name: str, language: str, device_type: str):
-    config_path = Path(__file__).parent / "resources" / "config" / f"{app_name.lower()}_config.json"
+def _apply_memory_budget(options: RenderOptions):
+    """Size this worker's image cache for the options and drop it if the worker is over budget"""
+    if options.memory_budget_mb:
+        shared_asset_cache.set_budget(options.memory_budget_mb * 1024 * 1024 // 2)
+    elif options.low_memory:
+        shared_asset_cache.set_budget(LOW_MEMORY_CACHE_MB * 1024 * 1024)
+    else:
+        shared_asset_cache.set_budget(None)
+    
+    rss_mb = current_rss_mb()
+    if options.memory_budget_mb and rss_mb is not None and rss_mb > options.memory_budget_mb:
+        print(f"Memory budget: {rss_mb:.0f} MB in use exceeds {options.memory_budget_mb} MB, dropping cached images")
+        shared_asset_cache.clear()
+        gc.collect()
+
+def render_job(app_name: str, language: str, device_type: str,
+               manifest: Optional[BuildManifest] = None,
+               options: Optional[RenderOptions] = None,
+               timer: Optional[StageTimer] = None) -> List[RenderRecord]:
+    """Render one (app, language, device) job and return a record per output file.
+    
+    Unlike generate_screenshots, errors are raised to the caller. Pass a
+    StageTimer to collect per-stage timings for the job.
+    """
+    options = options or RenderOptions()
+    timer = timer if timer is not None else NULL_TIMER
+    _apply_memory_budget(options)
+    with timer.stage("config"):
+        app_config = load_app_config(app_name)
+    generator = ScreenshotGenerator(language=language, device_type=device_type, app_name=app_name,
+                                    app_config=app_config, png_profile=options.png_profile, timer=timer,
+                                    low_memory=options.low_memory, draft_scale=options.draft_scale,
+                                    thumbnail_width=THUMBNAIL_WIDTH if options.contact_sheets else None)
+    
+    output_dir = Path(__file__).parent / app_config.output_base_dir
+    if options.draft_scale:
+        # Kept apart from output/<app>, which fastlane uploads as is
+        output_dir = output_dir / DRAFT_DIR_NAME
+        manifest = None
+    output_dir = output_dir / app_name / device_type / language
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    generator.generate_individual_previews(str(output_dir), manifest=manifest)
+    skipped = len(generator.skipped_files)
+    print(f"Screenshot generation complete: {len(generator.records)} files ({skipped} up to date)")
+    if generator.save_stats:
+        total_bytes = sum(stat.bytes_written for stat in generator.save_stats)
+        total_seconds = sum(stat.encode_seconds for stat in generator.save_stats)
+        print(f"PNG encode ({generator.png_profile}): {total_bytes / 1024:.0f} KB in {total_seconds:.2f}s")
+    return generator.records
+
+def generate_screenshots(app_name: str, language: str, device_type: str,
+                         manifest: Optional[BuildManifest] = None,
+                         png_profile: Optional[str] = None) -> Optional[List[str]]:
+    """Render one (app, language, device) job. Returns the generated files, or None on failure.
+    
+    Pass a BuildManifest to skip screenshots whose inputs have not changed, and
+    png_profile to override the config's encoder profile.
+    """
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
-        output_base_dir = config_data.get("output_base_dir", "output")
+        load_app_config(app_name)
     except FileNotFoundError:
-        print(f"Error: Config file not found: {config_path}")
-        return
+        print(f"Error: Config file not found: {config_path_for(app_name)}")
+        return None
     except Exception as e:
         print(f"Error loading config file: {e}")
-        return
+        return None
 
-    generator = ScreenshotGenerator(language=language, device_type=device_type, app_name=app_name)
-    
-    output_dir = Path(__file__).parent / output_base_dir / app_name / device_type / language
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
     try:
-        generated_files = generator.generate_individual_previews(str(output_dir))
-        print(f"Screenshot generation complete: {len(generated_files)} files")
-        for file_path in generated_files:
-            print(f"  - {file_path}")
+        records = render_job(app_name, language, device_type, manifest=manifest,
+                             options=RenderOptions(png_profile=png_profile))
     except Exception as e:
         print(f"Error generating images: {e}")
+        return None
+    
+    generated_files = [record.path for record in records]
+    for file_path in generated_files:
+        print(f"  - {file_path}")
+    return generated_files
 
 if __name__ == "__main__":
     # This block is primarily for testing or direct execution with hardcoded values.
@@ -0,0 +1,78 @@
+"""
+Process memory measurement for App Store preview generation
+
+On Linux the kernel's peak-RSS mark (VmHWM) is reset at the start of each
+job, so JobMemory reports the peak of that job alone. Elsewhere it falls
+back to the process-lifetime peak from getrusage.
+"""
+
+from pathlib import Path
+from typing import Optional
+import os
+import re
+import sys
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_PROC_SELF = Path("/proc/self")
+
+
+def current_rss_mb() -> Optional[float]:
+    """Resident set size right now, or None where /proc is unavailable"""
+    try:
+        pages = int((_PROC_SELF / "statm").read_text().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def process_peak_rss_mb() -> Optional[float]:
+    """Peak RSS over the whole process lifetime"""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def _read_high_water_mark_mb() -> Optional[float]:
+    try:
+        match = re.search(r"VmHWM:\s+(\d+) kB", (_PROC_SELF / "status").read_text())
+    except OSError:
+        return None
+    return int(match.group(1)) / 1024 if match else None
+
+
+def _reset_high_water_mark() -> bool:
+    try:
+        (_PROC_SELF / "clear_refs").write_text("5")
+    except OSError:
+        return False
+    return True
+
+
+class JobMemory:
+    """Context manager measuring the peak RSS of the enclosed block (in MB)
+
+        with JobMemory() as memory:
+            render_job(...)
+        memory.peak_mb
+    """
+
+    def __init__(self):
+        self.peak_mb: Optional[float] = None
+        self.per_job = False  # False when only the process-lifetime peak is available
+
+    def __enter__(self) -> "JobMemory":
+        self.per_job = _reset_high_water_mark()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.peak_mb = _read_high_water_mark_mb() if self.per_job else None
+        if self.peak_mb is None:
+            self.per_job = False
+            self.peak_mb = process_peak_rss_mb()
+        return False
@@ -0,0 +1,114 @@
+"""
+Per-stage timing for App Store preview generation
+
+    timer = StageTimer()
+    with timer.stage("decode"):
+        ...
+    timer.to_dict()  # {"decode": {"seconds": 0.12, "count": 1}}
+
+Stages used by the pipeline, in order:
+    config     load_app_config
+    fonts      FontManager.load_fonts
+    manifest   input digests and freshness check
+    decode     background / phone PNG decode
+    resize     phone resize to the device scale
+    composite  phone onto background, flatten to RGB
+    layout     line breaking and line measurement
+    caption    caption drawing and region flatten
+    encode     image.save
+"""
+
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator
+import cProfile
+import pstats
+import time
+
+STAGES = ("config", "fonts", "manifest", "decode", "resize", "composite", "layout", "caption", "encode")
+
+# {stage: {"seconds": float, "count": int}}
+StageTimings = Dict[str, Dict[str, float]]
+
+
+class StageTimer:
+    """Accumulates wall time and call counts per named stage"""
+
+    enabled = True
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name: str, seconds: float, count: int = 1):
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + count
+
+    def to_dict(self) -> StageTimings:
+        return {name: {"seconds": self.seconds[name], "count": self.counts[name]} for name in self.seconds}
+
+
+class NullTimer(StageTimer):
+    """Timer that records nothing; used when profiling is off"""
+
+    enabled = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        yield
+
+    def add(self, name: str, seconds: float, count: int = 1):
+        pass
+
+
+NULL_TIMER = NullTimer()
+
+
+def merge_timings(timings: Iterable[StageTimings]) -> StageTimings:
+    """Sum several per-job timing dicts into one"""
+    total = StageTimer()
+    for job_timings in timings:
+        for name, entry in job_timings.items():
+            total.add(name, entry["seconds"], int(entry["count"]))
+    return total.to_dict()
+
+
+def _stage_order(name: str) -> int:
+    return STAGES.index(name) if name in STAGES else len(STAGES)
+
+
+def format_timings(timings: StageTimings, wall_seconds: float = 0.0) -> str:
+    """Render aggregated timings as a fixed-width table, pipeline order first"""
+    total = sum(entry["seconds"] for entry in timings.values())
+    lines = [f"{'stage':<10} {'calls':>7} {'total s':>9} {'mean ms':>9} {'share':>7}"]
+    for name in sorted(timings, key=lambda n: (_stage_order(n), n)):
+        entry = timings[name]
+        count = int(entry["count"])
+        mean_ms = entry["seconds"] * 1000 / count if count else 0.0
+        share = entry["seconds"] / total * 100 if total else 0.0
+        lines.append(f"{name:<10} {count:>7} {entry['seconds']:>9.2f} {mean_ms:>9.1f} {share:>6.1f}%")
+    lines.append(f"{'staged':<10} {'':>7} {total:>9.2f}")
+    if wall_seconds:
+        lines.append(f"{'wall':<10} {'':>7} {wall_seconds:>9.2f}")
+    return "\n".join(lines)
+
+
+@contextmanager
+def cprofile_to(path: str, top: int = 15) -> Iterator[None]:
+    """Run the body under cProfile, dump stats to path and print the top functions by cumulative time"""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"cProfile stats written: {path}")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(top)
@@ -0,0 +1,290 @@
+"""
+Batch rendering API for App Store preview generation
+
+    from render import render_matrix
+    result = render_matrix(["plots", "toffs"], jobs=4)
+    for record in result.records:
+        print(record.path, record.bytes_written, record.cached)
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import os
+import time
+
+from app_config import load_app_config
+from build_manifest import BuildManifest
+from contact_sheet import write_contact_sheets
+from make_screenshots import RenderOptions, RenderRecord, render_job
+from memory import JobMemory
+from profiling import StageTimer, StageTimings, cprofile_to, format_timings, merge_timings
+
+OUTPUT_DIR = Path(__file__).parent / "output"
+
+# (app_name, language, device_type)
+ScreenshotJob = Tuple[str, str, str]
+
+
+@dataclass
+class JobResult:
+    """What a worker sends back for one job"""
+    job: ScreenshotJob
+    records: Optional[List[RenderRecord]]
+    error: Optional[str]
+    manifest_updates: Dict[str, Optional[str]]
+    stage_timings: StageTimings
+    peak_memory_mb: Optional[float] = None
+
+
+def job_label(job: ScreenshotJob) -> str:
+    """"app/device/language", the form accepted by --cprofile"""
+    app_name, language, device_type = job
+    return f"{app_name}/{device_type}/{language}"
+
+
+@dataclass
+class MatrixResult:
+    """Structured result of a render_matrix call"""
+    records: List[RenderRecord] = field(default_factory=list)
+    failures: List[Tuple[ScreenshotJob, str]] = field(default_factory=list)
+    job_count: int = 0
+    elapsed_seconds: float = 0.0
+    # job label -> stage timings, filled when RenderOptions.profile is set
+    stage_timings: Dict[str, StageTimings] = field(default_factory=dict)
+    # job label -> peak RSS in MB while the job ran
+    peak_memory_mb: Dict[str, float] = field(default_factory=dict)
+    # one review image per (app, device, screenshot index), when RenderOptions.contact_sheets is set
+    contact_sheets: List[str] = field(default_factory=list)
+
+    def stage_totals(self) -> StageTimings:
+        return merge_timings(self.stage_timings.values())
+
+    @property
+    def files(self) -> List[str]:
+        return [record.path for record in self.records]
+
+    @property
+    def rendered_count(self) -> int:
+        return sum(1 for record in self.records if not record.cached)
+
+    @property
+    def cached_count(self) -> int:
+        return sum(1 for record in self.records if record.cached)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+    def to_dict(self) -> Dict:
+        data = {
+            "jobs": self.job_count,
+            "elapsed_seconds": self.elapsed_seconds,
+            "rendered": self.rendered_count,
+            "cached": self.cached_count,
+            "bytes_written": sum(record.bytes_written for record in self.records if not record.cached),
+            "records": [{key: value for key, value in asdict(record).items() if key != "thumbnail"}
+                        for record in self.records],
+            "failures": [{"app": app, "language": language, "device": device, "error": error}
+                         for (app, language, device), error in self.failures],
+        }
+        if self.peak_memory_mb:
+            data["peak_memory_mb"] = self.peak_memory_mb
+        if self.contact_sheets:
+            data["contact_sheets"] = self.contact_sheets
+        if self.stage_timings:
+            data["stages"] = {"total": self.stage_totals(), "jobs": self.stage_timings}
+        return data
+
+
+def _run_job(job: ScreenshotJob, manifest: Optional[BuildManifest] = None,
+             options: Optional[RenderOptions] = None) -> JobResult:
+    """Run a single screenshot job. Executed in a worker process when jobs > 1."""
+    app_name, language, device_type = job
+    options = options or RenderOptions()
+    timer = StageTimer() if options.profile else None
+    records, error = None, None
+    memory = JobMemory()
+    try:
+        with memory:
+            if options.cprofile_job and options.cprofile_job.lower() == job_label(job).lower():
+                with cprofile_to(options.cprofile_path):
+                    records = render_job(app_name, language, device_type, manifest=manifest, options=options,
+                                         timer=timer)
+            else:
+                records = render_job(app_name, language, device_type, manifest=manifest, options=options, timer=timer)
+    except Exception as e:
+        print(f"Error generating images for {app_name} ({device_type}) in {language}: {e}")
+        error = str(e)
+
+    if memory.peak_mb is not None:
+        scope = "job" if memory.per_job else "process"
+        print(f"Peak memory ({scope}): {memory.peak_mb:.0f} MB")
+        if options.memory_budget_mb and memory.peak_mb > options.memory_budget_mb:
+            print(f"Warning: {job_label(job)} exceeded the {options.memory_budget_mb} MB memory budget")
+    updates = dict(manifest.updates) if manifest is not None else {}
+    return JobResult(job, records, error, updates, timer.to_dict() if timer is not None else {}, memory.peak_mb)
+
+
+def run_jobs(jobs: List[ScreenshotJob], max_workers: int, manifest: Optional[BuildManifest] = None,
+             options: Optional[RenderOptions] = None) -> List[JobResult]:
+    """Render all jobs, serially or on a process pool, and merge their manifest updates.
+
+    Results are returned in job order regardless of completion order, so the
+    output is identical between serial and parallel runs. Manifest updates
+    made by the workers are merged back into `manifest`.
+    """
+    results = {}
+    if max_workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            app_name, language, device_type = job
+            print(f"\n--- Generating screenshots for {app_name} ({device_type}) in {language} ---")
+            results[job] = _run_job(job, manifest, options)
+    else:
+        print(f"Rendering {len(jobs)} jobs on {max_workers} worker processes")
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_run_job, job, manifest, options) for job in jobs]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result.job] = result
+
+    ordered = [results[job] for job in jobs]
+    if manifest is not None:
+        for result in ordered:
+            manifest.apply(result.manifest_updates)
+    return ordered
+
+
+def plan_jobs(apps: Iterable[str], devices: Optional[Iterable[str]] = None,
+              languages: Optional[Iterable[str]] = None) -> List[ScreenshotJob]:
+    """Expand apps x devices x languages into jobs, restricted to what each app config supports"""
+    jobs = []
+    for app in apps:
+        app_config = load_app_config(app)
+        app_devices = [d for d in app_config.device_types if devices is None or d in devices]
+        app_languages = [l for l in app_config.languages if languages is None or l in languages]
+        jobs.extend((app_config.app_name, language, device_type)
+                    for device_type in app_devices
+                    for language in app_languages)
+    return jobs
+
+
+def _remove_stale_outputs(manifest: BuildManifest, app_name: str, records: List[RenderRecord]) -> int:
+    """Delete outputs recorded for app_name that the current config no longer produces"""
+    current = {manifest.key_for(Path(record.path)) for record in records}
+    removed = 0
+    for key in manifest.keys_under(app_name):
+        if key in current:
+            continue
+        stale_path = manifest.output_root / key
+        if stale_path.exists():
+            stale_path.unlink()
+            print(f"Removed stale output: {stale_path}")
+            removed += 1
+            if not any(stale_path.parent.iterdir()):
+                stale_path.parent.rmdir()  # an empty language folder would still be copied as a locale
+        manifest.forget(stale_path)
+    return removed
+
+
+def render_matrix(apps: Iterable[str], devices: Optional[Iterable[str]] = None,
+                  languages: Optional[Iterable[str]] = None, jobs: Optional[int] = None,
+                  cache: bool = True, options: Optional[RenderOptions] = None,
+                  output_root: Path = OUTPUT_DIR) -> MatrixResult:
+    """Render every (app, device, language) combination in one call.
+
+    Args:
+        apps: App names (config file stems, case-insensitive).
+        devices / languages: Optional filters; None means everything the config defines.
+        jobs: Worker processes (default: CPU count, 1 = in-process). One pool serves all apps.
+        cache: Use the incremental build manifest and skip outputs whose inputs are unchanged.
+        options: Rendering options such as the PNG encoder profile, per-stage profiling or
+            draft_scale (reduced-size previews in output/draft, always rendered without the manifest).
+        output_root: Where the build manifest lives (the screenshots output directory).
+
+    Raises FileNotFoundError / json.JSONDecodeError for a missing or broken app config.
+    """
+    started = time.perf_counter()
+    apps = [app.lower() for app in apps]
+    devices = list(devices) if devices is not None else None
+    languages = list(languages) if languages is not None else None
+    max_workers = jobs if jobs is not None else (os.cpu_count() or 1)
+
+    job_list = plan_jobs(apps, devices, languages)
+    # Only a complete run of an app knows which of its old outputs are stale
+    result = render_jobs(job_list, max_workers=max_workers, cache=cache, options=options, output_root=output_root,
+                         remove_stale_for=apps if devices is None and languages is None else ())
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
+
+
+def render_jobs(job_list: List[ScreenshotJob], max_workers: int = 1, cache: bool = True,
+                options: Optional[RenderOptions] = None, output_root: Path = OUTPUT_DIR,
+                remove_stale_for: Iterable[str] = ()) -> MatrixResult:
+    """Render an explicit list of jobs (see render_matrix), e.g. the ones affected by an edit.
+
+    remove_stale_for names apps whose every job is in job_list; their recorded
+    outputs that none of the jobs produced are deleted (if all their jobs succeeded).
+    Contact sheets always tile every language of the app, reading the outputs
+    of languages that are not in job_list from disk.
+    """
+    started = time.perf_counter()
+    if options is not None and options.draft_scale:
+        cache = False  # drafts are cheap and live outside the manifest's output tree
+    manifest = BuildManifest.load(output_root) if cache else None
+    job_results = run_jobs(job_list, max_workers=max_workers, manifest=manifest, options=options)
+    result = MatrixResult(job_count=len(job_list))
+    for job_result in job_results:
+        label = job_label(job_result.job)
+        if job_result.error is not None:
+            result.failures.append((job_result.job, job_result.error))
+        else:
+            result.records.extend(job_result.records)
+        if job_result.stage_timings:
+            result.stage_timings[label] = job_result.stage_timings
+        if job_result.peak_memory_mb is not None:
+            result.peak_memory_mb[label] = job_result.peak_memory_mb
+
+    if options is not None and options.contact_sheets:
+        sheet_languages = {app: load_app_config(app).languages for app in {record.app for record in result.records}}
+        result.contact_sheets = write_contact_sheets(result.records, languages=sheet_languages)
+        for record in result.records:
+            record.thumbnail = None  # only needed for the sheets
+
+    if manifest is not None:
+        failed_apps = {app_name.lower() for (app_name, _, _), _ in result.failures}
+        for app_name in sorted({app.lower() for app in remove_stale_for} - failed_apps):
+            _remove_stale_outputs(manifest, app_name, [r for r in result.records if r.app == app_name])
+        manifest.save()
+
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
+
+
+def print_summary(result: MatrixResult, title: str = "Screenshot generation summary"):
+    print(f"\n{title}: {len(result.records)} files from "
+          f"{result.job_count - len(result.failures)}/{result.job_count} jobs "
+          f"({result.rendered_count} rendered, {result.cached_count} up to date) "
+          f"in {result.elapsed_seconds:.1f}s")
+    if result.peak_memory_mb:
+        label = max(result.peak_memory_mb, key=result.peak_memory_mb.get)
+        print(f"Peak memory: {result.peak_memory_mb[label]:.0f} MB ({label})")
+    if result.contact_sheets:
+        print(f"Contact sheets: {len(result.contact_sheets)} in {Path(result.contact_sheets[0]).parents[2]}")
+    for (app_name, language, device_type), error in result.failures:
+        print(f"  Failed: {app_name} {device_type}/{language} - {error}")
+
+
+def print_profile(result: MatrixResult, slowest: int = 5):
+    """Print the per-stage summary table and the slowest jobs"""
+    if not result.stage_timings:
+        return
+    print(f"\nStage timings over {len(result.stage_timings)} jobs (summed across workers):")
+    print(format_timings(result.stage_totals(), result.elapsed_seconds))
+
+    job_seconds = {label: sum(entry["seconds"] for entry in timings.values())
+                   for label, timings in result.stage_timings.items()}
+    print("\nSlowest jobs:")
+    for label in sorted(job_seconds, key=job_seconds.get, reverse=True)[:slowest]:
+        print(f"  {label:<32} {job_seconds[label]:.2f}s")
@@ -0,0 +1,239 @@
+"""
+Local render server for on-demand App Store previews
+
+Keeps one process alive so fonts, decoded phone images, base plates and
+parsed configs stay in memory between requests; a warm request only draws
+the caption and encodes the PNG. Requests are handled one at a time, so
+the process-wide caches need no locking.
+
+    python3 render_server.py --port 8765
+    curl -o preview.png http://127.0.0.1:8765/render/plots/iphone/ja/2
+    curl http://127.0.0.1:8765/metrics
+
+GET /render/<app>/<device>/<language>/<index>[?profile=fast|default|release]
+    The PNG (index is 1-based, like the output file names). Timings are in
+    the Server-Timing header.
+GET /metrics
+    Request count and latency percentiles as JSON.
+"""
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+import argparse
+import contextlib
+import io
+import json
+import time
+
+from app_config import load_app_config
+from asset_cache import shared_asset_cache
+from font_coverage import FONT_SUFFIXES, FONTS_DIR
+from fonts import shared_font_cache
+from make_screenshots import PNG_PROFILES, ScreenshotGenerator
+from profiling import StageTimer
+
+DEFAULT_PORT = 8765
+DEFAULT_PROFILE = "fast"
+LATENCY_WINDOW = 1000  # requests kept for the percentiles
+
+
+class RenderError(Exception):
+    """A request that cannot be rendered; carries the HTTP status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _fonts_state() -> Tuple[Tuple[str, int, int], ...]:
+    """(path, mtime, size) of every bundled font"""
+    if not FONTS_DIR.is_dir():
+        return ()
+    return tuple(sorted((str(path), stat.st_mtime_ns, stat.st_size)
+                        for path in FONTS_DIR.rglob("*") if path.suffix.lower() in FONT_SUFFIXES
+                        for stat in [path.stat()]))
+
+
+class PreviewRenderer:
+    """Renders single screenshots, reusing one generator per (app, device, language).
+
+    A generator is rebuilt when load_app_config returns a new config object,
+    i.e. after the config file changed; resource files are re-read by the
+    asset cache when their mtime changes. Loaded faces are keyed by path, so
+    when a file under resources/fonts changes the font cache and every
+    generator are dropped.
+    """
+
+    def __init__(self, verbose: bool = False):
+        self.verbose = verbose
+        self._generators: Dict[Tuple[str, str, str], ScreenshotGenerator] = {}
+        self._fonts_state = _fonts_state()
+
+    def _check_fonts(self):
+        state = _fonts_state()
+        if state != self._fonts_state:
+            print("Fonts changed; reloading")
+            shared_font_cache.clear()
+            self._generators.clear()
+            self._fonts_state = state
+
+    def _generator(self, app: str, device: str, language: str) -> ScreenshotGenerator:
+        try:
+            app_config = load_app_config(app)
+        except FileNotFoundError:
+            raise RenderError(404, f"Unknown app: {app}")
+        except ValueError as e:
+            raise RenderError(500, f"Broken config for {app}: {e}")
+        if device not in app_config.devices:
+            raise RenderError(404, f"Unknown device for {app}: {device}")
+        if language not in app_config.localization:
+            raise RenderError(404, f"Unknown language for {app}: {language}")
+
+        key = (app, device, language)
+        generator = self._generators.get(key)
+        if generator is None or generator.app_config is not app_config:
+            generator = ScreenshotGenerator(language=language, device_type=device, app_name=app,
+                                            app_config=app_config)
+            self._generators[key] = generator
+        return generator
+
+    def render(self, app: str, device: str, language: str, index: int,
+               profile: str = DEFAULT_PROFILE) -> Tuple[bytes, StageTimer]:
+        """PNG bytes of one screenshot and the stage timings of this request"""
+        if profile not in PNG_PROFILES:
+            raise RenderError(400, f"Unknown PNG profile: {profile}")
+        timer = StageTimer()
+        with timer.stage("config"):
+            self._check_fonts()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output) if not self.verbose else contextlib.nullcontext():
+            with timer.stage("config"):
+                generator = self._generator(app.lower(), device, language)
+            if not 1 <= index <= len(generator.device_configs):
+                raise RenderError(404, f"{app}/{device} has {len(generator.device_configs)} screenshots, "
+                                       f"not {index}")
+            generator.timer = timer
+            image = generator.render_image(generator.device_configs[index - 1])
+        if image is None:
+            raise RenderError(404, f"Phone image missing for {app}/{device} #{index}")
+
+        buffer = io.BytesIO()
+        with timer.stage("encode"):
+            image.save(buffer, format="PNG", dpi=(300, 300), **PNG_PROFILES[profile])
+        return buffer.getvalue(), timer
+
+
+class LatencyStats:
+    """Latencies of the last LATENCY_WINDOW requests plus lifetime counters"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self.latencies_ms: List[float] = []
+        self.requests = 0
+        self.errors = 0
+
+    def add(self, milliseconds: float, ok: bool):
+        self.requests += 1
+        self.errors += 0 if ok else 1
+        self.latencies_ms.append(milliseconds)
+        if len(self.latencies_ms) > self.window:
+            del self.latencies_ms[0]
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if not self.latencies_ms:
+            return None
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def to_dict(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency_ms": {
+                "p50": self.percentile(0.50),
+                "p90": self.percentile(0.90),
+                "p99": self.percentile(0.99),
+                "max": max(self.latencies_ms) if self.latencies_ms else None,
+            },
+            "font_cache": shared_font_cache.stats(),
+            "asset_cache": {"hits": shared_asset_cache.hits, "misses": shared_asset_cache.misses,
+                            "megabytes": round(shared_asset_cache.bytes_used / (1 << 20), 1)},
+        }
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    renderer: PreviewRenderer
+    stats: LatencyStats
+
+    latency_ms: Optional[float] = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [unquote(part) for part in url.path.strip("/").split("/")]
+        if parts == ["metrics"]:
+            self._send(200, "application/json", json.dumps(self.stats.to_dict(), indent=2).encode("utf-8"))
+            return
+        if len(parts) != 5 or parts[0] != "render":
+            self._send(404, "text/plain", b"Use /render/<app>/<device>/<language>/<index> or /metrics\n")
+            return
+
+        started = time.perf_counter()
+        _, app, device, language, index = parts
+        profile = parse_qs(url.query).get("profile", [DEFAULT_PROFILE])[0]
+        index = index[:-len(".png")] if index.endswith(".png") else index
+        try:
+            if not index.isdigit():
+                raise RenderError(400, f"Index must be a number: {index}")
+            png, timer = self.renderer.render(app, device, language, int(index), profile)
+        except RenderError as e:
+            self._record(started, ok=False)
+            self._send(e.status, "text/plain", f"{e}\n".encode("utf-8"))
+            return
+        except Exception as e:
+            self._record(started, ok=False)
+            self._send(500, "text/plain", f"Error rendering {url.path}: {e}\n".encode("utf-8"))
+            return
+
+        elapsed_ms = self._record(started, ok=True)
+        server_timing = ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in timer.seconds.items())
+        self._send(200, "image/png", png, {"Server-Timing": f"{server_timing}, total;dur={elapsed_ms:.1f}"})
+
+    def _record(self, started: float, ok: bool) -> float:
+        self.latency_ms = (time.perf_counter() - started) * 1000
+        self.stats.add(self.latency_ms, ok)
+        return self.latency_ms
+
+    def _send(self, status: int, content_type: str, body: bytes, headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        latency = f" {self.latency_ms:.0f} ms" if self.latency_ms is not None else ""
+        print(f"{self.address_string()} {format % args}{latency}")
+
+
+def serve(host: str = "127.0.0.1", port: int = DEFAULT_PORT, verbose: bool = False):
+    handler = type("Handler", (RenderHandler,), {"renderer": PreviewRenderer(verbose), "stats": LatencyStats()})
+    server = HTTPServer((host, port), handler)
+    print(f"Render server on http://{host}:{port}/render/<app>/<device>/<language>/<index> (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve single App Store previews from a warm process")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind (default: 127.0.0.1, local only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument("--verbose", action="store_true", help="Keep the generator's log output")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.verbose)
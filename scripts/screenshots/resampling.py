@@ -0,0 +1,223 @@
+"""
+Resize strategies for the phone scaling step, and a quality/speed comparison
+
+A device picks its strategy with "resize_strategy" in the "devices" block of
+<app>_config.json (default: lanczos, the single-pass filter used so far):
+
+    lanczos         single-pass LANCZOS (reference)
+    bicubic         single-pass BICUBIC
+    bilinear        single-pass BILINEAR
+    reduce_lanczos  Image.reduce() by an integer factor, then LANCZOS (reducing_gap=2.0)
+    box_lanczos     BOX pre-shrink to twice the target size, then LANCZOS
+
+The two multi-step strategies only differ from lanczos when shrinking to
+less than half the size; for upscales (iPad, 1.8x) and mild downscales
+(iPhone, 0.8x) only the filter choice matters.
+
+    python3 resampling.py plots                   # time and PSNR/SSIM of every strategy vs lanczos
+    python3 resampling.py plots --device ipad --repeat 5 --json resize.json
+"""
+
+from PIL import Image, ImageChops, ImageMath
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from statistics import median
+from typing import Callable, Dict, List, Optional, Tuple
+import argparse
+import json
+import math
+import time
+
+DEFAULT_RESIZE_STRATEGY = "lanczos"
+
+# Block size of the SSIM windows (non-overlapping, on luminance)
+SSIM_BLOCK = 8
+# Above this the difference is usually invisible on a device preview
+PSNR_SAME_DB = 40.0
+SSIM_SAME = 0.99
+
+Size = Tuple[int, int]
+
+
+def _lanczos(image: Image.Image, size: Size) -> Image.Image:
+    return image.resize(size, Image.Resampling.LANCZOS)
+
+
+def _bicubic(image: Image.Image, size: Size) -> Image.Image:
+    return image.resize(size, Image.Resampling.BICUBIC)
+
+
+def _bilinear(image: Image.Image, size: Size) -> Image.Image:
+    return image.resize(size, Image.Resampling.BILINEAR)
+
+
+def _reduce_lanczos(image: Image.Image, size: Size) -> Image.Image:
+    return image.resize(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+
+
+def _box_lanczos(image: Image.Image, size: Size) -> Image.Image:
+    intermediate = (size[0] * 2, size[1] * 2)
+    if intermediate[0] < image.width and intermediate[1] < image.height:
+        image = image.resize(intermediate, Image.Resampling.BOX)
+    return image.resize(size, Image.Resampling.LANCZOS)
+
+
+RESIZE_STRATEGIES: Dict[str, Callable[[Image.Image, Size], Image.Image]] = {
+    "lanczos": _lanczos,
+    "bicubic": _bicubic,
+    "bilinear": _bilinear,
+    "reduce_lanczos": _reduce_lanczos,
+    "box_lanczos": _box_lanczos,
+}
+
+
+def resize(image: Image.Image, size: Size, strategy: str = DEFAULT_RESIZE_STRATEGY) -> Image.Image:
+    return RESIZE_STRATEGIES[strategy](image, size)
+
+
+# The expressions below are constants of this module, never user input
+_image_math = getattr(ImageMath, "unsafe_eval", None) or ImageMath.eval  # Pillow >= 10.3 / older
+
+
+def psnr(reference: Image.Image, candidate: Image.Image) -> float:
+    """Peak signal-to-noise ratio over the RGB channels in dB (inf when identical)"""
+    difference = ImageChops.difference(reference.convert("RGB"), candidate.convert("RGB"))
+    squared = sum(count * (value % 256) ** 2 for value, count in enumerate(difference.histogram()))
+    mse = squared / (reference.width * reference.height * 3)
+    return math.inf if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+
+
+def ssim(reference: Image.Image, candidate: Image.Image, block: int = SSIM_BLOCK) -> float:
+    """Mean SSIM of the luminance over non-overlapping block x block windows (1.0 when identical)"""
+    width = reference.width - reference.width % block
+    height = reference.height - reference.height % block
+    x = reference.convert("L").crop((0, 0, width, height)).convert("F")
+    y = candidate.convert("L").crop((0, 0, width, height)).convert("F")
+    mean_x, mean_y = x.reduce(block), y.reduce(block)
+    mean_xx = _image_math("x * x", x=x).reduce(block)
+    mean_yy = _image_math("y * y", y=y).reduce(block)
+    mean_xy = _image_math("x * y", x=x, y=y).reduce(block)
+    ssim_map = _image_math(
+        "((2 * mx * my + c1) * (2 * (xy - mx * my) + c2))"
+        " / ((mx * mx + my * my + c1) * (xx - mx * mx + yy - my * my + c2))",
+        mx=mean_x, my=mean_y, xx=mean_xx, yy=mean_yy, xy=mean_xy,
+        c1=(0.01 * 255) ** 2, c2=(0.03 * 255) ** 2)
+    return ssim_map.resize((1, 1), Image.Resampling.BOX).getpixel((0, 0))
+
+
+@dataclass
+class StrategyResult:
+    """One strategy on one device, over all of the device's screenshots"""
+    device: str
+    strategy: str
+    images: int
+    scale_factor: float
+    ms_per_image: float
+    psnr_db: float           # worst (lowest) over the screenshots
+    ssim: float              # worst (lowest) over the screenshots
+
+    @property
+    def looks_same(self) -> bool:
+        return self.psnr_db >= PSNR_SAME_DB and self.ssim >= SSIM_SAME
+
+
+def _on_background(phone: Image.Image, background: Image.Image) -> Image.Image:
+    """The phone flattened onto the part of the background it covers, as in the base plate"""
+    region = background.crop((0, 0, phone.width, phone.height)).convert("RGBA")
+    region.alpha_composite(phone)
+    return region.convert("RGB")
+
+
+def compare_strategies(app_name: str, devices: Optional[List[str]] = None,
+                       strategies: Optional[List[str]] = None, repeat: int = 3) -> List[StrategyResult]:
+    """Time every strategy on every screenshot of the app and score it against lanczos.
+
+    Each resize is timed `repeat` times and the fastest run counts (the
+    median over screenshots is reported). Quality is compared on the phone
+    flattened onto its background, where the transparent edges show.
+    """
+    from app_config import load_app_config
+
+    app_config = load_app_config(app_name)
+    resources_path = Path(__file__).parent / "resources" / app_config.app_name
+    strategies = strategies or list(RESIZE_STRATEGIES)
+    results = []
+    for device in devices or app_config.device_types:
+        settings = app_config.device(device)
+        background_path = resources_path / settings.background_image
+        samples: Dict[str, List[Tuple[float, float, float]]] = {strategy: [] for strategy in strategies}
+        for filename in settings.screenshots:
+            phone_path = resources_path / filename
+            if not phone_path.exists():
+                print(f"Image file not found: {filename}")
+                continue
+            with Image.open(phone_path) as image:
+                phone = image.convert("RGBA")
+            size = (int(phone.width * settings.scale_factor), int(phone.height * settings.scale_factor))
+            if background_path.exists():
+                with Image.open(background_path) as image:
+                    background = image.convert("RGB")
+            else:
+                background = Image.new("RGB", size, (255, 255, 255))
+
+            # Strategies take turns in every round so none of them is favoured by a warm-up
+            seconds: Dict[str, List[float]] = {strategy: [] for strategy in strategies}
+            resized: Dict[str, Image.Image] = {}
+            for _ in range(max(1, repeat)):
+                for strategy in strategies:
+                    started = time.perf_counter()
+                    resized[strategy] = resize(phone, size, strategy)
+                    seconds[strategy].append(time.perf_counter() - started)
+            reference = _on_background(_lanczos(phone, size), background)
+            for strategy in strategies:
+                flattened = _on_background(resized[strategy], background)
+                samples[strategy].append((min(seconds[strategy]), psnr(reference, flattened),
+                                          ssim(reference, flattened)))
+
+        for strategy, runs in samples.items():
+            if not runs:
+                continue
+            results.append(StrategyResult(
+                device, strategy, len(runs), settings.scale_factor,
+                ms_per_image=median(run[0] for run in runs) * 1000,
+                psnr_db=min(run[1] for run in runs),
+                ssim=min(run[2] for run in runs)))
+    return results
+
+
+def print_comparison(results: List[StrategyResult]):
+    reference_ms = {result.device: result.ms_per_image for result in results
+                    if result.strategy == DEFAULT_RESIZE_STRATEGY}
+    print(f"{'device':<8} {'scale':>5} {'strategy':<15} {'ms/image':>9} {'speedup':>8} "
+          f"{'PSNR dB':>8} {'SSIM':>7}")
+    for result in results:
+        speedup = reference_ms.get(result.device, result.ms_per_image) / result.ms_per_image
+        psnr_text = "same" if math.isinf(result.psnr_db) else f"{result.psnr_db:.1f}"
+        verdict = "  looks the same" if result.looks_same and result.strategy != DEFAULT_RESIZE_STRATEGY else ""
+        print(f"{result.device:<8} {result.scale_factor:>5} {result.strategy:<15} {result.ms_per_image:>9.1f} "
+              f"{speedup:>7.2f}x {psnr_text:>8} {result.ssim:>7.4f}{verdict}")
+    print(f"\nScores are the worst screenshot of each device against lanczos on its background; "
+          f"\"looks the same\" means PSNR >= {PSNR_SAME_DB:.0f} dB and SSIM >= {SSIM_SAME}.")
+
+
+def main(argv: Optional[List[str]] = None) -> List[StrategyResult]:
+    parser = argparse.ArgumentParser(description="Compare phone resize strategies (time and PSNR/SSIM vs lanczos)")
+    parser.add_argument("app", help="App name (config file stem)")
+    parser.add_argument("--device", action="append", dest="devices", help="Only this device (repeatable)")
+    parser.add_argument("--strategy", action="append", dest="strategies", choices=sorted(RESIZE_STRATEGIES),
+                        help="Only this strategy (repeatable, default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per image, fastest counts (default: 3)")
+    parser.add_argument("--json", type=Path, metavar="PATH", help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = compare_strategies(args.app, args.devices, args.strategies, args.repeat)
+    print_comparison(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([asdict(result) for result in results], f, indent=2)
+        print(f"Results written: {args.json}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,67 @@
-from make_screenshots import generate_screenshots
+from make_screenshots import PNG_PROFILES, RenderOptions
+from app_config import config_path_for, load_app_config
+from render import OUTPUT_DIR, print_profile, print_summary, render_matrix
+from layout_check import check_matrix, print_layout_report
+from watch import POLL_INTERVAL, watch
 from pathlib import Path
+from typing import List, Optional
+import argparse
 import json
+import os
 import shutil
 import sys
 
-def main():
-    base_output_dir = Path(__file__).parent / "output"
-    if base_output_dir.exists() and base_output_dir.is_dir():
+def _draft_scale(value: str) -> float:
+    scale = float(value)
+    if not 0 < scale <= 1:
+        raise argparse.ArgumentTypeError(f"draft scale must be in (0, 1], got {value}")
+    return scale
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate App Store screenshots")
+    parser.add_argument("app", nargs="?", help="App name (interactive selection if omitted)")
+    parser.add_argument("--all", action="store_true", help="Render every app with a config file")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (default: CPU count, 1 = serial)")
+    parser.add_argument("--force", action="store_true",
+                        help="Remove the output directory and rebuild everything (default: incremental)")
+    parser.add_argument("--png-profile", choices=sorted(PNG_PROFILES),
+                        help="PNG encoder profile (default: png_profile from the app config, else 'default')")
+    parser.add_argument("--report", type=Path, help="Write per-file records (path, bytes, timings, cached) as JSON")
+    parser.add_argument("--profile", action="store_true",
+                        help="Time each pipeline stage per job and print a summary table")
+    parser.add_argument("--profile-json", type=Path, metavar="PATH",
+                        help="Write the per-job and total stage timings as JSON (implies --profile)")
+    parser.add_argument("--cprofile", metavar="APP/DEVICE/LANG",
+                        help="Run one job under cProfile, e.g. plots/ipad/ja")
+    parser.add_argument("--low-memory", action="store_true",
+                        help="Free intermediate images eagerly and keep a smaller image cache (for big iPad assets)")
+    parser.add_argument("--memory-budget", type=int, metavar="MB",
+                        help="Per-worker memory budget; the image cache is limited to half of it and "
+                             "dropped when a worker goes over")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only lay out the captions and report overflow, line counts and collisions "
+                             "with the phone (no images are rendered; --report writes the layouts as JSON)")
+    parser.add_argument("--draft", type=_draft_scale, metavar="SCALE",
+                        help="Render quick previews at SCALE (e.g. 0.25) into output/draft with the same layout "
+                             "as the final render, a bilinear filter and fast PNG encoding")
+    parser.add_argument("--contact-sheets", action="store_true",
+                        help="Also write one review image per app/device/screenshot tiling every language "
+                             "into output/contact_sheets")
+    parser.add_argument("--watch", action="store_true",
+                        help="After the build, keep polling the app's config and resources and re-render only "
+                             "the outputs whose inputs changed (in-process, caches stay warm)")
+    parser.add_argument("--watch-interval", type=float, default=POLL_INTERVAL, metavar="SECONDS",
+                        help=f"Polling interval for --watch (default: {POLL_INTERVAL})")
+    parser.add_argument("--cprofile-out", default="render_job.prof", metavar="PATH",
+                        help="Where to write the cProfile stats (default: render_job.prof)")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    args = _parse_args(argv)
+
+    base_output_dir = OUTPUT_DIR
+    if args.force and not args.dry_run and base_output_dir.exists() and base_output_dir.is_dir():
         print(f"Removing existing output directory: {base_output_dir}")
         shutil.rmtree(base_output_dir)
         print("Output directory removed.")
@@ -21,8 +76,11 @@ def main():
     available_apps = [f.stem.replace("_config", "") for f in config_files]
 
     # Check if app name is provided as command line argument
-    if len(sys.argv) > 1:
-        provided_app_name = sys.argv[1].lower()
+    if args.all:
+        chosen_app_names = available_apps
+        print(f"Using apps: {', '.join(chosen_app_names)}")
+    elif args.app:
+        provided_app_name = args.app.lower()
         chosen_app_name = None
         
         # Find matching app name (case insensitive)
@@ -32,13 +90,14 @@ def main():
                 break
         
         if chosen_app_name is None:
-            print(f"Error: App '{sys.argv[1]}' not found in available apps.")
+            print(f"Error: App '{args.app}' not found in available apps.")
             print("Available apps:")
             for i, app_name in enumerate(available_apps):
                 print(f"{i + 1}: {app_name}")
             return
         
         print(f"Using app: {chosen_app_name}")
+        chosen_app_names = [chosen_app_name]
     else:
         # Interactive mode - ask user to select
         print("Available apps:")
@@ -58,38 +117,66 @@ def main():
                 print("\nOperation cancelled by user.")
                 return
 
-        chosen_app_name = available_apps[app_index]
+        chosen_app_names = [available_apps[app_index]]
 
-    config_filename = f"{chosen_app_name.lower()}_config.json"
-    config_path = config_dir / config_filename
+    for chosen_app_name in chosen_app_names:
+        config_path = config_path_for(chosen_app_name, config_dir)
 
-    try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
+        try:
+            app_config = load_app_config(chosen_app_name, config_dir)
+        except FileNotFoundError:
+            print(f"Error: Config file not found: {config_path}")
+            return
+        except Exception as e:
+            print(f"Error loading config file: {e}")
+            return
+
+        if not app_config.languages:
+            print(f"Error: No supported languages found in config file: {config_path}")
+            return
         
-        final_app_name = config_data.get("app_name", chosen_app_name)
-        localization_data = config_data.get("localization", {})
-        supported_languages = list(localization_data.keys())
-        supported_devices = list(config_data.get("devices", {}).keys())
-    except FileNotFoundError:
-        print(f"Error: Config file not found: {config_path}")
-        return
-    except Exception as e:
-        print(f"Error loading config file: {e}")
-        return
+        if not app_config.device_types:
+            print(f"Error: No supported devices found in config file: {config_path}")
+            return
 
-    if not supported_languages:
-        print("Error: No supported languages found in config file.")
-        return
-    
-    if not supported_devices:
-        print("Error: No supported devices found in config file.")
-        return
+    if args.dry_run:
+        layout_report = check_matrix(chosen_app_names)
+        print_layout_report(layout_report)
+        if args.report:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump(layout_report.to_dict(), f, indent=2, ensure_ascii=False)
+            print(f"Report written: {args.report}")
+        return layout_report
+
+    options = RenderOptions(png_profile=args.png_profile,
+                            profile=args.profile or args.profile_json is not None,
+                            cprofile_job=args.cprofile,
+                            cprofile_path=str(Path(args.cprofile_out).resolve()),
+                            low_memory=args.low_memory,
+                            memory_budget_mb=args.memory_budget,
+                            draft_scale=args.draft,
+                            contact_sheets=args.contact_sheets)
+    result = render_matrix(chosen_app_names, jobs=args.jobs, options=options)
+    print_summary(result, title=f"Screenshot generation summary for {', '.join(chosen_app_names)}")
+    print_profile(result)
+
+    if args.profile_json:
+        with open(args.profile_json, 'w', encoding='utf-8') as f:
+            json.dump({"elapsed_seconds": result.elapsed_seconds, "total": result.stage_totals(),
+                       "jobs": result.stage_timings}, f, indent=2, ensure_ascii=False)
+        print(f"Stage timings written: {args.profile_json}")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(result.to_dict(), f, indent=2, ensure_ascii=False)
+        print(f"Report written: {args.report}")
+
+    if args.watch:
+        watch(chosen_app_names, options=options, interval=args.watch_interval)
 
-    for device_type in supported_devices:
-        for lang in supported_languages:
-            print(f"\n--- Generating screenshots for {final_app_name} ({device_type}) in {lang} ---")
-            generate_screenshots(app_name=final_app_name, language=lang, device_type=device_type)
+    return result
 
 if __name__ == "__main__":
-    main()
+    outcome = main()
+    # Layout errors in --dry-run and failed render jobs fail the process, so CI and make can gate on them
+    sys.exit(1 if outcome is not None and not outcome.ok else 0)
@@ -0,0 +1,155 @@
+"""
+Caption line breaking for App Store preview generation
+"""
+
+from PIL import ImageFont
+from typing import Dict, List, Union
+import weakref
+
+Font = Union[ImageFont.FreeTypeFont, ImageFont.ImageFont]
+
+# Closing punctuation that must not start a line (kept with the preceding character)
+NO_BREAK_BEFORE = set("、。，．,.!?！？：；:;)]}）」』】〉》〕ー〜…‥ゝゞ々ぁぃぅぇぉっゃゅょァィゥェォッャュョ")
+
+
+def is_break_anywhere(char: str) -> bool:
+    """True for scripts that may break between any two characters (Han, Kana, CJK punctuation).
+
+    Hangul is deliberately excluded: Korean captions are spaced and wrap at spaces.
+    """
+    code = ord(char)
+    return (
+        0x3000 <= code <= 0x30FF      # CJK symbols and punctuation, Hiragana, Katakana
+        or 0x3400 <= code <= 0x4DBF   # CJK Extension A
+        or 0x4E00 <= code <= 0x9FFF   # CJK Unified Ideographs
+        or 0xF900 <= code <= 0xFAFF   # CJK Compatibility Ideographs
+        or 0xFF00 <= code <= 0xFFEF   # Halfwidth and Fullwidth Forms
+        or 0x20000 <= code <= 0x2FFFF  # CJK Extensions B+
+    )
+
+
+class GlyphWidthTable:
+    """Memoized per-character advances for one font face at one size"""
+
+    def __init__(self, font: Font):
+        self.font = font
+        self._advances: Dict[str, float] = {}
+
+    def advance(self, char: str) -> float:
+        width = self._advances.get(char)
+        if width is None:
+            width = self.font.getlength(char)
+            self._advances[char] = width
+        return width
+
+    def measure(self, text: str) -> float:
+        return sum(self.advance(char) for char in text)
+
+
+# One table per loaded face; faces are shared through FontCache, so this is effectively (file, size)
+_width_tables: "weakref.WeakKeyDictionary[Font, GlyphWidthTable]" = weakref.WeakKeyDictionary()
+
+
+def width_table(font: Font) -> GlyphWidthTable:
+    table = _width_tables.get(font)
+    if table is None:
+        table = GlyphWidthTable(font)
+        _width_tables[font] = table
+    return table
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split text into unbreakable units: words, single break-anywhere characters and single spaces"""
+    tokens: List[str] = []
+    word = ""
+    for char in text:
+        if char.isspace():
+            if word:
+                tokens.append(word)
+                word = ""
+            if tokens and tokens[-1] != " ":
+                tokens.append(" ")
+        elif char in NO_BREAK_BEFORE and (word or (tokens and tokens[-1] != " ")):
+            if word:
+                word += char
+            else:
+                tokens[-1] += char
+        elif is_break_anywhere(char):
+            if word:
+                tokens.append(word)
+                word = ""
+            tokens.append(char)
+        else:
+            if word and is_break_anywhere(word[-1]):
+                tokens.append(word)
+                word = ""
+            word += char
+    if word:
+        tokens.append(word)
+    while tokens and tokens[-1] == " ":
+        tokens.pop()
+    return tokens
+
+
+def break_lines(text: str, max_width: float, font: Font) -> List[str]:
+    """Greedy line breaking using measured glyph advances.
+
+    Han/Kana text may break between any two characters; everything else
+    breaks at spaces. Words wider than max_width are split by character.
+    """
+    if not text:
+        return []
+
+    table = width_table(font)
+    space_width = table.advance(" ")
+    lines: List[str] = []
+    line = ""
+    line_width = 0.0
+    pending_space = False
+
+    for token in _tokenize(text):
+        if token == " ":
+            pending_space = bool(line)
+            continue
+
+        token_width = table.measure(token)
+        gap = space_width if pending_space else 0.0
+        pending_space = False
+
+        if line and line_width + gap + token_width <= max_width:
+            line += (" " if gap else "") + token
+            line_width += gap + token_width
+            continue
+
+        if line:
+            lines.append(line)
+            line, line_width = "", 0.0
+
+        if token_width <= max_width:
+            line, line_width = token, token_width
+            continue
+
+        # Overlong word: break by character
+        for char in token:
+            char_width = table.advance(char)
+            if line and line_width + char_width > max_width:
+                lines.append(line)
+                line, line_width = "", 0.0
+            line += char
+            line_width += char_width
+
+    if line:
+        lines.append(line)
+    return lines
+
+
+def overflowing_words(text: str, max_width: float, font: Font) -> List[str]:
+    """Unbreakable words wider than max_width; break_lines has to split these mid-word"""
+    table = width_table(font)
+    return [token for token in _tokenize(text) if token != " " and table.measure(token) > max_width]
+
+
+def line_width(line: str, font: Font) -> int:
+    """Ink width of a single line, measured directly on the font (no scratch image)"""
+    left, _, right, _ = font.getbbox(line)
+    return right - left
@@ -0,0 +1,212 @@
+"""
+Watch mode for App Store preview generation
+
+Polls the config files and resources of the watched apps and, after each
+edit, re-renders only the jobs whose inputs changed. The changed jobs are
+found by diffing the parsed config against the previous version and by
+mapping changed resource files to the devices that use them; within a job
+the build manifest then skips every screenshot whose fingerprint did not
+change, so editing one caption re-renders one file per device.
+
+Rendering happens in this process, so the asset, font, config and digest
+caches stay warm between edits.
+
+    python3 run_screenshots.py plots --watch
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import os
+import time
+
+from app_config import AppConfig, config_path_for, load_app_config
+from fonts import shared_font_cache
+from render import OUTPUT_DIR, ScreenshotJob, print_summary, render_jobs
+from make_screenshots import RenderOptions
+
+RESOURCES_DIR = Path(__file__).parent / "resources"
+POLL_INTERVAL = 0.5
+
+# path -> (mtime_ns, size)
+Snapshot = Dict[Path, Tuple[int, int]]
+
+
+def _ignored(path: Path) -> bool:
+    """Editor swap files, our own temp files and the font coverage index"""
+    name = path.name
+    return name.startswith(".") or name.endswith(("~", ".tmp", ".swp"))
+
+
+def snapshot(apps: Iterable[str], resources_dir: Path = RESOURCES_DIR) -> Snapshot:
+    """mtime and size of every input the watched apps are rendered from"""
+    state: Snapshot = {}
+    roots = [resources_dir / app for app in apps] + [resources_dir / "fonts"]
+    for root in roots:
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = Path(directory) / filename
+                if _ignored(path):
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                state[path] = (stat.st_mtime_ns, stat.st_size)
+    for app in apps:
+        config_path = config_path_for(app, resources_dir / "config")
+        try:
+            stat = config_path.stat()
+        except OSError:
+            continue
+        state[config_path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def changed_paths(before: Snapshot, after: Snapshot) -> Set[Path]:
+    """Files added, removed or modified between two snapshots"""
+    return {path for path in before.keys() | after.keys() if before.get(path) != after.get(path)}
+
+
+def _all_jobs(config: AppConfig) -> List[ScreenshotJob]:
+    return [(config.app_name, language, device) for device in config.device_types for language in config.languages]
+
+
+def config_changes(old: Optional[AppConfig], new: AppConfig) -> List[ScreenshotJob]:
+    """Jobs whose outputs depend on a part of the config that differs between old and new.
+
+    Device settings (offsets, scale, font sizes, background, screenshot list)
+    affect every language of that device; a language's localization block
+    (captions, font mapping) affects every device of that language. Anything
+    else at the top level (output directory, PNG profile) affects every job.
+    """
+    if old is None:
+        return _all_jobs(new)
+    old_rest = {key: value for key, value in old.raw.items() if key not in ("devices", "localization")}
+    new_rest = {key: value for key, value in new.raw.items() if key not in ("devices", "localization")}
+    if old_rest != new_rest:
+        return _all_jobs(new)
+
+    devices = {device for device in new.device_types
+               if old.raw.get("devices", {}).get(device) != new.raw["devices"][device]}
+    languages = {language for language in new.languages
+                 if old.localization.get(language) != new.localization[language]}
+    return [(new.app_name, language, device) for device in new.device_types for language in new.languages
+            if device in devices or language in languages]
+
+
+def config_removes_outputs(old: Optional[AppConfig], new: AppConfig) -> bool:
+    """True if outputs of old may no longer be produced by new.
+
+    That is a removed language or device, fewer screenshots, a renamed
+    device identifier or a moved output directory.
+    """
+    if old is None:
+        return False
+    if old.output_base_dir != new.output_base_dir or set(old.languages) - set(new.languages):
+        return True
+    for device, settings in old.devices.items():
+        new_settings = new.devices.get(device)
+        if new_settings is None or len(new_settings.screenshots) < len(settings.screenshots) \
+                or new_settings.fastlane_device_identifier != settings.fastlane_device_identifier:
+            return True
+    return False
+
+
+def resource_changes(config: AppConfig, paths: Iterable[Path], resources_dir: Path = RESOURCES_DIR) -> List[ScreenshotJob]:
+    """Jobs that read one of the changed files under resources/<app>/ (a screenshot or background)"""
+    app_dir = (resources_dir / config.app_name).resolve()
+    names = {path.name for path in paths if path.resolve().parent == app_dir}
+    devices = {device for device, settings in config.devices.items()
+               if settings.background_image in names or names.intersection(settings.screenshots)}
+    return [(config.app_name, language, device) for device in config.device_types for language in config.languages
+            if device in devices]
+
+
+class Watcher:
+    """Keeps the last snapshot and parsed config per app, and turns file changes into jobs"""
+
+    def __init__(self, apps: Iterable[str], resources_dir: Path = RESOURCES_DIR):
+        self.apps = [app.lower() for app in apps]
+        self.resources_dir = resources_dir
+        self.configs: Dict[str, Optional[AppConfig]] = {}
+        for app in self.apps:
+            self.configs[app] = self._load(app)
+        self.state = snapshot(self.apps, resources_dir)
+
+    def _load(self, app: str) -> Optional[AppConfig]:
+        try:
+            return load_app_config(app, self.resources_dir / "config")
+        except (OSError, ValueError) as e:
+            # Usually a half-saved file; the next save is picked up again
+            print(f"Warning: Could not load config for {app}: {e}")
+            return None
+
+    def poll(self) -> Set[Path]:
+        """Changed files since the last poll (the snapshot is only advanced when something changed)"""
+        current = snapshot(self.apps, self.resources_dir)
+        changed = changed_paths(self.state, current)
+        if changed:
+            self.state = current
+        return changed
+
+    def affected_jobs(self, changed: Set[Path]) -> Tuple[List[ScreenshotJob], Set[str]]:
+        """Jobs to re-render for a set of changed files, in plan order without duplicates.
+
+        Also returns the apps whose config dropped outputs: every job of those
+        apps is included, so their outputs that are no longer produced can be
+        removed (the manifest still skips the unchanged ones).
+        """
+        fonts_dir = (self.resources_dir / "fonts").resolve()
+        fonts_changed = any(fonts_dir in path.resolve().parents for path in changed)
+        if fonts_changed:
+            shared_font_cache.clear()  # faces are keyed by path, not by file content
+
+        jobs: List[ScreenshotJob] = []
+        complete_apps: Set[str] = set()
+        for app in self.apps:
+            if config_path_for(app, self.resources_dir / "config") in changed:
+                new = self._load(app)
+                if new is not None:
+                    if config_removes_outputs(self.configs[app], new):
+                        complete_apps.add(app)
+                    jobs += config_changes(self.configs[app], new)
+                    self.configs[app] = new
+            config = self.configs[app]
+            if config is None:
+                continue
+            if fonts_changed or app in complete_apps:
+                jobs += _all_jobs(config)
+            jobs += resource_changes(config, changed, self.resources_dir)
+        return list(dict.fromkeys(jobs)), complete_apps
+
+
+def watch(apps: Iterable[str], options: Optional[RenderOptions] = None, output_root: Path = OUTPUT_DIR,
+          interval: float = POLL_INTERVAL):
+    """Re-render the affected jobs after every change until interrupted"""
+    watcher = Watcher(apps)
+    print(f"Watching {len(watcher.state)} files for {', '.join(watcher.apps)} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(interval)
+            changed = watcher.poll()
+            if not changed:
+                continue
+            # Editors and copies often write in several steps; wait until the tree is quiet
+            while True:
+                time.sleep(interval)
+                more = watcher.poll()
+                if not more:
+                    break
+                changed |= more
+
+            for path in sorted(changed):
+                print(f"Changed: {path.relative_to(watcher.resources_dir)}")
+            jobs, complete_apps = watcher.affected_jobs(changed)
+            if not jobs and not complete_apps:
+                print("No outputs affected")
+                continue
+            result = render_jobs(jobs, max_workers=1, options=options, output_root=output_root,
+                                 remove_stale_for=complete_apps)
+            print_summary(result, title="Re-render")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
@@ -12,81 +12,31 @@ Fastlane 메타데이터 자동 번역 스크립트
 import os
 import sys
 import argparse
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
-
-# 번역 매핑 - 한국어 기준으로 20개 언어 번역
-TRANSLATIONS = {
-    "en-US": {
-        "앱을 업데이트 했습니다. 그리고  첫 출근을 했습니다.": "Updated the app. And I started my first day at work."
-    },
-    "ja": {
-        "앱을 업데이트 했습니다. 그리고  첫 출근을 했습니다.": "アプリを更新しました。そして初出勤をしました。"
-    },
-    "zh-Hans": {
-        "앱을 업데이트 했습니다. 그리고  첫 출근을 했습니다.": "应用已更新。我已开始第一天上班。"
-    },
-    "zh-Hant": {
-        "앱을 업데이트 했습니다. 그리고  첫 출근을 했습니다.": "應用程式已更新。我已開始第一天上班。"
-    },
-    "de-DE": {
-        "앱을 업데이트 했습니다. 그리고  첫 출근을 했습니다.": "Die App wurde aktualisiert. Und ich habe meinen ersten Arbeitstag gehabt."
-    },
-    "fr-FR": {
-        "앱을 업데이트 했습니다. 그리고  첫 출근을 했습니다.": "L'application a été mise à jour. Et j'ai fait mon premier jour de travail."
-    },
-    "es-ES": {
-        "앱을 업데이트 했습니다. 그리고  첫 출근을 했습니다.": "La aplicación ha sido actualizada. Y tuve mi primer día de trabajo."
-    },
-    "it": {
-        "앱을 업데이트 했습니다. 그리고  첫 출근을 했습니다.": "L'app è stata aggiornata. E ho fatto il mio primo giorno di lavoro."
-    },
-    "pt-BR": {
-        "앱을 업데이트 했습니다. 그리고  첫 출근을 했습니다.": "O aplicativo foi atualizado. E tive meu primeiro dia de trabalho."
-    },
-    "ru": {
-        "앱을 업데이트 했습니다. 그리고  첫 출근을 했습니다.": "Приложение обновлено. И у меня был первый рабочий день."
-    },
-    "ar-SA": {
-        "앱을 업데이트 했습니다. 그리고  첫 출근을 했습니다.": "تم تحديث التطبيق. وقد بدأت يومي الأول في العمل."
-    },
-    "hi": {
-        "앱을 업데이트 했습니다. 그리고  첫 출근을 했습니다.": "ऐप अपडेट किया गया है। और मैंने काम का पहला दिन शुरू किया है।"
-    },
-    "tr": {
-        "앱을 업데이트 했습니다. 그리고  첫 출근을 했습니다.": "Uygulama güncellendi. Ve ilk iş günümü yaşadım."
-    },
-    "pl": {
-        "앱을 업데이트 했습니다. 그리고  첫 출근을 했습니다.": "Aplikacja została zaktualizowana. I miałem pierwszy dzień pracy."
-    },
-    "nl-NL": {
-        "앱을 업데이트 했습니다. 그리고  첫 출근을 했습니다.": "De app is bijgewerkt. En ik had mijn eerste werkdag."
-    },
-    "sv": {
-        "앱을 업데이트 했습니다. 그리고  첫 출근을 했습니다.": "Appen har uppdaterats. Och jag hade min första arbetsdag."
-    },
-    "da": {
-        "앱을 업데이트 했습니다. 그리고  첫 출근을 했습니다.": "Appen er blevet opdateret. Og jeg havde min første arbejdsdag."
-    },
-    "fi": {
-        "앱을 업데이트 했습니다. 그리고  첫 출근을 했습니다.": "Sovellus on päivitetty. Ja minulla oli ensimmäinen työpäiväni."
-    },
-    "no": {
-        "앱을 업데이트 했습니다. 그리고  첫 출근을 했습니다.": "Appen er oppdatert. Og jeg hadde min første arbeidsdag."
-    }
-}
+from typing import Dict, List, Optional, Tuple
+
+from translation_memory import MEMORY_PATH, TARGET_LANGUAGES, TranslationMemory
 
 # 지원하는 앱 목록
 SUPPORTED_APPS = ["Capts", "Multis", "Plots", "Retros", "Toffs"]
 
 # 지원하는 언어 목록 (한국어 제외)
-SUPPORTED_LANGUAGES = list(TRANSLATIONS.keys())
+SUPPORTED_LANGUAGES = TARGET_LANGUAGES
 
 # 번역 가능한 파일 목록 (안전을 위해 제한)
 TRANSLATABLE_FILES = ["release_notes.txt", "name.txt", "subtitle.txt", "description.txt", "keywords.txt"]
 
+# 파일 쓰기 스레드 수
+DEFAULT_WRITE_WORKERS = 8
+
+@lru_cache(maxsize=None)
 def get_workspace_root() -> Path:
-    """작업공간 루트 디렉토리를 찾습니다."""
+    """작업공간 루트 디렉토리를 찾습니다 (실행마다 한 번만 찾고 결과를 재사용합니다)."""
     current = Path.cwd()
     while current != current.parent:
         if (current / "fastlane").exists():
@@ -98,12 +48,138 @@ def is_safe_to_update(file_name: str) -> bool:
     """파일이 번역 대상인지 확인합니다."""
     return file_name in TRANSLATABLE_FILES
 
+def metadata_path(app_name: str, language: str, file_name: str) -> Path:
+    return get_workspace_root() / "fastlane" / "metadata" / app_name / language / file_name
+
+@dataclass
+class PlannedWrite:
+    """한 파일에 쓸 내용"""
+    path: Path
+    content: str
+    label: str  # 예: Plots/ja/release_notes.txt
+
+    @property
+    def data(self) -> bytes:
+        # open(..., 'w', encoding='utf-8')와 같은 바이트
+        return self.content.replace('\n', os.linesep).encode('utf-8')
+
+def plan_app_writes(app_name: str, file_name: str, korean_text: str,
+                    memory: TranslationMemory) -> Tuple[List[PlannedWrite], List[str]]:
+    """한 앱의 한국어 원본 + 모든 언어 번역 쓰기 계획과, 계획할 수 없었던 이유들을 반환합니다."""
+    writes = [PlannedWrite(metadata_path(app_name, "ko", file_name), korean_text, f"{app_name}/ko/{file_name}")]
+    errors = []
+    translations = memory.translations(korean_text)
+    for language in SUPPORTED_LANGUAGES:
+        if language not in translations:
+            errors.append(f"'{korean_text}'에 대한 {language} 번역이 없습니다. ({memory.path.name}에 추가하세요)")
+            continue
+        writes.append(PlannedWrite(metadata_path(app_name, language, file_name), translations[language],
+                                   f"{app_name}/{language}/{file_name}"))
+    return writes, errors
+
+def _writable_directory(directory: Path) -> Optional[str]:
+    """directory를 만들거나 쓸 수 있는지 확인합니다. 문제가 있으면 이유를 반환합니다."""
+    existing = directory
+    while not existing.exists():
+        existing = existing.parent
+    if not existing.is_dir():
+        return f"{existing}은 디렉토리가 아닙니다"
+    if not os.access(existing, os.W_OK | os.X_OK):
+        return f"{existing}에 쓸 권한이 없습니다"
+    return None
+
+def check_writes(writes: List[PlannedWrite]) -> List[str]:
+    """아무 파일도 건드리기 전에 계획 전체를 검사합니다."""
+    errors = []
+    seen = set()
+    checked_dirs: Dict[Path, Optional[str]] = {}
+    for write in writes:
+        if write.path in seen:
+            errors.append(f"{write.label}: 같은 파일에 두 번 쓰려고 합니다")
+            continue
+        seen.add(write.path)
+        if not is_safe_to_update(write.path.name):
+            errors.append(f"{write.label}: 번역 대상 파일이 아닙니다")
+        if write.path.is_dir():
+            errors.append(f"{write.label}: 파일 자리에 디렉토리가 있습니다")
+            continue
+        if write.path.parent not in checked_dirs:
+            checked_dirs[write.path.parent] = _writable_directory(write.path.parent)
+        if checked_dirs[write.path.parent]:
+            errors.append(f"{write.label}: {checked_dirs[write.path.parent]}")
+        elif write.path.exists() and not os.access(write.path, os.W_OK):
+            errors.append(f"{write.label}: 파일에 쓸 권한이 없습니다")
+    return errors
+
+def atomic_write(path: Path, data: bytes, mode_from: Optional[Path] = None):
+    """임시 파일에 쓴 뒤 rename으로 교체합니다. 중간에 실패해도 기존 파일은 그대로 남습니다."""
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        if mode_from is not None:
+            shutil.copymode(mode_from, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+def apply_write(write: PlannedWrite, create_backup: bool = True) -> Tuple[PlannedWrite, str, Optional[str]]:
+    """한 파일을 씁니다. (계획, "written" | "unchanged" | "failed", 메시지)를 반환합니다.
+
+    기존 파일은 한 번만 읽어 비교와 백업에 같이 쓰고, 내용이 같으면 쓰지 않습니다.
+    """
+    data = write.data
+    try:
+        old_data = write.path.read_bytes()
+    except FileNotFoundError:
+        old_data = None
+    except OSError as e:
+        return write, "failed", str(e)
+    if old_data == data:
+        return write, "unchanged", None
+    
+    try:
+        write.path.parent.mkdir(parents=True, exist_ok=True)
+        backup_path = None
+        if create_backup and old_data is not None:
+            backup_path = write.path.with_suffix(f"{write.path.suffix}.backup")
+            atomic_write(backup_path, old_data, mode_from=write.path)
+        atomic_write(write.path, data, mode_from=write.path if old_data is not None else None)
+    except OSError as e:
+        return write, "failed", str(e)
+    return write, "written", str(backup_path.relative_to(get_workspace_root())) if backup_path else None
+
+def apply_writes(writes: List[PlannedWrite], create_backup: bool = True,
+                 max_workers: int = DEFAULT_WRITE_WORKERS) -> Dict[str, int]:
+    """계획한 쓰기를 스레드 풀에서 동시에 실행하고 결과를 계획 순서대로 출력합니다."""
+    results = {"success": 0, "failed": 0, "unchanged": 0}
+    if not writes:
+        return results
+    workers = max(1, min(max_workers, len(writes)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        outcomes = list(executor.map(lambda write: apply_write(write, create_backup), writes))
+    for write, status, message in outcomes:
+        if status == "failed":
+            print(f"❌ {write.label} 업데이트 실패: {message}")
+            results["failed"] += 1
+            continue
+        results["success"] += 1
+        if status == "unchanged":
+            results["unchanged"] += 1
+            print(f"➖ {write.label} 변경 없음")
+        else:
+            if message:
+                print(f"📁 백업 생성: {message}")
+            print(f"✅ {write.label} 업데이트 완료")
+    return results
+
 def backup_file_if_exists(file_path: Path) -> bool:
     """파일이 존재하면 백업을 생성합니다."""
     if file_path.exists():
         backup_path = file_path.with_suffix(f"{file_path.suffix}.backup")
         try:
-            backup_path.write_text(file_path.read_text(encoding='utf-8'), encoding='utf-8')
+            atomic_write(backup_path, file_path.read_bytes(), mode_from=file_path)
             print(f"📁 백업 생성: {backup_path.relative_to(get_workspace_root())}")
             return True
         except Exception as e:
@@ -117,76 +193,58 @@ def update_korean_file(app_name: str, file_name: str, korean_text: str, create_b
         print(f"⚠️  '{file_name}'은 번역 대상 파일이 아닙니다. 허용된 파일: {', '.join(TRANSLATABLE_FILES)}")
         return False
     
-    workspace_root = get_workspace_root()
-    ko_file_path = workspace_root / "fastlane" / "metadata" / app_name / "ko" / file_name
-    
-    # 디렉토리가 없으면 생성
-    ko_file_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    # 기존 파일 백업
-    if create_backup and not backup_file_if_exists(ko_file_path):
-        return False
-    
-    try:
-        with open(ko_file_path, 'w', encoding='utf-8') as f:
-            f.write(korean_text)
-        print(f"✅ {app_name}/ko/{file_name} 업데이트 완료")
-        return True
-    except Exception as e:
-        print(f"❌ {app_name}/ko/{file_name} 업데이트 실패: {e}")
-        return False
+    write = PlannedWrite(metadata_path(app_name, "ko", file_name), korean_text, f"{app_name}/ko/{file_name}")
+    return _apply_checked([write], create_backup)["failed"] == 0
 
-def translate_and_update_file(app_name: str, language: str, file_name: str, korean_text: str, create_backup: bool = True) -> bool:
+def translate_and_update_file(app_name: str, language: str, file_name: str, korean_text: str, create_backup: bool = True,
+                              memory: Optional[TranslationMemory] = None) -> bool:
     """지정된 언어로 번역하고 파일을 안전하게 업데이트합니다."""
     if not is_safe_to_update(file_name):
         return False
-        
-    if korean_text not in TRANSLATIONS[language]:
-        print(f"⚠️  '{korean_text}'에 대한 {language} 번역이 없습니다.")
-        return False
-    
-    translated_text = TRANSLATIONS[language][korean_text]
-    
-    workspace_root = get_workspace_root()
-    target_file_path = workspace_root / "fastlane" / "metadata" / app_name / language / file_name
     
-    # 디렉토리가 없으면 생성
-    target_file_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    # 기존 파일 백업
-    if create_backup and not backup_file_if_exists(target_file_path):
+    memory = memory if memory is not None else TranslationMemory.load()
+    translated_text = memory.lookup(korean_text, language)
+    if translated_text is None:
+        print(f"⚠️  '{korean_text}'에 대한 {language} 번역이 없습니다. ({memory.path.name}에 추가하세요)")
         return False
     
-    try:
-        with open(target_file_path, 'w', encoding='utf-8') as f:
-            f.write(translated_text)
-        print(f"✅ {app_name}/{language}/{file_name} 번역 완료")
-        return True
-    except Exception as e:
-        print(f"❌ {app_name}/{language}/{file_name} 번역 실패: {e}")
-        return False
+    write = PlannedWrite(metadata_path(app_name, language, file_name), translated_text,
+                         f"{app_name}/{language}/{file_name}")
+    return _apply_checked([write], create_backup)["failed"] == 0
 
-def process_app(app_name: str, file_name: str, korean_text: str, create_backup: bool = True) -> Dict[str, int]:
-    """하나의 앱에 대해 전체 번역 프로세스를 안전하게 실행합니다."""
-    print(f"\n🔄 {app_name} 앱 처리 중...")
-    
-    results = {"success": 0, "failed": 0}
-    
-    # 1. 한국어 원본 파일 업데이트
-    if update_korean_file(app_name, file_name, korean_text, create_backup):
-        results["success"] += 1
-    else:
-        results["failed"] += 1
-        return results  # 한국어 파일 업데이트가 실패하면 번역도 중단
-    
-    # 2. 모든 언어로 번역
-    for language in SUPPORTED_LANGUAGES:
-        if translate_and_update_file(app_name, language, file_name, korean_text, create_backup):
-            results["success"] += 1
-        else:
-            results["failed"] += 1
+def _apply_checked(writes: List[PlannedWrite], create_backup: bool) -> Dict[str, int]:
+    errors = check_writes(writes)
+    for error in errors:
+        print(f"❌ {error}")
+    if errors:
+        return {"success": 0, "failed": len(writes), "unchanged": 0}
+    return apply_writes(writes, create_backup)
+
+def plan_apps(app_names: List[str], file_name: str, korean_text: str,
+              memory: TranslationMemory) -> Tuple[List[PlannedWrite], List[str]]:
+    """여러 앱의 쓰기 계획을 모으고 전체를 검사합니다. 오류가 하나라도 있으면 아무것도 쓰면 안 됩니다."""
+    writes, errors = [], []
+    for app_name in app_names:
+        app_writes, app_errors = plan_app_writes(app_name, file_name, korean_text, memory)
+        writes.extend(app_writes)
+        errors.extend(f"{app_name}: {error}" for error in app_errors)
+    errors.extend(check_writes(writes))
+    return writes, errors
+
+def process_app(app_name: str, file_name: str, korean_text: str, create_backup: bool = True,
+                memory: Optional[TranslationMemory] = None) -> Dict[str, int]:
+    """하나의 앱에 대해 전체 번역 프로세스를 안전하게 실행합니다.
     
-    return results
+    번역이 하나라도 없거나 쓸 수 없는 파일이 있으면 어떤 파일도 바꾸지 않습니다.
+    """
+    print(f"\n🔄 {app_name} 앱 처리 중...")
+    memory = memory if memory is not None else TranslationMemory.load()
+    writes, errors = plan_apps([app_name], file_name, korean_text, memory)
+    for error in errors:
+        print(f"❌ {error}")
+    if errors:
+        return {"success": 0, "failed": len(SUPPORTED_LANGUAGES) + 1, "unchanged": 0}
+    return apply_writes(writes, create_backup)
 
 def main():
     parser = argparse.ArgumentParser(description="Fastlane 메타데이터 안전 번역 도구")
@@ -199,6 +257,9 @@ def main():
     parser.add_argument("--korean-text", required=True, help="한국어 원본 텍스트")
     parser.add_argument("--no-backup", action="store_true", help="백업 파일을 생성하지 않음")
     parser.add_argument("--dry-run", action="store_true", help="실제 파일을 변경하지 않고 시뮬레이션만 실행")
+    parser.add_argument("--memory", type=Path, default=MEMORY_PATH, help=f"번역 메모리 파일 (기본: {MEMORY_PATH.name})")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_WRITE_WORKERS,
+                        help=f"동시에 쓸 파일 수 (기본: {DEFAULT_WRITE_WORKERS})")
     
     args = parser.parse_args()
     
@@ -208,11 +269,25 @@ def main():
         print(f"허용된 파일: {', '.join(TRANSLATABLE_FILES)}")
         sys.exit(1)
     
+    memory = TranslationMemory.load(args.memory)
+    app_names = SUPPORTED_APPS if args.all_apps else [args.app]
+    writes, errors = plan_apps(app_names, args.file, args.korean_text, memory)
+    
     if args.dry_run:
         print("🔍 DRY RUN 모드: 실제 파일을 변경하지 않습니다.")
         print(f"📄 대상 파일: {args.file}")
         print(f"🇰🇷 한국어 텍스트: {args.korean_text}")
         print(f"📁 백업 생성: {'아니오' if args.no_backup else '예'}")
+        missing = memory.missing_languages(args.korean_text, SUPPORTED_LANGUAGES)
+        if missing:
+            print(f"⚠️  번역 메모리에 없는 언어 ({len(missing)}개): {', '.join(missing)}")
+        else:
+            print(f"🌐 번역 메모리: {len(SUPPORTED_LANGUAGES)}개 언어 모두 있음")
+        print(f"📝 쓰기 계획: {len(app_names)}개 앱, {len(writes)}개 파일")
+        for error in errors:
+            print(f"❌ {error}")
+        if errors:
+            sys.exit(1)
         return
     
     create_backup = not args.no_backup
@@ -222,21 +297,19 @@ def main():
     print(f"🇰🇷 한국어 텍스트: {args.korean_text}")
     print(f"📁 백업 생성: {'아니오' if args.no_backup else '예'}")
     
-    total_results = {"success": 0, "failed": 0}
+    # 모든 앱의 계획을 먼저 검사하고, 문제가 있으면 아무 파일도 바꾸지 않습니다.
+    if errors:
+        print(f"\n❌ 쓰기 전 검사에서 {len(errors)}개 문제가 발견되어 아무 파일도 변경하지 않았습니다:")
+        for error in errors:
+            print(f"  - {error}")
+        sys.exit(1)
     
     if args.all_apps:
         print(f"\n📱 모든 앱 처리 중... ({len(SUPPORTED_APPS)}개)")
-        for app_name in SUPPORTED_APPS:
-            app_results = process_app(app_name, args.file, args.korean_text, create_backup)
-            total_results["success"] += app_results["success"]
-            total_results["failed"] += app_results["failed"]
-    else:
-        app_results = process_app(args.app, args.file, args.korean_text, create_backup)
-        total_results["success"] += app_results["success"]
-        total_results["failed"] += app_results["failed"]
+    total_results = apply_writes(writes, create_backup, max_workers=args.jobs)
     
     print(f"\n🎉 번역 완료!")
-    print(f"✅ 성공: {total_results['success']}개")
+    print(f"✅ 성공: {total_results['success']}개 (변경 없음 {total_results['unchanged']}개)")
     print(f"❌ 실패: {total_results['failed']}개")
     
     if create_backup:
@@ -247,4 +320,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
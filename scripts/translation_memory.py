@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+번역 메모리 (translation_memory.jsonl)
+
+한국어 원문 → 언어별 번역을 한 줄에 하나씩 JSONL로 저장합니다.
+원문은 정규화(NFC, 공백 정리)한 텍스트의 해시로 찾으므로 공백이 조금 달라도 찾을 수 있습니다.
+
+사용법:
+    python3 scripts/translation_memory.py --import-configs          # 모든 *_config.json의 localization 가져오기
+    python3 scripts/translation_memory.py --lookup "앱을 업데이트 했습니다."  # 저장된 번역 출력
+    python3 scripts/translation_memory.py --stats
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import unicodedata
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+SCRIPTS_DIR = Path(__file__).parent
+MEMORY_PATH = SCRIPTS_DIR / "translation_memory.jsonl"
+CONFIG_DIRS = [
+    SCRIPTS_DIR / "metadata" / "resources" / "config",
+    SCRIPTS_DIR / "screenshots" / "resources" / "config",
+]
+SOURCE_LANGUAGE = "ko"
+
+# 번역 대상 언어 (한국어 제외 19개)
+TARGET_LANGUAGES = ["en-US", "ja", "zh-Hans", "zh-Hant", "de-DE", "fr-FR", "es-ES", "it", "pt-BR", "ru",
+                    "ar-SA", "hi", "tr", "pl", "nl-NL", "sv", "da", "fi", "no"]
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(text: str) -> str:
+    """NFC 정규화 후 줄마다 연속 공백을 하나로 줄이고 앞뒤 공백을 지웁니다 (줄바꿈은 유지)."""
+    text = unicodedata.normalize("NFC", text)
+    lines = [_WHITESPACE.sub(" ", line).strip() for line in text.strip().splitlines()]
+    return "\n".join(lines)
+
+
+def source_key(text: str) -> str:
+    """정규화한 원문의 해시 (번역 메모리의 키)"""
+    return hashlib.sha256(normalize(text).encode("utf-8")).hexdigest()[:32]
+
+
+@dataclass
+class ImportStats:
+    added: int = 0
+    unchanged: int = 0
+    conflicts: List[Tuple[str, str, str, str]] = field(default_factory=list)  # (원문, 언어, 기존, 새 번역)
+
+
+class TranslationMemory:
+    """원문 → {언어: 번역} 저장소.
+
+    lookup은 원문 그대로 먼저 찾고, 없으면 정규화한 해시로 찾습니다. 둘 다 dict 조회라
+    언어 수와 저장된 문장 수에 관계없이 O(1)입니다.
+    """
+
+    def __init__(self, path: Path = MEMORY_PATH):
+        self.path = path
+        self._by_key: Dict[str, Dict[str, str]] = {}  # source_key → {언어: 번역}
+        self._sources: Dict[str, str] = {}             # source_key → 저장된 원문
+        self._origins: Dict[Tuple[str, str], str] = {}  # (source_key, 언어) → 출처
+        self._exact: Dict[str, str] = {}               # 저장된 원문 그대로 → source_key
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: Path = MEMORY_PATH) -> "TranslationMemory":
+        memory = cls(path)
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                for line_number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                        memory.add(record["source"], record["language"], record["text"], record.get("origin", ""))
+                    except (ValueError, KeyError) as e:
+                        raise ValueError(f"{path}:{line_number}: 잘못된 번역 메모리 항목: {e}") from e
+        memory.dirty = False
+        return memory
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def _key_for(self, source: str) -> str:
+        key = self._exact.get(source)
+        return key if key is not None else source_key(source)
+
+    def add(self, source: str, language: str, text: str, origin: str = "", overwrite: bool = True) -> bool:
+        """번역을 추가합니다. 이미 같은 번역이 있거나 overwrite=False로 막히면 False."""
+        key = source_key(source)
+        translations = self._by_key.setdefault(key, {})
+        if language in translations and (translations[language] == text or not overwrite):
+            return False
+        translations[language] = text
+        self._sources.setdefault(key, normalize(source))
+        self._exact.setdefault(source, key)
+        self._origins[(key, language)] = origin
+        self.dirty = True
+        return True
+
+    def lookup(self, source: str, language: str) -> Optional[str]:
+        return self._by_key.get(self._key_for(source), {}).get(language)
+
+    def translations(self, source: str) -> Dict[str, str]:
+        """원문의 모든 언어 번역 {언어: 번역} (없으면 빈 dict)"""
+        return dict(self._by_key.get(self._key_for(source), {}))
+
+    def missing_languages(self, source: str, languages: Iterable[str] = TARGET_LANGUAGES) -> List[str]:
+        translations = self._by_key.get(self._key_for(source), {})
+        return [language for language in languages if language not in translations]
+
+    def records(self) -> Iterator[Dict[str, str]]:
+        for key in sorted(self._by_key, key=lambda k: self._sources[k]):
+            for language, text in sorted(self._by_key[key].items()):
+                record = {"source": self._sources[key], "language": language, "text": text}
+                if self._origins.get((key, language)):
+                    record["origin"] = self._origins[(key, language)]
+                yield record
+
+    def save(self):
+        """원문/언어 순으로 정렬해 다시 씁니다 (임시 파일에 쓴 뒤 교체)."""
+        if not self.dirty:
+            return
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for record in self.records():
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(temp_path, self.path)
+        self.dirty = False
+
+    def import_config(self, config_path: Path, overwrite: bool = False) -> ImportStats:
+        """config의 localization 블록에서 한국어 값과 같은 필드의 번역을 짝지어 가져옵니다.
+
+        문자열 필드는 그대로, 리스트 필드(screenshot_texts 등)는 같은 위치끼리 짝짓습니다.
+        기존 번역과 다르면 overwrite=False일 때 충돌로만 기록합니다.
+        """
+        with open(config_path, "r", encoding="utf-8") as f:
+            localization = json.load(f).get("localization", {})
+        stats = ImportStats()
+        source_block = localization.get(SOURCE_LANGUAGE, {})
+        for language, block in localization.items():
+            if language == SOURCE_LANGUAGE or not isinstance(block, dict):
+                continue
+            for field_name, source_value in source_block.items():
+                for index, source, text in _pairs(source_value, block.get(field_name)):
+                    existing = self.lookup(source, language)
+                    if existing == text:
+                        stats.unchanged += 1
+                        continue
+                    if existing is not None and not overwrite:
+                        stats.conflicts.append((source, language, existing, text))
+                        continue
+                    suffix = f"[{index}]" if isinstance(source_value, list) else ""
+                    self.add(source, language, text, f"{config_path.name}:{field_name}{suffix}")
+                    stats.added += 1
+        return stats
+
+
+def _pairs(source_value, translated_value) -> List[Tuple[int, str, str]]:
+    """원문 값과 번역 값에서 (위치, 원문, 번역) 문자열 쌍을 뽑습니다."""
+    if isinstance(source_value, str) and isinstance(translated_value, str):
+        pairs = [(0, source_value, translated_value)]
+    elif isinstance(source_value, list) and isinstance(translated_value, list):
+        pairs = list(zip(range(len(source_value)), source_value, translated_value))
+    else:
+        return []
+    return [(index, source, text) for index, source, text in pairs
+            if isinstance(source, str) and isinstance(text, str) and source.strip() and text.strip()]
+
+
+def config_files(config_dirs: Iterable[Path] = CONFIG_DIRS) -> List[Path]:
+    return [path for config_dir in config_dirs for path in sorted(config_dir.glob("*_config.json"))]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="번역 메모리 관리")
+    parser.add_argument("--memory", type=Path, default=MEMORY_PATH, help=f"번역 메모리 파일 (기본: {MEMORY_PATH.name})")
+    parser.add_argument("--import-configs", action="store_true", help="모든 *_config.json의 localization 가져오기")
+    parser.add_argument("--overwrite", action="store_true", help="가져올 때 기존 번역과 다르면 덮어쓰기")
+    parser.add_argument("--lookup", metavar="KOREAN_TEXT", help="원문의 저장된 번역 출력")
+    parser.add_argument("--stats", action="store_true", help="언어별 번역 수 출력")
+    args = parser.parse_args(argv)
+
+    memory = TranslationMemory.load(args.memory)
+
+    if args.import_configs:
+        total = ImportStats()
+        for config_path in config_files():
+            stats = memory.import_config(config_path, overwrite=args.overwrite)
+            print(f"📥 {config_path.name}: {stats.added}개 추가, {stats.unchanged}개 동일, {len(stats.conflicts)}개 충돌")
+            total.added += stats.added
+            total.unchanged += stats.unchanged
+            total.conflicts.extend(stats.conflicts)
+        for source, language, existing, text in total.conflicts:
+            print(f"⚠️  [{language}] {source[:40]!r}: 기존 {existing[:40]!r} ≠ {text[:40]!r}")
+        memory.save()
+        print(f"✅ 번역 메모리: 원문 {len(memory)}개 ({args.memory})")
+
+    if args.lookup:
+        translations = memory.translations(args.lookup)
+        if not translations:
+            print(f"⚠️  '{args.lookup}'에 대한 번역이 없습니다.")
+            return 1
+        for language in TARGET_LANGUAGES:
+            print(f"{language:<8} {translations.get(language, '(없음)')}")
+
+    if args.stats:
+        counts: Dict[str, int] = {}
+        for record in memory.records():
+            counts[record["language"]] = counts.get(record["language"], 0) + 1
+        print(f"원문 {len(memory)}개")
+        for language in TARGET_LANGUAGES:
+            print(f"{language:<8} {counts.get(language, 0)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+App Store 제한 검증 스크립트
+
+metadata/resources/config와 screenshots/resources/config의 모든 *_config.json을
+한 번에 검사합니다.
+
+사용법:
+    python3 scripts/validate_configs.py                       # 위반 항목만 출력
+    python3 scripts/validate_configs.py --format json --output report.json
+    python3 scripts/validate_configs.py --format junit --output report.xml
+    python3 scripts/validate_configs.py --no-captions         # 캡션 픽셀 폭 검사 생략 (Pillow 불필요)
+
+오류가 하나라도 있으면 종료 코드 1을 반환합니다 (--strict이면 경고도 실패로 처리).
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SCRIPTS_DIR = Path(__file__).parent
+CONFIG_DIRS = {
+    "metadata": SCRIPTS_DIR / "metadata" / "resources" / "config",
+    "screenshots": SCRIPTS_DIR / "screenshots" / "resources" / "config",
+}
+SCREENSHOTS_DIR = SCRIPTS_DIR / "screenshots"
+
+# 캡션 좌우 여백 (make_screenshots.py의 max_text_width = bg_width - 40과 동일)
+CAPTION_SIDE_MARGIN = 40
+MAX_CAPTION_LINES = 3
+
+
+def _chars(value: str) -> int:
+    return len(value)
+
+
+def _keyword_bytes(value: str) -> int:
+    """App Store는 키워드를 쉼표로 이어 붙인 UTF-8 바이트 수로 셉니다 (쉼표 앞뒤 공백 제외)."""
+    keywords = [keyword.strip() for keyword in value.split(",")]
+    return len(",".join(keyword for keyword in keywords if keyword).encode("utf-8"))
+
+
+@dataclass(frozen=True)
+class Rule:
+    field: str
+    limit: int
+    unit: str
+    measure: Callable[[str], int]
+    required: bool = False
+
+
+# 미리 만들어 둔 규칙 표: 필드 이름 → 규칙
+RULES: Dict[str, Rule] = {rule.field: rule for rule in (
+    Rule("name", 30, "자", _chars, required=True),
+    Rule("subtitle", 30, "자", _chars),
+    Rule("promotional_text", 170, "자", _chars),
+    Rule("keywords", 100, "바이트", _keyword_bytes),
+    Rule("description", 4000, "자", _chars),
+    Rule("release_notes", 4000, "자", _chars),
+)}
+REQUIRED_FIELDS = tuple(rule.field for rule in RULES.values() if rule.required)
+
+
+@dataclass
+class Finding:
+    config: str
+    app: str
+    language: str
+    field: str
+    rule: str
+    severity: str  # "error" | "warning"
+    message: str
+    value: Optional[float] = None
+    limit: Optional[float] = None
+
+    def describe(self) -> str:
+        return f"{self.field}: {self.message}"
+
+
+@dataclass
+class Report:
+    findings: List[Finding] = field(default_factory=list)
+    configs: List[str] = field(default_factory=list)
+    # 설정 파일 → 검사한 언어 목록 (JUnit 테스트 케이스 단위)
+    languages: Dict[str, List[str]] = field(default_factory=dict)
+    checks: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def errors(self) -> List[Finding]:
+        return [finding for finding in self.findings if finding.severity == "error"]
+
+    @property
+    def warnings(self) -> List[Finding]:
+        return [finding for finding in self.findings if finding.severity == "warning"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "configs": len(self.configs),
+            "checks": self.checks,
+            "errors": len(self.errors),
+            "warnings": len(self.warnings),
+            "elapsed_seconds": round(self.elapsed_seconds, 4),
+            "findings": [asdict(finding) for finding in self.findings],
+        }
+
+
+def check_metadata_fields(config: str, app: str, language: str, data: Dict[str, Any],
+                          report: Report, require_fields: bool):
+    """규칙 표에 있는 필드만 검사합니다."""
+    for field_name, value in data.items():
+        rule = RULES.get(field_name)
+        if rule is None:
+            continue
+        report.checks += 1
+        measured = rule.measure(str(value))
+        if measured > rule.limit:
+            report.findings.append(Finding(
+                config, app, language, field_name, "limit", "error",
+                f"{measured}/{rule.limit}{rule.unit} ({measured - rule.limit}{rule.unit} 초과)",
+                measured, rule.limit))
+    if require_fields:
+        for field_name in REQUIRED_FIELDS:
+            report.checks += 1
+            if not str(data.get(field_name, "")).strip():
+                report.findings.append(Finding(config, app, language, field_name, "required", "error",
+                                               "값이 비어 있습니다"))
+
+
+class CaptionChecker:
+    """스크린샷 캡션을 실제 폰트와 기기 폭으로 측정합니다 (screenshots 모듈 재사용)."""
+
+    def __init__(self):
+        if str(SCREENSHOTS_DIR) not in sys.path:
+            sys.path.insert(0, str(SCREENSHOTS_DIR))
+        from PIL import Image
+        from app_config import load_app_config
+        from fonts import FontManager
+        from text_layout import break_lines, overflowing_words
+        self._image = Image
+        self._load_app_config = load_app_config
+        self._font_manager = FontManager
+        self._break_lines = break_lines
+        self._overflowing_words = overflowing_words
+        self._fonts: Dict[Tuple[str, str, str, int], Any] = {}
+        self._widths: Dict[Path, int] = {}
+
+    def _background_width(self, path: Path) -> int:
+        width = self._widths.get(path)
+        if width is None:
+            try:
+                with self._image.open(path) as image:  # 헤더만 읽습니다
+                    width = image.width
+            except OSError:
+                width = 1200  # AssetCache와 같은 대체 배경 폭
+            self._widths[path] = width
+        return width
+
+    def _title_font(self, app_config, language: str, size: int, texts: List[str]) -> Tuple[Any, str]:
+        """렌더러와 같은 방식으로 고른 제목 폰트와, 그 폰트에 글리프가 없는 문자들"""
+        coverage_text = "".join(texts)
+        key = (app_config.app_name, language, json.dumps(app_config.font_mapping(language), sort_keys=True), size,
+               coverage_text)
+        entry = self._fonts.get(key)
+        if entry is None:
+            with contextlib.redirect_stdout(io.StringIO()):  # FontManager의 로딩 로그 숨김
+                manager = self._font_manager(SCREENSHOTS_DIR / "resources" / "fonts", language=language,
+                                             font_size_title=size, app_config=app_config,
+                                             coverage_text=coverage_text)
+                manager.load_fonts()
+            entry = (manager.get_title_font(), manager.missing_glyphs)
+            self._fonts[key] = entry
+        return entry
+
+    def check(self, config_path: Path, report: Report):
+        app_name = config_path.stem.replace("_config", "")
+        app_config = self._load_app_config(app_name, config_path.parent)
+        config = str(config_path)
+        for device_type in app_config.device_types:
+            device = app_config.device(device_type)
+            background = SCREENSHOTS_DIR / "resources" / app_config.app_name.lower() / device.background_image
+            max_width = self._background_width(background) - CAPTION_SIDE_MARGIN
+            for language in app_config.languages:
+                texts = app_config.screenshot_texts(language)
+                report.checks += 1
+                if len(texts) < len(device.screenshots):
+                    report.findings.append(Finding(
+                        config, app_config.app_name, language, f"screenshot_texts[{device_type}]", "caption_count",
+                        "warning", f"캡션 {len(texts)}개 < 스크린샷 {len(device.screenshots)}개 (빈 캡션으로 생성됨)",
+                        len(texts), len(device.screenshots)))
+                font, missing_glyphs = self._title_font(app_config, language, device.font_size_title, texts)
+                for index, text in enumerate(texts[:len(device.screenshots)], 1):
+                    report.checks += 1
+                    field_name = f"screenshot_texts[{index}] ({device_type})"
+                    missing = "".join(char for char in missing_glyphs if char in text)
+                    if missing:
+                        report.findings.append(Finding(
+                            config, app_config.app_name, language, field_name, "caption_glyphs", "warning",
+                            f"사용 가능한 폰트에 글리프가 없어 네모(□)로 그려집니다: {missing}", len(missing), 0))
+                    overflow = self._overflowing_words(text, max_width, font)
+                    if overflow:
+                        report.findings.append(Finding(
+                            config, app_config.app_name, language, field_name, "caption_width", "error",
+                            f"{max_width}px보다 넓은 단어가 중간에서 잘립니다: {', '.join(overflow)}",
+                            None, max_width))
+                    lines = len(self._break_lines(text, max_width, font))
+                    if lines > MAX_CAPTION_LINES:
+                        report.findings.append(Finding(
+                            config, app_config.app_name, language, field_name, "caption_lines", "warning",
+                            f"{lines}줄 (권장 {MAX_CAPTION_LINES}줄 이하)", lines, MAX_CAPTION_LINES))
+
+
+def validate(config_dirs: Dict[str, Path] = CONFIG_DIRS, captions: bool = True) -> Report:
+    """모든 config를 검사하고 Report를 반환합니다."""
+    started = time.perf_counter()
+    report = Report()
+    caption_checker = None
+    if captions:
+        try:
+            caption_checker = CaptionChecker()
+        except ImportError as e:
+            print(f"⚠️  캡션 폭 검사를 건너뜁니다 (Pillow 없음: {e})")
+
+    for kind, config_dir in config_dirs.items():
+        for config_path in sorted(config_dir.glob("*_config.json")):
+            config = str(config_path)
+            report.configs.append(config)
+            try:
+                with open(config_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                report.findings.append(Finding(config, config_path.stem, "*", "*", "json", "error",
+                                               f"JSON을 읽을 수 없습니다: {e}"))
+                continue
+
+            app = data.get("app_name", config_path.stem.replace("_config", ""))
+            localization = data.get("localization", {})
+            report.languages[config] = list(localization)
+            for language, entry in localization.items():
+                check_metadata_fields(config, app, language, entry, report, require_fields=(kind == "metadata"))
+
+            if caption_checker is not None and kind == "screenshots":
+                caption_checker.check(config_path, report)
+
+    report.elapsed_seconds = time.perf_counter() - started
+    return report
+
+
+def to_junit(report: Report) -> str:
+    """config 하나를 testsuite, 언어 하나를 testcase로 하는 JUnit XML"""
+    suites = ET.Element("testsuites", name="app-store-limits", tests=str(sum(map(len, report.languages.values()))),
+                        failures=str(len(report.errors)), time=f"{report.elapsed_seconds:.4f}")
+    by_case: Dict[Tuple[str, str], List[Finding]] = {}
+    for finding in report.findings:
+        by_case.setdefault((finding.config, finding.language), []).append(finding)
+
+    for config in report.configs:
+        languages = report.languages.get(config) or ["*"]
+        suite_errors = [finding for finding in report.errors if finding.config == config]
+        suite = ET.SubElement(suites, "testsuite", name=Path(config).relative_to(SCRIPTS_DIR).as_posix(),
+                              tests=str(len(languages)), failures=str(len(suite_errors)))
+        for language in languages:
+            case = ET.SubElement(suite, "testcase", classname=Path(config).stem, name=language)
+            findings = by_case.get((config, language), [])
+            errors = [finding for finding in findings if finding.severity == "error"]
+            if errors:
+                failure = ET.SubElement(case, "failure", message=f"{len(errors)} violation(s)")
+                failure.text = "\n".join(finding.describe() for finding in errors)
+            warnings = [finding for finding in findings if finding.severity == "warning"]
+            if warnings:
+                ET.SubElement(case, "system-out").text = "\n".join(finding.describe() for finding in warnings)
+    return ET.tostring(suites, encoding="unicode")
+
+
+def print_text(report: Report):
+    for finding in report.findings:
+        icon = "❌" if finding.severity == "error" else "⚠️ "
+        print(f"{icon} {Path(finding.config).relative_to(SCRIPTS_DIR)} [{finding.language}] {finding.describe()}")
+    status = "✅" if not report.errors else "❌"
+    print(f"{status} {len(report.configs)}개 config, {report.checks}개 항목 검사: "
+          f"오류 {len(report.errors)}개, 경고 {len(report.warnings)}개 ({report.elapsed_seconds * 1000:.0f}ms)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="App Store 메타데이터/스크린샷 config 제한 검증")
+    parser.add_argument("--format", choices=["text", "json", "junit"], default="text", help="보고서 형식")
+    parser.add_argument("--output", type=Path, help="보고서 저장 경로 (기본: 표준 출력)")
+    parser.add_argument("--no-captions", action="store_true", help="캡션 픽셀 폭 검사 생략")
+    parser.add_argument("--strict", action="store_true", help="경고도 실패로 처리")
+    args = parser.parse_args(argv)
+
+    report = validate(captions=not args.no_captions)
+    if args.format == "text":
+        print_text(report)
+    else:
+        rendered = json.dumps(report.to_dict(), ensure_ascii=False, indent=1) if args.format == "json" \
+            else to_junit(report)
+        if args.output:
+            args.output.write_text(rendered, encoding='utf-8')
+            print(f"보고서 저장: {args.output} (오류 {len(report.errors)}개, 경고 {len(report.warnings)}개)")
+        else:
+            print(rendered)
+
+    failed = report.errors or (args.strict and report.warnings)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())